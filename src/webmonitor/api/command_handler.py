@@ -57,22 +57,56 @@ class CommandHandler:
 
             # Email commands
             'reload_email_config': self.reload_email_config,
+
+            # Batch commands
+            'create_batch': self.create_batch,
+            'update_batch': self.update_batch,
         }
     
     def handle_command(self, command_data: Dict[str, Any]) -> Dict[str, Any]:
         # Route command to appropriate handler
         try:
-            action = command_data.get('action')
-            
-            if action in self.command_routes:
-                return self.command_routes[action](command_data)
-            else:
+            handler = self.command_routes.get(command_data.get('action'))
+            if handler is None:
                 return {'status': 'error', 'message': 'Unknown action'}
+            return handler(command_data)
 
         except Exception as e:
             self.logger.error(f"Error handling command: {str(e)}", exc_info=True)
             return {'status': 'error', 'message': str(e)}
 
+    def create_batch(self, command_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create spaces and then monitors from a single request."""
+        return self._run_batch(command_data, 'create_space', 'create_monitor')
+
+    def update_batch(self, command_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Update spaces and then monitors from a single request."""
+        return self._run_batch(command_data, 'update_space', 'update_monitor')
+
+    def _run_batch(self, command_data: Dict[str, Any], space_action: str, monitor_action: str) -> Dict[str, Any]:
+        # Spaces go first so monitors in the same batch can reference them
+        results = []
+        for kind, action in (('space', space_action), ('monitor', monitor_action)):
+            handler = self.command_routes[action]
+            for item in command_data.get(f'{kind}s') or []:
+                try:
+                    response = handler({'action': action, kind: item})
+                except Exception as e:
+                    self.logger.error(f"Error handling {action} in batch: {str(e)}", exc_info=True)
+                    response = {'status': 'error', 'message': str(e)}
+
+                result = {
+                    'type': kind,
+                    'name': item.get('name'),
+                    'status': response.get('status'),
+                    'message': response.get('message')
+                }
+                if kind in response:
+                    result['id'] = response[kind].get('id')
+                results.append(result)
+
+        return {'status': 'success', 'results': results}
+
     def reload_email_config(self, command_data: Dict[str, Any]) -> Dict[str, Any]:
         """Reload email configuration."""
         try:
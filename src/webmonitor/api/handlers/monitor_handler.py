@@ -78,7 +78,7 @@ class MonitorCommandHandler:
         else:
             monitors = self.database.get_monitors_for_space(space_id)
             
-        running_ids = [m.id for m in self.scheduler.list_running_monitors()]
+        running_ids = {m.id for m in self.scheduler.list_running_monitors()}
 
         monitor_dicts = []
         for monitor in monitors:
@@ -101,9 +101,8 @@ class MonitorCommandHandler:
         if not monitor:
             return {'status': 'error', 'message': 'Monitor not found'}
             
-        running_ids = [m.id for m in self.scheduler.list_running_monitors()]
         monitor_dict = monitor.to_dict()
-        monitor_dict['running'] = monitor.id in running_ids
+        monitor_dict['running'] = self.scheduler.is_monitor_running(monitor.id)
         
         return {
             'status': 'success',
@@ -197,8 +196,7 @@ class MonitorCommandHandler:
             
         # Check if monitor is running
         was_running = False
-        running_ids = [m.id for m in self.scheduler.list_running_monitors()]
-        if monitor.id in running_ids:
+        if self.scheduler.is_monitor_running(monitor.id):
             was_running = True
             self.scheduler.stop_monitor(monitor.id)
             
@@ -47,6 +47,7 @@ def config_show():
         click.echo(f"  Cleanup Interval: {cleanup_config.get('cleanup_interval_hours', 'Not set')} hours")
         click.echo(f"  Keep Healthy Results: {cleanup_config.get('keep_healthy_results_days', 'Not set')} days")
         click.echo(f"  Keep Unhealthy Results: {cleanup_config.get('keep_unhealthy_results_days', 'Not set')} days")
+        click.echo(f"  Batch Size: {cleanup_config.get('batch_size', 'Not set')} results")
 
         # Display security config
         security_config = config.get('security', {})
@@ -1,16 +1,8 @@
 import os
 import sys
-import yaml
 import click
-from .cli_utils import send_command, format_response, resolve_monitor_identifier
-
-def load_yaml_file(file_path: str) -> dict:
-    try:
-        with open(file_path, 'r') as f:
-            return yaml.safe_load(f)
-    except Exception as e:
-        click.echo(click.style(f"Error loading YAML file: {str(e)}", fg='red'), err=True)
-        sys.exit(1)
+from functools import lru_cache
+from .cli_utils import send_command, format_response, resolve_monitor_identifier, load_yaml_file, dump_yaml, FILE_BUFFER_SIZE
 
 def create_monitor_from_file(send_command, file: str) -> dict:
     monitor_data = load_yaml_file(file)
@@ -40,100 +32,110 @@ def export_monitor(send_command, monitor_id: str, output: str = None) -> None:
         return response
 
     monitor_data = response.get('monitor', {})
-    yaml_str = yaml.dump(monitor_data, default_flow_style=False)
-
     if output:
-        with open(output, 'w') as f:
-            f.write(yaml_str)
+        # Let the dumper encode straight into a binary file
+        with open(output, 'wb', buffering=FILE_BUFFER_SIZE) as f:
+            dump_yaml(monitor_data, f, encoding='utf-8')
         click.echo(f"Monitor exported to {output}")
     else:
-        click.echo(yaml_str)
+        click.echo(dump_yaml(monitor_data))
 
     return response
 
+# Static sample monitor definitions per monitor type, printed by sample-create / sample-update
+SAMPLE_MONITOR_CREATE = {
+    'url': {
+        'name': 'Website Health Check',
+        'space_id': 'space-uuid-here',
+        'monitor_type': 'url',
+        'url': 'https://example.com',
+        'expected_status_code': 200,
+        'timeout_seconds': 30,
+        'check_ssl': True,
+        'follow_redirects': True,
+        'check_content': 'Welcome',
+        'check_interval_seconds': 300
+    },
+    'database': {
+        'name': 'Database Health Check',
+        'space_id': 'space-uuid-here',
+        'monitor_type': 'database',
+        'db_type': 'postgresql',
+        'host': 'localhost',
+        'port': 5432,
+        'database': 'myapp',
+        'username': 'monitor_user',
+        'password': 'secure_password',
+        'connection_timeout_seconds': 10,
+        'query_timeout_seconds': 30,
+        'test_query': 'SELECT 1',
+        'check_interval_seconds': 300
+    }
+}
+
+SAMPLE_MONITOR_UPDATE = {
+    'url': {
+        'id': 'monitor-uuid-here',
+        'name': 'Updated Website Health Check',
+        'space_id': 'space-uuid-here',
+        'monitor_type': 'url',
+        'url': 'https://updated-example.com',
+        'expected_status_code': 200,
+        'timeout_seconds': 45,
+        'check_ssl': True,
+        'follow_redirects': True,
+        'check_content': 'Updated Welcome',
+        'check_interval_seconds': 600
+    },
+    'database': {
+        'id': 'monitor-uuid-here',
+        'name': 'Updated Database Health Check',
+        'space_id': 'space-uuid-here',
+        'monitor_type': 'database',
+        'db_type': 'mysql',
+        'host': 'db.example.com',
+        'port': 3306,
+        'database': 'production_db',
+        'username': 'updated_monitor_user',
+        'password': 'new_secure_password',
+        'connection_timeout_seconds': 15,
+        'query_timeout_seconds': 45,
+        'test_query': 'SELECT COUNT(*) FROM health_check',
+        'check_interval_seconds': 600
+    }
+}
+
+@lru_cache(maxsize=None)
+def _render_sample_monitor(kind: str, monitor_type: str) -> str:
+    # Rendered on first use only and reused afterwards
+    samples = SAMPLE_MONITOR_CREATE if kind == 'create' else SAMPLE_MONITOR_UPDATE
+    return dump_yaml(samples[monitor_type])
+
 def print_sample_monitor_create(monitor_type: str) -> None:
-    if monitor_type.lower() == 'url':
-        sample = {
-            'name': 'Website Health Check',
-            'space_id': 'space-uuid-here',
-            'monitor_type': 'url',
-            'url': 'https://example.com',
-            'expected_status_code': 200,
-            'timeout_seconds': 30,
-            'check_ssl': True,
-            'follow_redirects': True,
-            'check_content': 'Welcome',
-            'check_interval_seconds': 300
-        }
-    elif monitor_type.lower() == 'database':
-        sample = {
-            'name': 'Database Health Check',
-            'space_id': 'space-uuid-here',
-            'monitor_type': 'database',
-            'db_type': 'postgresql',
-            'host': 'localhost',
-            'port': 5432,
-            'database': 'myapp',
-            'username': 'monitor_user',
-            'password': 'secure_password',
-            'connection_timeout_seconds': 10,
-            'query_timeout_seconds': 30,
-            'test_query': 'SELECT 1',
-            'check_interval_seconds': 300
-        }
-    else:
+    if monitor_type.lower() not in SAMPLE_MONITOR_CREATE:
         click.echo(click.style(f"Unknown monitor type: {monitor_type}. Supported types: url, database", fg='red'), err=True)
         return
 
-    click.echo(f"# Sample YAML for creating a {monitor_type} monitor")
-    click.echo("# Save this to a file and use: webmonitor monitor create-from-file -f <file>")
-    click.echo("# ID is optional - will be auto-generated if not provided")
-    click.echo("# space_id is required and must reference an existing space")
-    click.echo()
-    click.echo(yaml.dump(sample, default_flow_style=False))
+    click.echo(
+        f"# Sample YAML for creating a {monitor_type} monitor\n"
+        "# Save this to a file and use: webmonitor monitor create-from-file -f <file>\n"
+        "# ID is optional - will be auto-generated if not provided\n"
+        "# space_id is required and must reference an existing space\n"
+        "\n" + _render_sample_monitor('create', monitor_type.lower())
+    )
 
 def print_sample_monitor_update(monitor_type: str) -> None:
-    if monitor_type.lower() == 'url':
-        sample = {
-            'id': 'monitor-uuid-here',
-            'name': 'Updated Website Health Check',
-            'space_id': 'space-uuid-here',
-            'monitor_type': 'url',
-            'url': 'https://updated-example.com',
-            'expected_status_code': 200,
-            'timeout_seconds': 45,
-            'check_ssl': True,
-            'follow_redirects': True,
-            'check_content': 'Updated Welcome',
-            'check_interval_seconds': 600
-        }
-    elif monitor_type.lower() == 'database':
-        sample = {
-            'id': 'monitor-uuid-here',
-            'name': 'Updated Database Health Check',
-            'space_id': 'space-uuid-here',
-            'monitor_type': 'database',
-            'db_type': 'mysql',
-            'host': 'db.example.com',
-            'port': 3306,
-            'database': 'production_db',
-            'username': 'updated_monitor_user',
-            'password': 'new_secure_password',
-            'connection_timeout_seconds': 15,
-            'query_timeout_seconds': 45,
-            'test_query': 'SELECT COUNT(*) FROM health_check',
-            'check_interval_seconds': 600
-        }
-    else:
+    if monitor_type.lower() not in SAMPLE_MONITOR_UPDATE:
         click.echo(click.style(f"Unknown monitor type: {monitor_type}. Supported types: url, database", fg='red'), err=True)
         return
 
-    click.echo(f"# Sample YAML for updating a {monitor_type} monitor")
-    click.echo("# Save this to a file and use: webmonitor monitor update-from-file <monitor_id> -f <file>")
-    click.echo("# ID in the command takes precedence over ID in the file")
-    click.echo("# space_id is required and must reference an existing space")
-    click.echo()
-    click.echo(yaml.dump(sample, default_flow_style=False))
+    click.echo(
+        f"# Sample YAML for updating a {monitor_type} monitor\n"
+        "# Save this to a file and use: webmonitor monitor update-from-file <monitor_id> -f <file>\n"
+        "# ID in the command takes precedence over ID in the file\n"
+        "# space_id is required and must reference an existing space\n"
+        "\n" + _render_sample_monitor('update', monitor_type.lower())
+    )
 
 # Define the monitor command group
 @click.group(help='Monitor management commands')
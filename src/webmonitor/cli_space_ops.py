@@ -1,16 +1,8 @@
 import os
 import sys
-import yaml
 import click
-from .cli_utils import send_command, format_response, resolve_space_identifier
-
-def load_yaml_file(file_path: str) -> dict:
-    try:
-        with open(file_path, 'r') as f:
-            return yaml.safe_load(f)
-    except Exception as e:
-        click.echo(click.style(f"Error loading YAML file: {str(e)}", fg='red'), err=True)
-        sys.exit(1)
+from functools import lru_cache
+from .cli_utils import send_command, format_response, resolve_space_identifier, load_yaml_file, dump_yaml, FILE_BUFFER_SIZE
 
 def create_space_from_file(send_command, file: str) -> dict:
     space_data = load_yaml_file(file)
@@ -34,50 +26,63 @@ def export_space(send_command, space_id: str, output: str = None) -> None:
         return response
 
     space_data = response.get('space', {})
-    yaml_str = yaml.dump(space_data, default_flow_style=False)
-
     if output:
-        with open(output, 'w') as f:
-            f.write(yaml_str)
+        # Let the dumper encode straight into a binary file
+        with open(output, 'wb', buffering=FILE_BUFFER_SIZE) as f:
+            dump_yaml(space_data, f, encoding='utf-8')
         click.echo(f"Space exported to {output}")
     else:
-        click.echo(yaml_str)
+        click.echo(dump_yaml(space_data))
 
     return response
 
+# Static sample space definitions printed by sample-create / sample-update
+SAMPLE_SPACE_CREATE = {
+    'name': 'My Web Space',
+    'description': 'Space for monitoring web services',
+    'notification_emails': [
+        'admin@example.com',
+        'alerts@example.com'
+    ]
+}
+
+SAMPLE_SPACE_UPDATE = {
+    'id': 'space-uuid-here',
+    'name': 'My Updated Web Space',
+    'description': 'Updated space for monitoring web services',
+    'notification_emails': [
+        'admin@example.com',
+        'alerts@example.com',
+        'newuser@example.com'
+    ]
+}
+
+SAMPLE_SPACE_CREATE_HEADER = (
+    "# Sample YAML for creating a space\n"
+    "# Save this to a file and use: webmonitor space create-from-file -f <file>\n"
+    "# ID is optional - will be auto-generated if not provided\n"
+)
+
+SAMPLE_SPACE_UPDATE_HEADER = (
+    "# Sample YAML for updating a space\n"
+    "# Save this to a file and use: webmonitor space update-from-file <space_id> -f <file>\n"
+    "# ID in the command takes precedence over ID in the file\n"
+)
+
+@lru_cache(maxsize=None)
+def _render_sample_space(kind: str) -> str:
+    # Rendered on first use only and reused afterwards
+    if kind == 'create':
+        header, sample = SAMPLE_SPACE_CREATE_HEADER, SAMPLE_SPACE_CREATE
+    else:
+        header, sample = SAMPLE_SPACE_UPDATE_HEADER, SAMPLE_SPACE_UPDATE
+    return header + "\n" + dump_yaml(sample)
+
 def print_sample_space_create() -> None:
-    sample = {
-        'name': 'My Web Space',
-        'description': 'Space for monitoring web services',
-        'notification_emails': [
-            'admin@example.com',
-            'alerts@example.com'
-        ]
-    }
-
-    click.echo("# Sample YAML for creating a space")
-    click.echo("# Save this to a file and use: webmonitor space create-from-file -f <file>")
-    click.echo("# ID is optional - will be auto-generated if not provided")
-    click.echo()
-    click.echo(yaml.dump(sample, default_flow_style=False))
+    click.echo(_render_sample_space('create'))
 
 def print_sample_space_update() -> None:
-    sample = {
-        'id': 'space-uuid-here',
-        'name': 'My Updated Web Space',
-        'description': 'Updated space for monitoring web services',
-        'notification_emails': [
-            'admin@example.com',
-            'alerts@example.com',
-            'newuser@example.com'
-        ]
-    }
-
-    click.echo("# Sample YAML for updating a space")
-    click.echo("# Save this to a file and use: webmonitor space update-from-file <space_id> -f <file>")
-    click.echo("# ID in the command takes precedence over ID in the file")
-    click.echo()
-    click.echo(yaml.dump(sample, default_flow_style=False))
+    click.echo(_render_sample_space('update'))
 
 # Define the space command group
 @click.group(help='Space management commands')
@@ -1,28 +1,85 @@
 import os
 import sys
-import yaml
 import click
-from .cli_utils import send_command, format_response, _format_system_status
+from functools import lru_cache
+from .cli_utils import send_command, format_response, _format_system_status, load_yaml_file, load_yaml_minimal, DaemonClient, dump_yaml, FILE_BUFFER_SIZE
 
-def load_yaml_file(file_path: str) -> dict:
-    try:
-        with open(file_path, 'r') as f:
-            return yaml.safe_load(f)
-    except Exception as e:
-        click.echo(click.style(f"Error loading YAML file: {str(e)}", fg='red'), err=True)
-        sys.exit(1)
+# ANSI codes for the per-item result lines, styled once instead of on every line
+_GREEN, _RESET = click.style('\0', fg='green').split('\0')
+_RED = click.style('\0', fg='red').split('\0')[0]
 
 def save_yaml_file(data: dict, file_path: str) -> None:
     try:
-        with open(file_path, 'w') as f:
-            yaml.dump(data, f, default_flow_style=False)
+        # Dump straight into a large binary buffer: small files still land in one write and
+        # large ones never exist as a single string in memory
+        with open(file_path, 'wb', buffering=FILE_BUFFER_SIZE) as f:
+            dump_yaml(data, f, encoding='utf-8')
     except Exception as e:
         click.echo(click.style(f"Error saving YAML file: {str(e)}", fg='red'), err=True)
         sys.exit(1)
 
+def _send_batch(send_command, action: str, spaces: list, monitors: list) -> tuple:
+    # Send all spaces and monitors in one request and split the per-item results by type
+    response = send_command({
+        'action': action,
+        'spaces': spaces,
+        'monitors': monitors
+    })
+
+    get = response.get
+    if get('status') != 'success':
+        # The whole batch failed (e.g. daemon not running), report it against every item
+        failure = {'status': 'error', 'message': get('message')}
+        return [dict(failure, type='space') for _ in spaces], [dict(failure, type='monitor') for _ in monitors]
+
+    # Split the results by type in a single walk
+    by_type = {'space': [], 'monitor': []}
+    for result in get('results', []):
+        bucket = by_type.get(result.get('type'))
+        if bucket is not None:
+            bucket.append(result)
+    return by_type['space'], by_type['monitor']
+
+# Config sections in processing order: (config key, resource kind)
+_SECTIONS = (('spaces', 'space'), ('monitors', 'monitor'))
+
+# Wording per operation: (heading, success, counter key)
+_OPERATIONS = {
+    'create': ('Creating', 'Created', 'created'),
+    'update': ('Updating', 'Updated', 'updated')
+}
+
+def _report_section(operation: str, kind: str, entries: list, responses: list, counts: dict, dry_run: bool) -> None:
+    # Print one section's per-item outcome. entries are (name, id), id is only shown when given.
+    # The batch has already completed, so the whole section is written with a single echo.
+    heading, done, counter = _OPERATIONS[operation]
+    lines = [f"{heading} {kind}s..."]
+
+    if dry_run:
+        lines += [
+            f"  Would {operation} {kind} '{name}'" + (f" (ID: {item_id})" if item_id else "")
+            for name, item_id in entries
+        ]
+        click.echo("\n".join(lines))
+        return
+
+    append = lines.append
+    for i, (name, item_id) in enumerate(entries):
+        response = responses[i] if i < len(responses) else {}
+        get = response.get
+        if get('status') == 'success':
+            id_suffix = f" (ID: {item_id})" if item_id else ""
+            append(f"{_GREEN}  {done} {kind} '{name}'{id_suffix}{_RESET}")
+            counts[counter] += 1
+        else:
+            append(f"{_RED}  Failed to {operation} {kind} '{name}': {get('message')}{_RESET}")
+            counts['failed'] += 1
+    click.echo("\n".join(lines))
+
 def create_config(send_command, yaml_file: str, dry_run: bool = False) -> None:
     # Create resources from YAML config. Allows optional IDs.
-    config = load_yaml_file(yaml_file)
+    # A dry run only prints names and IDs, so skip building the full objects
+    config = load_yaml_minimal(yaml_file) if dry_run else load_yaml_file(yaml_file)
 
     # Track results
     results = {
@@ -30,60 +87,25 @@ def create_config(send_command, yaml_file: str, dry_run: bool = False) -> None:
         'monitors': {'created': 0, 'failed': 0}
     }
 
-    # Process spaces first
-    if 'spaces' in config:
-        click.echo("Creating spaces...")
-        for space in config['spaces']:
-            space_name = space.get('name')
-
-            if dry_run:
-                click.echo(f"  Would create space '{space_name}'")
-                continue
-
-            # Create new space (ID is optional)
-            response = send_command({
-                'action': 'create_space',
-                'space': space
-            })
-
-            if response.get('status') == 'success':
-                click.echo(click.style(f"  Created space '{space_name}'", fg='green'))
-                results['spaces']['created'] += 1
-                # Store the new ID in case monitors reference it
-                if 'space' in response:
-                    space['id'] = response['space']['id']
-            else:
-                click.echo(click.style(f"  Failed to create space '{space_name}': {response.get('message')}", fg='red'))
-                results['spaces']['failed'] += 1
-
-    # Process monitors
-    if 'monitors' in config:
-        click.echo("Creating monitors...")
-        for monitor in config['monitors']:
-            monitor_name = monitor.get('name')
-
-            if dry_run:
-                click.echo(f"  Would create monitor '{monitor_name}'")
-                continue
-
-            # Ensure space_id is provided
-            if 'space_id' not in monitor:
-                click.echo(click.style(f"Monitor '{monitor_name}' is missing required 'space_id' field", fg='red'), err=True)
-                results['monitors']['failed'] += 1
-                continue
-
-            # Create new monitor (ID is optional)
-            response = send_command({
-                'action': 'create_monitor',
-                'monitor': monitor
-            })
-
-            if response.get('status') == 'success':
-                click.echo(click.style(f"  Created monitor '{monitor_name}'", fg='green'))
-                results['monitors']['created'] += 1
-            else:
-                click.echo(click.style(f"  Failed to create monitor '{monitor_name}': {response.get('message')}", fg='red'))
-                results['monitors']['failed'] += 1
+    # Collect everything that can be sent, monitors must reference a space
+    items = {'space': config.get('spaces') or [], 'monitor': []}
+    for monitor in config.get('monitors') or []:
+        if dry_run or 'space_id' in monitor:
+            items['monitor'].append(monitor)
+        else:
+            click.echo(click.style(f"Monitor '{monitor.get('name')}' is missing required 'space_id' field", fg='red'), err=True)
+            results['monitors']['failed'] += 1
+
+    # Create all resources in a single round-trip (ID is optional)
+    responses = {'space': [], 'monitor': []}
+    if not dry_run:
+        responses['space'], responses['monitor'] = _send_batch(send_command, 'create_batch', items['space'], items['monitor'])
+
+    # Spaces first, then monitors
+    for key, kind in _SECTIONS:
+        if key in config:
+            entries = [(item.get('name'), None) for item in items[kind]]
+            _report_section('create', kind, entries, responses[kind], results[key], dry_run)
 
     # Print summary
     if dry_run:
@@ -93,25 +115,29 @@ def create_config(send_command, yaml_file: str, dry_run: bool = False) -> None:
         click.echo(f"  Spaces: {results['spaces']['created']} created, {results['spaces']['failed']} failed")
         click.echo(f"  Monitors: {results['monitors']['created']} created, {results['monitors']['failed']} failed")
 
-def update_config(send_command, yaml_file: str, dry_run: bool = False) -> None:
-    # Update resources from YAML config. Requires IDs for all resources.
-    config = load_yaml_file(yaml_file)
-
-    # Validate that all resources have IDs
+def _collect_update_entries(config: dict, fail_fast: bool = False) -> tuple:
+    # Validate that all resources have IDs, collecting (name, id) for the output in the same pass.
+    # With fail_fast the walk stops at the first resource without an ID.
     validation_errors = []
+    entries = {'space': [], 'monitor': []}
+    for key, kind in _SECTIONS:
+        for i, item in enumerate(config.get(key) or []):
+            item_id = item.get('id')
+            if not item_id:
+                item_name = item.get('name', f'{kind} at index {i}')
+                validation_errors.append(f"{kind.capitalize()} '{item_name}' is missing required 'id' field")
+                if fail_fast:
+                    return entries, validation_errors
+            else:
+                entries[kind].append((item.get('name'), item_id))
+    return entries, validation_errors
 
-    if 'spaces' in config:
-        for i, space in enumerate(config['spaces']):
-            if not space.get('id'):
-                space_name = space.get('name', f'space at index {i}')
-                validation_errors.append(f"Space '{space_name}' is missing required 'id' field")
-
-    if 'monitors' in config:
-        for i, monitor in enumerate(config['monitors']):
-            if not monitor.get('id'):
-                monitor_name = monitor.get('name', f'monitor at index {i}')
-                validation_errors.append(f"Monitor '{monitor_name}' is missing required 'id' field")
+def update_config(send_command, yaml_file: str, dry_run: bool = False, fail_fast: bool = False) -> None:
+    # Update resources from YAML config. Requires IDs for all resources.
+    # A dry run only prints names and IDs, so skip building the full objects
+    config = load_yaml_minimal(yaml_file) if dry_run else load_yaml_file(yaml_file)
 
+    entries, validation_errors = _collect_update_entries(config, fail_fast)
     if validation_errors:
         click.echo(click.style("Validation errors found:", fg='red'), err=True)
         for error in validation_errors:
@@ -125,53 +151,17 @@ def update_config(send_command, yaml_file: str, dry_run: bool = False) -> None:
         'monitors': {'updated': 0, 'failed': 0}
     }
 
-    # Process spaces first
-    if 'spaces' in config:
-        click.echo("Updating spaces...")
-        for space in config['spaces']:
-            space_name = space.get('name')
-            space_id = space.get('id')
-
-            if dry_run:
-                click.echo(f"  Would update space '{space_name}' (ID: {space_id})")
-                continue
-
-            # Update existing space
-            response = send_command({
-                'action': 'update_space',
-                'space': space
-            })
-
-            if response.get('status') == 'success':
-                click.echo(click.style(f"  Updated space '{space_name}' (ID: {space_id})", fg='green'))
-                results['spaces']['updated'] += 1
-            else:
-                click.echo(click.style(f"  Failed to update space '{space_name}': {response.get('message')}", fg='red'))
-                results['spaces']['failed'] += 1
-
-    # Process monitors
-    if 'monitors' in config:
-        click.echo("Updating monitors...")
-        for monitor in config['monitors']:
-            monitor_name = monitor.get('name')
-            monitor_id = monitor.get('id')
-
-            if dry_run:
-                click.echo(f"  Would update monitor '{monitor_name}' (ID: {monitor_id})")
-                continue
-
-            # Update existing monitor
-            response = send_command({
-                'action': 'update_monitor',
-                'monitor': monitor
-            })
-
-            if response.get('status') == 'success':
-                click.echo(click.style(f"  Updated monitor '{monitor_name}' (ID: {monitor_id})", fg='green'))
-                results['monitors']['updated'] += 1
-            else:
-                click.echo(click.style(f"  Failed to update monitor '{monitor_name}': {response.get('message')}", fg='red'))
-                results['monitors']['failed'] += 1
+    # Update all resources in a single round-trip
+    responses = {'space': [], 'monitor': []}
+    if not dry_run:
+        responses['space'], responses['monitor'] = _send_batch(
+            send_command, 'update_batch', config.get('spaces') or [], config.get('monitors') or []
+        )
+
+    # Spaces first, then monitors
+    for key, kind in _SECTIONS:
+        if key in config:
+            _report_section('update', kind, entries[kind], responses[kind], results[key], dry_run)
 
     # Print summary
     if dry_run:
@@ -181,30 +171,26 @@ def update_config(send_command, yaml_file: str, dry_run: bool = False) -> None:
         click.echo(f"  Spaces: {results['spaces']['updated']} updated, {results['spaces']['failed']} failed")
         click.echo(f"  Monitors: {results['monitors']['updated']} updated, {results['monitors']['failed']} failed")
 
-def export_all(send_command, output: str) -> None:
+def export_all(send_commands, output: str) -> None:
     # If the output path does not contains yaml extension, add it
     if not output.endswith('.yaml') and not output.endswith('.yml'):
         output += '.yaml'
 
-    # Get all spaces
-    spaces_response = send_command({'action': 'list_spaces'})
+    # Get all spaces and monitors, both requests go out before either response is read
+    spaces_response, monitors_response = send_commands([
+        {'action': 'list_spaces'},
+        {'action': 'list_monitors'}
+    ])
     if spaces_response.get('status') != 'success':
         return spaces_response
-
-    # Get all monitors
-    monitors_response = send_command({'action': 'list_monitors'})
     if monitors_response.get('status') != 'success':
         return monitors_response
 
-    # Combine into a single config
-    config = {
-        'spaces': spaces_response.get('spaces', []),
-        'monitors': monitors_response.get('monitors', [])
-    }
+    spaces = spaces_response.get('spaces', [])
+    monitors = monitors_response.get('monitors', [])
 
-    # Write to file
-    save_yaml_file(config, output)
-    click.echo(f"Exported {len(config['spaces'])} spaces and {len(config['monitors'])} monitors to {output}")
+    save_yaml_file({'spaces': spaces, 'monitors': monitors}, output)
+    click.echo(f"Exported {len(spaces)} spaces and {len(monitors)} monitors to {output}")
 
     return {'status': 'success', 'message': 'Export completed successfully'}
 
@@ -221,141 +207,159 @@ def status():
 @click.argument('yaml_file', type=click.Path(exists=True, file_okay=True, dir_okay=False, readable=True))
 @click.option('--dry-run', is_flag=True, help='Show what would be created without making changes')
 def create_config_command(yaml_file, dry_run):
-    create_config(send_command, yaml_file, dry_run)
+    with DaemonClient() as client:
+        create_config(client.send, yaml_file, dry_run)
 
 @click.command('update', help='Update spaces and monitors from a YAML file')
 @click.argument('yaml_file', type=click.Path(exists=True, file_okay=True, dir_okay=False, readable=True))
 @click.option('--dry-run', is_flag=True, help='Show what would be updated without making changes')
-def update_config_command(yaml_file, dry_run):
-    update_config(send_command, yaml_file, dry_run)
+@click.option('--fail-fast', is_flag=True, help='Stop validating at the first resource without an ID')
+def update_config_command(yaml_file, dry_run, fail_fast):
+    with DaemonClient() as client:
+        update_config(client.send, yaml_file, dry_run, fail_fast)
 
 @click.command('export-all', help='Export all spaces and monitors to a YAML file')
 @click.option('--output', '-o', type=click.Path(), required=True, help='Output file')
 def export_all_command(output):
-    response = export_all(send_command, output)
+    with DaemonClient() as client:
+        response = export_all(client.send_many, output)
     if response.get('status') != 'success':
         format_response(response)
 
-def print_sample_config_create() -> None:
-    sample = {
-        'spaces': [
-            {
-                'name': 'Production Environment',
-                'description': 'Monitoring for production services',
-                'notification_emails': [
-                    'ops-team@example.com',
-                    'alerts@example.com'
-                ],
-                'id': 'production-space-id'
-            },
-            {
-                'name': 'Development Environment',
-                'description': 'Monitoring for development services',
-                'notification_emails': [
-                    'dev-team@example.com'
-                ],
-                'id': 'development-space-id'
-            }
-        ],
-        'monitors': [
-            {
-                'name': 'Main Website',
-                'space_id': 'production-space-id',
-                'monitor_type': 'url',
-                'url': 'https://www.example.com',
-                'expected_status_code': 200,
-                'timeout_seconds': 30,
-                'check_ssl': True,
-                'follow_redirects': True,
-                'check_interval_seconds': 300
-            },
-            {
-                'name': 'Production Database',
-                'space_id': 'production-space-id',
-                'monitor_type': 'database',
-                'db_type': 'postgresql',
-                'host': 'prod-db.example.com',
-                'port': 5432,
-                'database': 'app_production',
-                'username': 'monitor_user',
-                'password': 'secure_password',
-                'connection_timeout_seconds': 10,
-                'query_timeout_seconds': 30,
-                'test_query': 'SELECT 1',
-                'check_interval_seconds': 600
-            }
-        ]
-    }
+# Static sample configs printed by sample-create / sample-update
+SAMPLE_CONFIG_CREATE = {
+    'spaces': [
+        {
+            'name': 'Production Environment',
+            'description': 'Monitoring for production services',
+            'notification_emails': [
+                'ops-team@example.com',
+                'alerts@example.com'
+            ],
+            'id': 'production-space-id'
+        },
+        {
+            'name': 'Development Environment',
+            'description': 'Monitoring for development services',
+            'notification_emails': [
+                'dev-team@example.com'
+            ],
+            'id': 'development-space-id'
+        }
+    ],
+    'monitors': [
+        {
+            'name': 'Main Website',
+            'space_id': 'production-space-id',
+            'monitor_type': 'url',
+            'url': 'https://www.example.com',
+            'expected_status_code': 200,
+            'timeout_seconds': 30,
+            'check_ssl': True,
+            'follow_redirects': True,
+            'check_interval_seconds': 300
+        },
+        {
+            'name': 'Production Database',
+            'space_id': 'production-space-id',
+            'monitor_type': 'database',
+            'db_type': 'postgresql',
+            'host': 'prod-db.example.com',
+            'port': 5432,
+            'database': 'app_production',
+            'username': 'monitor_user',
+            'password': 'secure_password',
+            'connection_timeout_seconds': 10,
+            'query_timeout_seconds': 30,
+            'test_query': 'SELECT 1',
+            'check_interval_seconds': 600
+        }
+    ]
+}
+
+SAMPLE_CONFIG_UPDATE = {
+    'spaces': [
+        {
+            'id': 'existing-production-space-id',
+            'name': 'Updated Production Environment',
+            'description': 'Updated monitoring for production services',
+            'notification_emails': [
+                'ops-team@example.com',
+                'alerts@example.com',
+                'manager@example.com'
+            ]
+        },
+        {
+            'id': 'existing-dev-space-id',
+            'name': 'Updated Development Environment',
+            'description': 'Updated monitoring for development services',
+            'notification_emails': [
+                'dev-team@example.com',
+                'qa-team@example.com'
+            ]
+        }
+    ],
+    'monitors': [
+        {
+            'id': 'existing-website-monitor-id',
+            'name': 'Updated Main Website',
+            'space_id': 'existing-production-space-id',
+            'monitor_type': 'url',
+            'url': 'https://www.updated-example.com',
+            'expected_status_code': 200,
+            'timeout_seconds': 45,
+            'check_ssl': True,
+            'follow_redirects': True,
+            'check_content': 'Welcome to our updated site',
+            'check_interval_seconds': 300
+        },
+        {
+            'id': 'existing-database-monitor-id',
+            'name': 'Updated Production Database',
+            'space_id': 'existing-production-space-id',
+            'monitor_type': 'database',
+            'db_type': 'postgresql',
+            'host': 'new-prod-db.example.com',
+            'port': 5432,
+            'database': 'app_production_v2',
+            'username': 'updated_monitor_user',
+            'password': 'new_secure_password',
+            'connection_timeout_seconds': 15,
+            'query_timeout_seconds': 45,
+            'test_query': 'SELECT COUNT(*) FROM health_status',
+            'check_interval_seconds': 600
+        }
+    ]
+}
+
+SAMPLE_CONFIG_CREATE_HEADER = (
+    "# Sample YAML for create config command\n"
+    "# Save this to a file and use: webmonitor create <file>\n"
+    "# IDs are optional - will be auto-generated if not provided\n"
+    "# You can reference space IDs in monitors, or use the generated ones\n"
+)
+
+SAMPLE_CONFIG_UPDATE_HEADER = (
+    "# Sample YAML for update config command\n"
+    "# Save this to a file and use: webmonitor update <file>\n"
+    "# IDs are required for all resources when updating\n"
+    "# All spaces and monitors must have existing IDs\n"
+)
+
+@lru_cache(maxsize=None)
+def _render_sample_config(kind: str) -> str:
+    # Rendered on first use only, so other commands do not pay for the YAML emitter
+    if kind == 'create':
+        header, sample = SAMPLE_CONFIG_CREATE_HEADER, SAMPLE_CONFIG_CREATE
+    else:
+        header, sample = SAMPLE_CONFIG_UPDATE_HEADER, SAMPLE_CONFIG_UPDATE
+    return header + "\n" + dump_yaml(sample)
 
-    click.echo("# Sample YAML for create config command")
-    click.echo("# Save this to a file and use: webmonitor create <file>")
-    click.echo("# IDs are optional - will be auto-generated if not provided")
-    click.echo("# You can reference space IDs in monitors, or use the generated ones")
-    click.echo()
-    click.echo(yaml.dump(sample, default_flow_style=False))
+def print_sample_config_create() -> None:
+    click.echo(_render_sample_config('create'))
 
 def print_sample_config_update() -> None:
-    sample = {
-        'spaces': [
-            {
-                'id': 'existing-production-space-id',
-                'name': 'Updated Production Environment',
-                'description': 'Updated monitoring for production services',
-                'notification_emails': [
-                    'ops-team@example.com',
-                    'alerts@example.com',
-                    'manager@example.com'
-                ]
-            },
-            {
-                'id': 'existing-dev-space-id',
-                'name': 'Updated Development Environment',
-                'description': 'Updated monitoring for development services',
-                'notification_emails': [
-                    'dev-team@example.com',
-                    'qa-team@example.com'
-                ]
-            }
-        ],
-        'monitors': [
-            {
-                'id': 'existing-website-monitor-id',
-                'name': 'Updated Main Website',
-                'space_id': 'existing-production-space-id',
-                'monitor_type': 'url',
-                'url': 'https://www.updated-example.com',
-                'expected_status_code': 200,
-                'timeout_seconds': 45,
-                'check_ssl': True,
-                'follow_redirects': True,
-                'check_content': 'Welcome to our updated site',
-                'check_interval_seconds': 300
-            },
-            {
-                'id': 'existing-database-monitor-id',
-                'name': 'Updated Production Database',
-                'space_id': 'existing-production-space-id',
-                'monitor_type': 'database',
-                'db_type': 'postgresql',
-                'host': 'new-prod-db.example.com',
-                'port': 5432,
-                'database': 'app_production_v2',
-                'username': 'updated_monitor_user',
-                'password': 'new_secure_password',
-                'connection_timeout_seconds': 15,
-                'query_timeout_seconds': 45,
-                'test_query': 'SELECT COUNT(*) FROM health_status',
-                'check_interval_seconds': 600
-            }
-        ]
-    }
-
-    click.echo("# Sample YAML for update config command")
-    click.echo("# Save this to a file and use: webmonitor update <file>")
-    click.echo("# IDs are required for all resources when updating")
-    click.echo("# All spaces and monitors must have existing IDs")
-    click.echo()
-    click.echo(yaml.dump(sample, default_flow_style=False))
+    click.echo(_render_sample_config('update'))
 
 @click.command('sample-create')
 def sample_create():
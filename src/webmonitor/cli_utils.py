@@ -1,174 +1,421 @@
-import json
 import socket
 import click
 import os
-import uuid
-from typing import Dict, Any, Tuple
+import sys
+import re
+import yaml
+import struct
+from itertools import zip_longest
+from functools import partial
+from typing import Dict, Any, List, Tuple
+from .utils.json_codec import json_dumps, json_loads
 
 # Config socket path
 SOCKET_PATH = os.getenv('SOCKET_PATH', '/var/run/webmonitor/webmonitor.sock')
 
-def send_command(command: Dict[str, Any]) -> Dict[str, Any]:
+# Prefer the libyaml-backed loader and dumper when PyYAML was built with it
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+# yaml.dump with the block style every CLI output uses
+dump_yaml = partial(yaml.dump, Dumper=YAML_DUMPER, default_flow_style=False)
+
+# Buffer size for whole-file YAML reads and writes
+FILE_BUFFER_SIZE = 131072
+
+def _parse_yaml_file(file_path: str) -> dict:
+    # Read the whole file in one go and let the loader decode the bytes itself
+    with open(file_path, 'rb', buffering=FILE_BUFFER_SIZE) as f:
+        buf = f.read()
+    return yaml.load(buf, Loader=YAML_LOADER)
+
+def load_yaml_file(file_path: str) -> dict:
     try:
-        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        sock.settimeout(30)  # Add 30-second timeout
-        sock.connect(SOCKET_PATH)
-        
-        # Send command
-        sock.sendall(json.dumps(command).encode('utf-8'))
-        
-        # Receive response with timeout
-        data = b''
-        sock.settimeout(30)  # Set receive timeout
+        return _parse_yaml_file(file_path)
+    except Exception as e:
+        click.echo(click.style(f"Error loading YAML file: {str(e)}", fg='red'), err=True)
+        sys.exit(1)
+
+# Fields a dry run prints or validates, everything else in the file is skipped
+MINIMAL_YAML_FIELDS = ('name', 'id', 'space_id')
+
+def _skip_yaml_node(event, events) -> None:
+    # Consume the rest of a node whose start event has already been read
+    if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+        depth = 1
+        while depth:
+            event = next(events)
+            if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+                depth += 1
+            elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                depth -= 1
+
+def _construct_yaml_scalar(event, resolver, constructor):
+    # Resolve plain scalars the way the full loader would, so `id:` is None and `id: 12` is an int
+    tag = event.tag
+    if tag is None or tag == '!':
+        tag = resolver.resolve(yaml.ScalarNode, event.value, event.implicit)
+    return constructor.construct_object(yaml.ScalarNode(tag, event.value, style=event.style))
+
+class _FullLoadNeeded(Exception):
+    pass
+
+def _minimal_yaml_events(buf: bytes):
+    # Aliases and merge keys can pull fields in from elsewhere in the file, which the
+    # event scan can't follow, so any of them hands the file over to the full loader
+    for event in yaml.parse(buf, Loader=YAML_LOADER):
+        if isinstance(event, yaml.AliasEvent):
+            raise _FullLoadNeeded()
+        if isinstance(event, yaml.ScalarEvent) and event.value == '<<' and event.implicit[0]:
+            raise _FullLoadNeeded()
+        yield event
+
+def load_yaml_minimal(file_path: str) -> dict:
+    # Scan the parser event stream and keep only the identifying fields of top-level
+    # spaces and monitors. Used by --dry-run, which never needs the full objects.
+    try:
+        with open(file_path, 'rb', buffering=FILE_BUFFER_SIZE) as f:
+            buf = f.read()
+
+        resolver = yaml.resolver.Resolver()
+        constructor = yaml.constructor.SafeConstructor()
+        events = _minimal_yaml_events(buf)
+        config = {}
+
+        event = next(events)
+        while not isinstance(event, (yaml.MappingStartEvent, yaml.StreamEndEvent)):
+            if isinstance(event, (yaml.SequenceStartEvent, yaml.ScalarEvent)):
+                return config
+            event = next(events)
+        if isinstance(event, yaml.StreamEndEvent):
+            return config
+
         while True:
-            try:
-                chunk = sock.recv(4096)
-                if not chunk:
+            key_event = next(events)
+            if isinstance(key_event, yaml.MappingEndEvent):
+                return config
+            _skip_yaml_node(key_event, events)
+            value_event = next(events)
+            key = key_event.value if isinstance(key_event, yaml.ScalarEvent) else None
+            if key not in ('spaces', 'monitors'):
+                _skip_yaml_node(value_event, events)
+                continue
+
+            items = config[key] = []
+            if not isinstance(value_event, yaml.SequenceStartEvent):
+                _skip_yaml_node(value_event, events)
+                continue
+
+            while True:
+                item_event = next(events)
+                if isinstance(item_event, yaml.SequenceEndEvent):
                     break
-                data += chunk
-            except socket.timeout:
-                click.echo("Timeout waiting for daemon response", err=True)
-                break
-        
-        sock.close()
-        
-        if data:
-            return json.loads(data.decode('utf-8'))
-        else:
-            return {'status': 'error', 'message': 'No response from daemon'}
-            
-    except FileNotFoundError:
-        return {'status': 'error', 'message': 'Daemon not running or socket not found'}
-    except ConnectionRefusedError:
-        return {'status': 'error', 'message': 'Connection refused. Is the daemon running?'}
+                if not isinstance(item_event, yaml.MappingStartEvent):
+                    _skip_yaml_node(item_event, events)
+                    continue
+
+                item = {}
+                while True:
+                    field_event = next(events)
+                    if isinstance(field_event, yaml.MappingEndEvent):
+                        break
+                    _skip_yaml_node(field_event, events)
+                    field_value = next(events)
+                    field = field_event.value if isinstance(field_event, yaml.ScalarEvent) else None
+                    if field in MINIMAL_YAML_FIELDS and isinstance(field_value, yaml.ScalarEvent):
+                        item[field] = _construct_yaml_scalar(field_value, resolver, constructor)
+                    else:
+                        _skip_yaml_node(field_value, events)
+                items.append(item)
+    except _FullLoadNeeded:
+        return load_yaml_file(file_path)
     except Exception as e:
-        return {'status': 'error', 'message': str(e)}
-
-def _format_space_summary(space: Dict[str, Any]) -> None:
-    click.echo(f"  ID: {space['id']}")
-    click.echo(f"  Name: {space['name']}")
-    click.echo(f"  Description: {space.get('description', 'N/A')}")
-    click.echo("")
-
-def _format_space_details(space: Dict[str, Any]) -> None:
-    click.echo("\nSpace Details:")
-    click.echo(f"  ID: {space['id']}")
-    click.echo(f"  Name: {space['name']}")
-    click.echo(f"  Description: {space.get('description', 'N/A')}")
-    click.echo(f"  Created: {space.get('created_at', 'N/A')}")
-    click.echo(f"  Updated: {space.get('updated_at', 'N/A')}")
+        click.echo(click.style(f"Error loading YAML file: {str(e)}", fg='red'), err=True)
+        sys.exit(1)
+
+# Every message on the socket is prefixed with its length as a 4-byte big-endian integer
+FRAME_HEADER = struct.Struct('>I')
+
+def _send_buffers(sock: socket.socket, buffers: List[bytes]) -> None:
+    # Gather write: frame headers and payloads go out in one syscall without being concatenated first
+    sent = sock.sendmsg(buffers)
+    # On a partial write, finish each remaining buffer in place instead of joining a copy of them all
+    for buf in buffers:
+        if sent >= len(buf):
+            sent -= len(buf)
+            continue
+        sock.sendall(memoryview(buf)[sent:])
+        sent = 0
+
+class DaemonClient:
+    # Connection to the daemon that can be reused for several commands.
+    # Use as a context manager so the socket is closed once the caller is done.
+
+    def __init__(self, socket_path: str = None, timeout: float = 30):
+        self.socket_path = socket_path or SOCKET_PATH
+        self.timeout = timeout
+        self.sock = None
+
+    def __enter__(self) -> 'DaemonClient':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def connect(self) -> None:
+        if self.sock is not None:
+            return
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except Exception:
+            sock.close()
+            raise
+        self.sock = sock
+
+    def close(self) -> None:
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            finally:
+                self.sock = None
+
+    def is_available(self) -> bool:
+        # Cheap check before paying for socket(), connect() and the exception when the daemon is down.
+        # connect() can still fail if the daemon goes away in between, callers handle that too.
+        return self.sock is not None or os.path.exists(self.socket_path)
+
+    def send(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        if not self.is_available():
+            return {'status': 'error', 'message': 'Daemon not running or socket not found'}
+        try:
+            self.connect()
+
+            # Send command
+            payload = json_dumps(command)
+            _send_buffers(self.sock, [FRAME_HEADER.pack(len(payload)), payload])
+
+            # Receive exactly one response frame
+            (length,) = FRAME_HEADER.unpack(self._recv_exact(FRAME_HEADER.size))
+            return json_loads(self._recv_exact(length))
+
+        except Exception as e:
+            return self._error_response(e)
+
+    def send_many(self, commands: List[Dict[str, Any]], window: int = 16) -> List[Dict[str, Any]]:
+        # Pipeline several commands on the connection and return the responses in order.
+        # At most `window` requests are in flight so neither side blocks on a full socket buffer.
+        if not self.is_available():
+            return [{'status': 'error', 'message': 'Daemon not running or socket not found'} for _ in commands]
+        responses = []
+        try:
+            self.connect()
+            frames = []
+            for command in commands:
+                payload = json_dumps(command)
+                frames.append((FRAME_HEADER.pack(len(payload)), payload))
+
+            sent = 0
+            while len(responses) < len(frames):
+                if sent < len(frames) and sent - len(responses) < window:
+                    batch_end = min(len(frames), len(responses) + window)
+                    _send_buffers(self.sock, [part for frame in frames[sent:batch_end] for part in frame])
+                    sent = batch_end
+                (length,) = FRAME_HEADER.unpack(self._recv_exact(FRAME_HEADER.size))
+                responses.append(json_loads(self._recv_exact(length)))
+            return responses
+
+        except Exception as e:
+            # Commands without a response may or may not have run, never resend them
+            error = self._error_response(e)
+            return responses + [dict(error) for _ in range(len(commands) - len(responses))]
+
+    def _error_response(self, error: Exception) -> Dict[str, Any]:
+        # The connection state is unknown after any error, start over on the next command
+        self.close()
+        if isinstance(error, FileNotFoundError):
+            return {'status': 'error', 'message': 'Daemon not running or socket not found'}
+        if isinstance(error, ConnectionRefusedError):
+            return {'status': 'error', 'message': 'Connection refused. Is the daemon running?'}
+        if isinstance(error, socket.timeout):
+            click.echo("Timeout waiting for daemon response", err=True)
+            return {'status': 'error', 'message': 'No response from daemon'}
+        return {'status': 'error', 'message': str(error)}
+
+    def _recv_exact(self, size: int) -> bytearray:
+        # Fill a preallocated buffer in place rather than joining recv() chunks
+        buf = bytearray(size)
+        view = memoryview(buf)
+        offset = 0
+        while offset < size:
+            received = self.sock.recv_into(view[offset:])
+            if not received:
+                raise ConnectionError('No response from daemon')
+            offset += received
+        return buf
+
+def send_command(command: Dict[str, Any]) -> Dict[str, Any]:
+    # One-off command on its own connection, use DaemonClient to send several
+    with DaemonClient() as client:
+        return client.send(command)
+
+# The _format_* helpers return lines so a whole response can be written with one echo
+
+def _format_space_summary(space: Dict[str, Any]) -> List[str]:
+    return [
+        f"  ID: {space['id']}",
+        f"  Name: {space['name']}",
+        f"  Description: {space.get('description', 'N/A')}",
+        ""
+    ]
+
+def _format_space_details(space: Dict[str, Any]) -> List[str]:
+    lines = [
+        "\nSpace Details:",
+        f"  ID: {space['id']}",
+        f"  Name: {space['name']}",
+        f"  Description: {space.get('description', 'N/A')}",
+        f"  Created: {space.get('created_at', 'N/A')}",
+        f"  Updated: {space.get('updated_at', 'N/A')}"
+    ]
     if 'notification_emails' in space and space['notification_emails']:
-        click.echo(f"  Notification Emails: {', '.join(space['notification_emails'])}")
-
-def _format_monitor_summary(monitor: Dict[str, Any]) -> None:
-    click.echo(f"  ID: {monitor['id']}")
-    click.echo(f"  Name: {monitor['name']}")
-    click.echo(f"  Type: {monitor['monitor_type']}")
-    click.echo(f"  Status: {monitor['status']}")
-    click.echo(f"  Space ID: {monitor['space_id']}")
-    click.echo(f"  Check Interval: {monitor.get('check_interval_seconds', 'N/A')} seconds")
-    click.echo(f"  Last Checked: {monitor.get('last_checked_at', 'Never')}")
-    click.echo(f"  Last Healthy: {monitor.get('last_healthy_at', 'Never')}")
+        lines.append(f"  Notification Emails: {', '.join(space['notification_emails'])}")
+    return lines
+
+def _format_monitor_summary(monitor: Dict[str, Any]) -> List[str]:
+    lines = [
+        f"  ID: {monitor['id']}",
+        f"  Name: {monitor['name']}",
+        f"  Type: {monitor['monitor_type']}",
+        f"  Status: {monitor['status']}",
+        f"  Space ID: {monitor['space_id']}",
+        f"  Check Interval: {monitor.get('check_interval_seconds', 'N/A')} seconds",
+        f"  Last Checked: {monitor.get('last_checked_at', 'Never')}",
+        f"  Last Healthy: {monitor.get('last_healthy_at', 'Never')}"
+    ]
     if 'running' in monitor:
-        click.echo(f"  Running: {monitor['running']}")
-    click.echo("")
-
-def _format_monitor_details(monitor: Dict[str, Any]) -> None:
-    click.echo("\nMonitor Details:")
-    click.echo(f"  ID: {monitor['id']}")
-    click.echo(f"  Name: {monitor['name']}")
-    click.echo(f"  Type: {monitor['monitor_type']}")
-    click.echo(f"  Status: {monitor['status']}")
-    click.echo(f"  Space ID: {monitor['space_id']}")
-    click.echo(f"  Check Interval: {monitor.get('check_interval_seconds', 'N/A')} seconds")
-    click.echo(f"  Created: {monitor.get('created_at', 'N/A')}")
-    click.echo(f"  Updated: {monitor.get('updated_at', 'N/A')}")
-    click.echo(f"  Last Checked: {monitor.get('last_checked_at', 'Never')}")
-    click.echo(f"  Last Healthy: {monitor.get('last_healthy_at', 'Never')}")
+        lines.append(f"  Running: {monitor['running']}")
+    lines.append("")
+    return lines
+
+def _format_monitor_details(monitor: Dict[str, Any]) -> List[str]:
+    lines = [
+        "\nMonitor Details:",
+        f"  ID: {monitor['id']}",
+        f"  Name: {monitor['name']}",
+        f"  Type: {monitor['monitor_type']}",
+        f"  Status: {monitor['status']}",
+        f"  Space ID: {monitor['space_id']}",
+        f"  Check Interval: {monitor.get('check_interval_seconds', 'N/A')} seconds",
+        f"  Created: {monitor.get('created_at', 'N/A')}",
+        f"  Updated: {monitor.get('updated_at', 'N/A')}",
+        f"  Last Checked: {monitor.get('last_checked_at', 'Never')}",
+        f"  Last Healthy: {monitor.get('last_healthy_at', 'Never')}"
+    ]
 
     # Type-specific details
     if monitor['monitor_type'] == 'url':
-        click.echo(f"  URL: {monitor.get('url', 'N/A')}")
-        click.echo(f"  Expected Status: {monitor.get('expected_status_code', 'N/A')}")
-        click.echo(f"  Timeout: {monitor.get('timeout_seconds', 'N/A')} seconds")
-        click.echo(f"  Check SSL: {monitor.get('check_ssl', 'N/A')}")
-        click.echo(f"  Follow Redirects: {monitor.get('follow_redirects', 'N/A')}")
+        lines += [
+            f"  URL: {monitor.get('url', 'N/A')}",
+            f"  Expected Status: {monitor.get('expected_status_code', 'N/A')}",
+            f"  Timeout: {monitor.get('timeout_seconds', 'N/A')} seconds",
+            f"  Check SSL: {monitor.get('check_ssl', 'N/A')}",
+            f"  Follow Redirects: {monitor.get('follow_redirects', 'N/A')}"
+        ]
         if monitor.get('check_content'):
-            click.echo(f"  Check Content: {monitor['check_content']}")
+            lines.append(f"  Check Content: {monitor['check_content']}")
     elif monitor['monitor_type'] == 'database':
-        click.echo(f"  Database Type: {monitor.get('db_type', 'N/A')}")
-        click.echo(f"  Host: {monitor.get('host', 'N/A')}")
-        click.echo(f"  Port: {monitor.get('port', 'N/A')}")
-        click.echo(f"  Database: {monitor.get('database', 'N/A')}")
-        click.echo(f"  Connection Timeout: {monitor.get('connection_timeout_seconds', 'N/A')} seconds")
-        click.echo(f"  Query Timeout: {monitor.get('query_timeout_seconds', 'N/A')} seconds")
-        click.echo(f"  Test Query: {monitor.get('test_query', 'N/A')}")
-
-def _format_result(result: Dict[str, Any]) -> None:
+        lines += [
+            f"  Database Type: {monitor.get('db_type', 'N/A')}",
+            f"  Host: {monitor.get('host', 'N/A')}",
+            f"  Port: {monitor.get('port', 'N/A')}",
+            f"  Database: {monitor.get('database', 'N/A')}",
+            f"  Connection Timeout: {monitor.get('connection_timeout_seconds', 'N/A')} seconds",
+            f"  Query Timeout: {monitor.get('query_timeout_seconds', 'N/A')} seconds",
+            f"  Test Query: {monitor.get('test_query', 'N/A')}"
+        ]
+    return lines
+
+# Styled once instead of for every result
+_STATUS_SUCCESS = click.style("SUCCESS", fg='green')
+_STATUS_FAILURE = click.style("FAILURE", fg='red')
+
+def _format_result(result: Dict[str, Any]) -> List[str]:
     # Determine status based on available fields
     is_success = result.get('success', result.get('status') in ['healthy', 'HEALTHY'])
-    status_color = 'green' if is_success else 'red'
-    status_text = click.style("SUCCESS" if is_success else "FAILURE", fg=status_color)
+    status_text = _STATUS_SUCCESS if is_success else _STATUS_FAILURE
 
-    click.echo(f"  Time: {result['timestamp']}")
-    click.echo(f"  Status: {status_text}")
-    click.echo(f"  Response Time: {result.get('response_time_ms', 'N/A')} ms")
+    lines = [
+        f"  Time: {result['timestamp']}",
+        f"  Status: {status_text}",
+        f"  Response Time: {result.get('response_time_ms', 'N/A')} ms"
+    ]
 
     # Show additional result details
     if 'failed_checks' in result:
-        click.echo(f"  Failed Checks: {result['failed_checks']}")
+        lines.append(f"  Failed Checks: {result['failed_checks']}")
     if 'check_list' in result and result['check_list']:
-        click.echo(f"  Checks: {', '.join(result['check_list'])}")
+        lines.append(f"  Checks: {', '.join(result['check_list'])}")
     if 'details' in result and result['details']:
-        click.echo(f"  Details: {result['details']}")
-    click.echo("")
+        lines.append(f"  Details: {result['details']}")
+    lines.append("")
+    return lines
 
-def _format_system_status(response: Dict[str, Any]) -> None:
-    click.echo("\nSystem Status:")
-    click.echo(f"  Running: {response['running']}")
-    click.echo(f"  Total Monitors: {response.get('total_monitors', 0)}")
+def _system_status_lines(response: Dict[str, Any]) -> List[str]:
+    lines = [
+        "\nSystem Status:",
+        f"  Running: {response['running']}",
+        f"  Total Monitors: {response.get('total_monitors', 0)}"
+    ]
     if 'monitors' in response and response['monitors']:
-        click.echo("\nRunning Monitors:")
+        lines.append("\nRunning Monitors:")
         for monitor in response['monitors']:
-            _format_monitor_summary(monitor)
+            lines += _format_monitor_summary(monitor)
+    return lines
+
+def _format_system_status(response: Dict[str, Any]) -> None:
+    click.echo("\n".join(_system_status_lines(response)))
 
 def format_response(response: Dict[str, Any]) -> None:
     if response.get('status') == 'success':
-        click.echo(click.style(f"SUCCESS: {response.get('message', '')}", fg='green'))
+        lines = [click.style(f"SUCCESS: {response.get('message', '')}", fg='green')]
 
         # Handle specific data types
         if 'spaces' in response:
             if not response['spaces']:
-                click.echo("No spaces found.")
+                lines.append("No spaces found.")
             else:
-                click.echo("\nSpaces:")
+                lines.append("\nSpaces:")
                 for space in response['spaces']:
-                    _format_space_summary(space)
+                    lines += _format_space_summary(space)
 
         elif 'space' in response:
-            _format_space_details(response['space'])
+            lines += _format_space_details(response['space'])
 
         elif 'monitors' in response:
             if not response['monitors']:
-                click.echo("No monitors found.")
+                lines.append("No monitors found.")
             else:
-                click.echo("\nMonitors:")
+                lines.append("\nMonitors:")
                 for monitor in response['monitors']:
-                    _format_monitor_summary(monitor)
+                    lines += _format_monitor_summary(monitor)
 
         elif 'monitor' in response:
-            _format_monitor_details(response['monitor'])
+            lines += _format_monitor_details(response['monitor'])
 
         elif 'results' in response:
             if not response['results']:
-                click.echo("No results found.")
+                lines.append("No results found.")
             else:
-                click.echo("\nResults:")
+                lines.append("\nResults:")
                 for result in response['results']:
-                    _format_result(result)
+                    lines += _format_result(result)
 
         elif 'running' in response:
-            _format_system_status(response)
+            lines += _system_status_lines(response)
+
+        click.echo("\n".join(lines))
     else:
         click.echo(click.style(f"ERROR: {response.get('message', 'Unknown error')}", fg='red'), err=True)
 
@@ -176,23 +423,17 @@ def format_table_data(data: list, headers: list) -> None:
     if not data:
         click.echo("No data to display")
         return
-    
-    # Calculate column widths
-    widths = [len(header) for header in headers]
-    for row in data:
-        for i, cell in enumerate(row):
-            if i < len(widths):
-                widths[i] = max(widths[i], len(str(cell)))
-    
-    # Print header
-    header_row = " | ".join(header.ljust(widths[i]) for i, header in enumerate(headers))
-    click.echo(click.style(header_row, fg='cyan', bold=True))
-    click.echo("-" * len(header_row))
-    
-    # Print data rows
-    for row in data:
-        data_row = " | ".join(str(cell).ljust(widths[i]) for i, cell in enumerate(row))
-        click.echo(data_row)
+
+    # Calculate column widths one column at a time
+    str_rows = [[str(cell) for cell in row] for row in data]
+    columns = zip_longest(*str_rows, fillvalue='')
+    widths = [max(len(header), max(map(len, column), default=0)) for header, column in zip(headers, columns)]
+
+    # Print header and data rows in one write
+    header_row = " | ".join(header.ljust(width) for header, width in zip(headers, widths))
+    lines = [click.style(header_row, fg='cyan', bold=True), "-" * len(header_row)]
+    lines += [" | ".join(cell.ljust(width) for cell, width in zip(row, widths)) for row in str_rows]
+    click.echo("\n".join(lines))
 
 def confirm_action(message: str, default: bool = False) -> bool:
     return click.confirm(message, default=default)
@@ -209,12 +450,11 @@ def warning_message(message: str) -> None:
 def info_message(message: str) -> None:
     click.echo(click.style(f"ℹ️  {message}", fg='blue'))
 
+# Canonical hyphenated form, the only one the daemon ever hands out as an ID
+_UUID_RE = re.compile(r'\A[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\Z')
+
 def is_uuid(identifier: str) -> bool:
-    try:
-        uuid.UUID(identifier)
-        return True
-    except ValueError:
-        return False
+    return _UUID_RE.match(identifier) is not None
 
 def resolve_space_identifier(identifier: str) -> Tuple[str, Dict[str, Any]]:
     """
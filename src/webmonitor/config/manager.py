@@ -1,16 +1,30 @@
 import os
-import json
 import logging
 import base64
 from pathlib import Path
-from typing import Optional, Dict, Any
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Mapping
 from datetime import datetime
+from cryptography.fernet import Fernet
+from webmonitor.utils.json_codec import json_dumps_pretty, json_loads
+# Safe at import time, the encryption service only reaches back into config inside its methods
+from webmonitor.utils.encryption_service import encrypt_password, decrypt_password
 
 class ConfigManager:    
     def __init__(self, config_file_path: str = "data/webmonitor_config.json"):
         self.config_file_path = Path(config_file_path)
         self.logger = logging.getLogger(__name__)
         self._config: Optional[Dict[str, Any]] = None
+        # mtime of the file _config was read from or written to, lets load_config skip unchanged files
+        self._config_mtime: Optional[int] = None
+        # (encrypted, decrypted) email password, Fernet decryption is the slowest part of get_email_config
+        self._password_cache: Optional[tuple] = None
+        # Decrypted email settings and the config['email'] dict they were built from
+        self._email_view: Optional[Mapping[str, Any]] = None
+        self._email_view_source: Optional[Dict[str, Any]] = None
+        # is_email_configured answer and the config['email'] dict it was computed for
+        self._email_configured: Optional[bool] = None
+        self._email_configured_source: Optional[Dict[str, Any]] = None
         
     def load_config(self) -> Optional[Dict[str, Any]]:
         if not self.config_file_path.exists():
@@ -18,22 +32,28 @@ class ConfigManager:
             self._create_default_config()
             
         try:
-            with open(self.config_file_path, 'r') as f:
-                self._config = json.load(f)
+            mtime = self.config_file_path.stat().st_mtime_ns
+            if self._config is not None and mtime == self._config_mtime:
+                return self._config
+
+            self._config = self._read_config_file()
+            self._config_mtime = mtime
             self.logger.info("Configuration loaded successfully")
             return self._config
         except Exception as e:
             self.logger.error(f"Failed to load configuration: {e}")
             return None
     
+    def _read_config_file(self) -> Dict[str, Any]:
+        return json_loads(self.config_file_path.read_bytes())
+
     def save_config(self, config: Dict[str, Any]) -> bool:
         try:
             # Ensure data directory exists
-            self.config_file_path.parent.mkdir(exist_ok=True)
+            self.config_file_path.parent.mkdir(parents=True, exist_ok=True)
 
             # Encrypt email password if provided
             if 'email' in config and 'password' in config['email'] and config['email']['password']:
-                from webmonitor.utils import encrypt_password
                 config['email']['encrypted_password'] = encrypt_password(config['email']['password'])
                 # Remove plain text password from config
                 del config['email']['password']
@@ -43,11 +63,23 @@ class ConfigManager:
             if 'configured_at' not in config:
                 config['configured_at'] = config['last_updated']
             
-            # Write configuration file
-            with open(self.config_file_path, 'w') as f:
-                json.dump(config, f, indent=2)
+            # Write configuration file in one go and swap it in, so neither a crash nor a
+            # concurrent reader ever sees half a file. Owner-only, it holds the encryption key.
+            tmp_path = self.config_file_path.with_name(self.config_file_path.name + '.tmp')
+            data = memoryview(json_dumps_pretty(config))
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                while data:
+                    data = data[os.write(fd, data):]
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, self.config_file_path)
             
             self._config = config
+            self._email_view = None
+            self._email_configured = None
+            self._config_mtime = self.config_file_path.stat().st_mtime_ns
             self.logger.info("Configuration saved successfully")
             return True
         except Exception as e:
@@ -60,24 +92,38 @@ class ConfigManager:
         return self._config
     
     def get_email_config(self) -> Optional[Dict[str, Any]]:
+        # Mutable copy for callers that edit and save the settings
+        email_view = self._get_email_view()
+        return dict(email_view) if email_view is not None else None
+
+    def _get_email_view(self) -> Optional[Mapping[str, Any]]:
+        # Read-only decrypted email settings, rebuilt only when the stored email section changes
         config = self.get_config()
         if not config or 'email' not in config:
             return None
-            
-        email_config = config['email'].copy()
+
+        email_source = config['email']
+        if self._email_view is not None and self._email_view_source is email_source:
+            return self._email_view
+
+        email_config = email_source.copy()
         
         # Decrypt password if present
         if 'encrypted_password' in email_config and email_config['encrypted_password']:
             try:
-                from webmonitor.utils import decrypt_password
-                email_config['password'] = decrypt_password(email_config['encrypted_password'])
+                encrypted_password = email_config['encrypted_password']
+                if self._password_cache is None or self._password_cache[0] != encrypted_password:
+                    self._password_cache = (encrypted_password, decrypt_password(encrypted_password))
+                email_config['password'] = self._password_cache[1]
                 # Remove encrypted version from returned config
                 del email_config['encrypted_password']
             except Exception as e:
                 self.logger.error(f"Failed to decrypt email password: {e}")
                 return None
-        
-        return email_config
+
+        self._email_view = MappingProxyType(email_config)
+        self._email_view_source = email_source
+        return self._email_view
     
     def get_health_alerts_config(self) -> Dict[str, Any]:
         config = self.get_config()
@@ -105,12 +151,19 @@ class ConfigManager:
         return self.save_config(config)
     
     def is_email_configured(self) -> bool:
-        email_config = self.get_email_config()
-        if not email_config:
-            return False
-            
+        # Polled on every alert tick, so the answer is kept until the email section is replaced or saved
+        config = self.get_config()
+        email_source = config.get('email') if config else None
+        if self._email_configured is not None and email_source is self._email_configured_source:
+            return self._email_configured
+
+        email_config = self._get_email_view()
         required_fields = ['smtp_host', 'smtp_port', 'username', 'password']
-        return all(field in email_config and email_config[field] for field in required_fields)
+        configured = bool(email_config) and all(field in email_config and email_config[field] for field in required_fields)
+
+        self._email_configured = configured
+        self._email_configured_source = email_source
+        return configured
     
     def _create_default_config(self) -> None:
         default_config = {
@@ -141,11 +194,11 @@ class ConfigManager:
             "enabled": True,
             "cleanup_interval_hours": 24,
             "keep_healthy_results_days": 7,
-            "keep_unhealthy_results_days": 30
+            "keep_unhealthy_results_days": 30,
+            "batch_size": 1000
         }
     
     def _generate_encryption_key(self) -> str:
-        from cryptography.fernet import Fernet
         key = Fernet.generate_key()
         return base64.b64encode(key).decode('utf-8')
 
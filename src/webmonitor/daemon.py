@@ -1,32 +1,223 @@
+import re
 import socket
-import json
+import struct
 import threading
+import queue
 import os
 import time
 import signal
+import selectors
 import sys
 import logging
 import logging.handlers
 import configparser
+from dataclasses import dataclass
 from pathlib import Path
 from .infrastructure import Database
-from .services import MonitorScheduler
+from .services import MonitorScheduler, stop_email_queue
 from .api import CommandHandler
-from concurrent.futures import ThreadPoolExecutor
+from .utils.buffer_pool import BufferPool
+from .utils.json_codec import json_dumps, json_loads
+
+# Every message on the socket is prefixed with its length as a 4-byte big-endian integer
+FRAME_HEADER = struct.Struct('>I')
+
+# Largest command the daemon accepts, the socket is open to every local user so the
+# length header can't be trusted to size a buffer. Batch creates stay far below this.
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+# Seconds a connection may sit without sending anything before it is closed, so idle
+# or stopped clients can't hold a worker thread forever
+CONNECTION_IDLE_TIMEOUT = 60
+
+# Constant head of every connection-level error reply, only the message itself gets encoded
+ERROR_PREFIX = b'{"status":"error","message":'
+
+def _error_reply(message):
+    return ERROR_PREFIX + json_dumps(message) + b'}'
+
+# Signals handled by the main thread, background threads block them so their syscalls aren't interrupted
+HANDLED_SIGNALS = {signal.SIGTERM, signal.SIGINT, signal.SIGHUP}
+
+def _block_handled_signals():
+    signal.pthread_sigmask(signal.SIG_BLOCK, HANDLED_SIGNALS)
+
+# Accept at most this many pending connections per wakeup so a burst cannot starve the event loop
+MAX_ACCEPTS_PER_WAKEUP = 32
+
+# Size of the pooled receive buffers, pipelined commands that fit in one read are served without another recv
+RECV_BUFFER_SIZE = 65536
+
+
+class _FrameReader:
+    # Parses length-prefixed frames out of a pooled receive buffer.
+    # Bytes read past the end of a frame stay in the buffer for the next call.
+    __slots__ = ('conn', 'pool', 'pooled', 'buf', 'start', 'end')
+
+    def __init__(self, conn, pool):
+        self.conn = conn
+        self.pool = pool
+        self.pooled = pool.acquire()
+        self.buf = self.pooled
+        self.start = 0
+        self.end = 0
+
+    def read_frame(self):
+        # Returns a copy of the next frame payload, or None if the client closed the connection between frames
+        header_size = FRAME_HEADER.size
+        while True:
+            if self.end - self.start >= header_size:
+                (length,) = FRAME_HEADER.unpack_from(self.buf, self.start)
+                if length > MAX_FRAME_SIZE:
+                    raise ValueError(f"Command of {length} bytes exceeds the {MAX_FRAME_SIZE} byte limit")
+                frame_end = self.start + header_size + length
+                if frame_end <= self.end:
+                    payload = self.buf[self.start + header_size:frame_end]
+                    self.start = frame_end
+                    if self.start == self.end:
+                        self.start = self.end = 0
+                    return payload
+            else:
+                frame_end = self.start + header_size
+            if frame_end > len(self.buf):
+                self._make_room(frame_end - self.start)
+            with memoryview(self.buf) as view, view[self.end:] as tail:
+                try:
+                    received = self.conn.recv_into(tail)
+                except TimeoutError:
+                    # Idle between commands, hang up like a client disconnect
+                    if self.start == self.end:
+                        return None
+                    raise ConnectionError("Timed out in the middle of a command")
+            if not received:
+                if self.start == self.end:
+                    return None
+                raise ConnectionError("Connection closed in the middle of a command")
+            self.end += received
+
+    def _make_room(self, needed):
+        # Move the unread bytes to the front, switching to a one-off larger buffer for oversized frames
+        pending = self.end - self.start
+        if needed <= len(self.pooled):
+            target = self.pooled
+        else:
+            target = bytearray(needed)
+        target[:pending] = self.buf[self.start:self.end]
+        self.buf = target
+        self.start = 0
+        self.end = pending
+
+    def close(self):
+        self.pool.release(self.pooled)
+
+# Bytes that change nesting or string state in JSON, everything else is skipped by the regex engine
+_JSON_STRUCTURE = re.compile(rb'[{}"\\]')
+
+class _JsonObjectScanner:
+    # Finds where an unframed JSON object ends, looking at each received byte once
+    __slots__ = ('depth', 'in_string', 'skip')
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        # Bytes of the next chunk still covered by a backslash escape
+        self.skip = 0
+
+    def feed(self, chunk):
+        # True once the top-level object is closed
+        start, self.skip = self.skip, 0
+        for match in _JSON_STRUCTURE.finditer(chunk, start):
+            position = match.start()
+            if position < start:
+                continue
+            char = chunk[position]
+            if self.in_string:
+                if char == 0x5c:
+                    # Skip the escaped byte, which may be the first of the next chunk
+                    start = position + 2
+                    self.skip = max(0, start - len(chunk))
+                elif char == 0x22:
+                    self.in_string = False
+            elif char == 0x22:
+                self.in_string = True
+            elif char == 0x7b:
+                self.depth += 1
+            elif char == 0x7d:
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
+
+def _parse_size(size_str):
+    size_str = size_str.upper()
+    if size_str.endswith('KB'):
+        return int(size_str[:-2]) * 1024
+    elif size_str.endswith('MB'):
+        return int(size_str[:-2]) * 1024 * 1024
+    elif size_str.endswith('GB'):
+        return int(size_str[:-2]) * 1024 * 1024 * 1024
+    else:
+        return int(size_str)
+
+@dataclass(frozen=True, slots=True)
+class DaemonConfig:
+    # Daemon settings, read from the config file (and environment) once per load
+    socket_path: str
+    pid_file: str
+    data_dir: str
+    log_dir: str
+    max_workers: int
+    min_workers: int
+    worker_idle_timeout: float
+    log_level: int
+    log_format: str
+    log_file: str
+    max_log_size: int
+    backup_count: int
+
+    @classmethod
+    def load(cls, config_file):
+        # read() skips a missing file, leaving every setting at its fallback
+        config = configparser.ConfigParser()
+        config.read(config_file)
+
+        max_workers = config.getint('daemon', 'max_workers', fallback=10)
+        return cls(
+            socket_path=os.getenv('SOCKET_PATH', config.get('daemon', 'socket_path', fallback='/tmp/webmonitor.sock')),
+            pid_file=config.get('daemon', 'pid_file', fallback='/var/run/webmonitor/webmonitor.pid'),
+            data_dir=os.getenv('WEBMONITOR_DATA_DIR', '/var/lib/webmonitor'),
+            log_dir=os.getenv('WEBMONITOR_LOG_DIR', '/var/log/webmonitor'),
+            max_workers=max_workers,
+            min_workers=min(config.getint('daemon', 'min_workers', fallback=1), max_workers),
+            worker_idle_timeout=config.getfloat('daemon', 'worker_idle_timeout', fallback=60.0),
+            log_level=getattr(logging, config.get('logging', 'log_level', fallback='INFO').upper()),
+            log_format=config.get('logging', 'log_format',
+                                  fallback='%(asctime)s - %(name)s - %(levelname)s - %(message)s'),
+            log_file=config.get('logging', 'log_file', fallback='webmonitor.log'),
+            max_log_size=_parse_size(config.get('logging', 'max_log_size', fallback='10MB')),
+            backup_count=config.getint('logging', 'backup_count', fallback=5),
+        )
 
 class WebMonitorDaemon:
+    __slots__ = (
+        'running', 'config_file', 'cfg', 'socket_path', 'pid_file', 'data_dir', 'log_dir',
+        'logger', 'log_listener', 'database', 'scheduler', 'command_handler',
+        'max_workers', 'min_workers', 'worker_idle_timeout', 'conn_queue', 'buffer_pool',
+        '_workers_lock', '_worker_count', '_idle_workers', '_wakeup_r', '_wakeup_w',
+    )
+
     def __init__(self, config_file=None):
         self.running = True
         self.config_file = config_file or os.getenv('WEBMONITOR_CONFIG', '/etc/webmonitor/webmonitor.conf')
 
         # Load configuration
-        self.config = self._load_config()
+        self.cfg = self._load_config()
 
         # Set up paths
-        self.socket_path = os.getenv('SOCKET_PATH', self.config.get('daemon', 'socket_path', fallback='/tmp/webmonitor.sock'))
-        self.pid_file = self.config.get('daemon', 'pid_file', fallback='/var/run/webmonitor/webmonitor.pid')
-        self.data_dir = os.getenv('WEBMONITOR_DATA_DIR', '/var/lib/webmonitor')
-        self.log_dir = os.getenv('WEBMONITOR_LOG_DIR', '/var/log/webmonitor')
+        self.socket_path = self.cfg.socket_path
+        self.pid_file = self.cfg.pid_file
+        self.data_dir = self.cfg.data_dir
+        self.log_dir = self.cfg.log_dir
 
         # Ensure directories exist
         self._ensure_directories()
@@ -46,73 +237,71 @@ class WebMonitorDaemon:
         # Initialize command handler
         self.command_handler = CommandHandler(self.database, self.scheduler)
 
-        # Add a thread pool for handling connections
-        max_workers = self.config.getint('daemon', 'max_workers', fallback=10)
-        self.thread_pool = ThreadPoolExecutor(max_workers=max_workers)
+        # Worker threads take ready connections off a plain queue, no Future per connection
+        self.max_workers = self.cfg.max_workers
+        self.min_workers = self.cfg.min_workers
+        self.worker_idle_timeout = self.cfg.worker_idle_timeout
+        self.conn_queue = queue.SimpleQueue()
+        self.buffer_pool = BufferPool(RECV_BUFFER_SIZE, max_buffers=self.max_workers)
+        self._workers_lock = threading.Lock()
+        self._worker_count = 0
+        self._idle_workers = 0
+        for _ in range(self.min_workers):
+            self._spawn_worker()
+
+        # Self-pipe used to wake the socket server's event loop on shutdown
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup_r, False)
+        os.set_blocking(self._wakeup_w, False)
 
         # Write PID file
         self._write_pid_file()
 
     def _load_config(self):
-        config = configparser.ConfigParser()
-        if os.path.exists(self.config_file):
-            config.read(self.config_file)
-        return config
+        return DaemonConfig.load(self.config_file)
 
     def _ensure_directories(self):
         directories = [
-            os.path.dirname(self.socket_path),
-            os.path.dirname(self.pid_file),
-            self.data_dir,
-            self.log_dir
+            Path(self.socket_path).parent,
+            Path(self.pid_file).parent,
+            Path(self.data_dir),
+            Path(self.log_dir)
         ]
 
+        # exist_ok makes an existence check beforehand redundant
         for directory in directories:
-            if directory and not os.path.exists(directory):
-                os.makedirs(directory, mode=0o755, exist_ok=True)
+            directory.mkdir(mode=0o755, parents=True, exist_ok=True)
 
     def _setup_logging(self):
-        log_level = getattr(logging, self.config.get('logging', 'log_level', fallback='INFO').upper())
-        log_format = self.config.get('logging', 'log_format',
-                                   fallback='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        cfg = self.cfg
 
         # Create formatter
-        formatter = logging.Formatter(log_format)
+        formatter = logging.Formatter(cfg.log_format)
 
         # Set up root logger
         root_logger = logging.getLogger()
-        root_logger.setLevel(log_level)
+        root_logger.setLevel(cfg.log_level)
 
         # Remove default handlers
         for handler in root_logger.handlers[:]:
             root_logger.removeHandler(handler)
 
-        # Add file handler with rotation
-        log_file = os.path.join(self.log_dir, self.config.get('logging', 'log_file', fallback='webmonitor.log'))
-        max_bytes = self._parse_size(self.config.get('logging', 'max_log_size', fallback='10MB'))
-        backup_count = self.config.getint('logging', 'backup_count', fallback=5)
-
+        # File handler with rotation
+        log_file = os.path.join(self.log_dir, cfg.log_file)
         file_handler = logging.handlers.RotatingFileHandler(
-            log_file, maxBytes=max_bytes, backupCount=backup_count
+            log_file, maxBytes=cfg.max_log_size, backupCount=cfg.backup_count
         )
         file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
 
-        # Add console handler for systemd
+        # Console handler for systemd
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setFormatter(formatter)
-        root_logger.addHandler(console_handler)
-
-    def _parse_size(self, size_str):
-        size_str = size_str.upper()
-        if size_str.endswith('KB'):
-            return int(size_str[:-2]) * 1024
-        elif size_str.endswith('MB'):
-            return int(size_str[:-2]) * 1024 * 1024
-        elif size_str.endswith('GB'):
-            return int(size_str[:-2]) * 1024 * 1024 * 1024
-        else:
-            return int(size_str)
+
+        # Callers only enqueue records, one listener thread does the file and console writes
+        log_queue = queue.SimpleQueue()
+        root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        self.log_listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler)
+        self.log_listener.start()
 
     def _write_pid_file(self):
         try:
@@ -123,8 +312,7 @@ class WebMonitorDaemon:
 
     def _remove_pid_file(self):
         try:
-            if os.path.exists(self.pid_file):
-                os.unlink(self.pid_file)
+            Path(self.pid_file).unlink(missing_ok=True)
         except Exception as e:
             self.logger.warning(f"Could not remove PID file {self.pid_file}: {e}")
 
@@ -147,7 +335,7 @@ class WebMonitorDaemon:
 
     def handle_command(self, command_data):
         try:
-            cmd = json.loads(command_data)
+            cmd = json_loads(command_data)
             return self.command_handler.handle_command(cmd)
         except Exception as e:
             self.logger.error(f"Error handling command: {str(e)}", exc_info=True)
@@ -157,50 +345,187 @@ class WebMonitorDaemon:
         self._start_unix_socket_server()
     
     def _start_unix_socket_server(self):
+        _block_handled_signals()
+
         # Remove existing socket file
-        if os.path.exists(self.socket_path):
-            os.unlink(self.socket_path)
+        Path(self.socket_path).unlink(missing_ok=True)
             
-        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Non-blocking and close-on-exec from creation, no fcntl calls afterwards
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM | socket.SOCK_NONBLOCK | socket.SOCK_CLOEXEC)
         sock.bind(self.socket_path)
-        sock.settimeout(1.0)  # Add timeout to allow checking self.running
         
         # Set socket permissions so user can access it
         os.chmod(self.socket_path, 0o666)
         
         sock.listen(5)
+
+        # Sleep in epoll until a client connects, a client sends data or shutdown is requested
+        selector = selectors.DefaultSelector()
+        selector.register(sock, selectors.EVENT_READ, 'accept')
+        selector.register(self._wakeup_r, selectors.EVENT_READ, 'wakeup')
         
         self.logger.info(f"Unix socket server started at {self.socket_path}")
         
         while self.running:
             try:
-                conn, addr = sock.accept()
-                # Handle connection in thread pool instead of blocking
-                self.thread_pool.submit(self._handle_connection, conn)
-            except socket.timeout:
-                # This is expected due to the timeout we set
-                continue
+                events = selector.select()
             except Exception as e:
                 if self.running:
                     self.logger.error(f"Socket error: {str(e)}", exc_info=True)
-                    
+                continue
+            for key, _ in events:
+                if key.data == 'wakeup':
+                    self._drain_wakeup()
+                elif key.data == 'accept':
+                    self._accept_connections(sock, selector)
+                else:
+                    # The client has sent its first bytes, a worker takes the connection from here
+                    selector.unregister(key.fileobj)
+                    self._dispatch(key.fileobj)
+
+        for key in list(selector.get_map().values()):
+            if key.data == 'client':
+                key.fileobj.close()
+        selector.close()
         sock.close()
-        self.thread_pool.shutdown(wait=False)
+
+    def _accept_connections(self, sock, selector):
+        for _ in range(MAX_ACCEPTS_PER_WAKEUP):
+            try:
+                conn, addr = sock.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except Exception as e:
+                if self.running:
+                    self.logger.error(f"Socket error: {str(e)}", exc_info=True)
+                return
+            # Wait for the command in the event loop instead of parking a worker on an idle client.
+            # accept4 already marks conn close-on-exec, and it stays blocking because the loop only
+            # polls it for readability, so the worker gets it without any mode switch.
+            selector.register(conn, selectors.EVENT_READ, 'client')
+
+    def _drain_wakeup(self):
+        try:
+            while os.read(self._wakeup_r, 512):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _wakeup(self):
+        try:
+            os.write(self._wakeup_w, b'\0')
+        except (BlockingIOError, OSError):
+            pass
     
+    def _spawn_worker(self):
+        # Callers other than __init__ must hold _workers_lock
+        self._worker_count += 1
+        worker = threading.Thread(target=self._worker_loop, daemon=True)
+        worker.start()
+
+    def _dispatch(self, conn):
+        self.conn_queue.put(conn)
+        with self._workers_lock:
+            # Grow the pool only when the queued connections outnumber the waiting workers
+            if self.conn_queue.qsize() > self._idle_workers and self._worker_count < self.max_workers:
+                self._spawn_worker()
+
+    def _worker_loop(self):
+        _block_handled_signals()
+        while True:
+            with self._workers_lock:
+                self._idle_workers += 1
+            try:
+                conn = self.conn_queue.get(timeout=self.worker_idle_timeout)
+            except queue.Empty:
+                with self._workers_lock:
+                    self._idle_workers -= 1
+                    # Workers above the floor exit after sitting idle, unless work arrived meanwhile
+                    if self._worker_count > self.min_workers and self.conn_queue.empty():
+                        self._worker_count -= 1
+                        return
+                continue
+            with self._workers_lock:
+                self._idle_workers -= 1
+            if conn is None:
+                with self._workers_lock:
+                    self._worker_count -= 1
+                return
+            self._handle_connection(conn)
+
+    def _stop_workers(self):
+        # One sentinel per worker, each worker exits after taking one
+        with self._workers_lock:
+            count = self._worker_count
+        for _ in range(count):
+            self.conn_queue.put(None)
+
     def _handle_connection(self, conn):
+        framed = True
         try:
-            data = conn.recv(4096).decode()
-            response = self.handle_command(data)
-            conn.send(json.dumps(response).encode())
+            conn.settimeout(CONNECTION_IDLE_TIMEOUT)
+            # Older clients send a bare JSON document and expect a bare reply
+            framed = conn.recv(1, socket.MSG_PEEK) != b'{'
+            if not framed:
+                data = self._recv_legacy(conn)
+                response = self.handle_command(data)
+                conn.sendall(json_dumps(response))
+            else:
+                # Serve length-prefixed commands until the client hangs up
+                reader = _FrameReader(conn, self.buffer_pool)
+                read_frame = reader.read_frame
+                handle_command = self.handle_command
+                send_frame = self._send_frame
+                try:
+                    while self.running:
+                        data = read_frame()
+                        if data is None:
+                            break
+                        send_frame(conn, json_dumps(handle_command(data)))
+                finally:
+                    reader.close()
             conn.close()
         except Exception as e:
             self.logger.error(f"Error handling connection: {str(e)}", exc_info=True)
             try:
-                conn.send(json.dumps({'status': 'error', 'message': str(e)}).encode())
+                error = _error_reply(str(e))
+                if framed:
+                    self._send_frame(conn, error)
+                else:
+                    conn.sendall(error)
                 conn.close()
             except:
                 pass
-    
+
+    def _recv_legacy(self, conn):
+        # Unframed requests end when the JSON object is complete, the client keeps the socket open.
+        # Each chunk is scanned once for the closing brace instead of re-parsing everything received.
+        chunks = []
+        received = 0
+        scanner = _JsonObjectScanner()
+        while True:
+            chunk = conn.recv(65536)
+            if not chunk:
+                break
+            received += len(chunk)
+            if received > MAX_FRAME_SIZE:
+                raise ValueError(f"Command exceeds the {MAX_FRAME_SIZE} byte limit")
+            chunks.append(chunk)
+            if scanner.feed(chunk):
+                break
+        return b''.join(chunks)
+
+    def _send_frame(self, conn, payload):
+        # Header and payload in one gather write instead of concatenating a copy of the response
+        header = FRAME_HEADER.pack(len(payload))
+        sent = conn.sendmsg([header, payload])
+        if sent < len(header):
+            # Partial write, finish from where it stopped without joining the two
+            conn.sendall(header[sent:])
+            conn.sendall(payload)
+        elif sent < len(header) + len(payload):
+            conn.sendall(memoryview(payload)[sent - len(header):])
+
     def signal_handler(self, signum, frame):
         signal_names = {signal.SIGTERM: 'SIGTERM', signal.SIGINT: 'SIGINT', signal.SIGHUP: 'SIGHUP'}
         signal_name = signal_names.get(signum, str(signum))
@@ -211,12 +536,13 @@ class WebMonitorDaemon:
         else:
             self.logger.info(f"Received {signal_name}, shutting down gracefully...")
             self.running = False
+            self._wakeup()
             self.scheduler.stop()
             self._cleanup()
 
     def _reload_config(self):
         try:
-            self.config = self._load_config()
+            self.cfg = self._load_config()
             self.logger.info("Configuration reloaded successfully")
         except Exception as e:
             self.logger.error(f"Failed to reload configuration: {e}")
@@ -224,18 +550,26 @@ class WebMonitorDaemon:
     def _cleanup(self):
         try:
             # Remove socket file
-            if os.path.exists(self.socket_path):
-                os.unlink(self.socket_path)
+            Path(self.socket_path).unlink(missing_ok=True)
 
             # Remove PID file
             self._remove_pid_file()
 
-            # Shutdown thread pool
-            self.thread_pool.shutdown(wait=True)
+            # Stop the connection workers
+            self._stop_workers()
+
+            # Commit monitor results still waiting in the write-behind queue
+            self.database.close()
+
+            # Deliver queued notification emails, bounded so a dead SMTP server can't hang shutdown
+            stop_email_queue(timeout=30)
 
             self.logger.info("Cleanup completed")
         except Exception as e:
             self.logger.error(f"Error during cleanup: {e}")
+        finally:
+            # Write out the queued log records and stop the listener thread
+            self.log_listener.stop()
         
     def start(self):
         # Set up signal handlers
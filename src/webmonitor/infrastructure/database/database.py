@@ -1,13 +1,38 @@
-from typing import List, Optional, Dict, Any
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, scoped_session
+import threading
+from contextlib import contextmanager
+from typing import List, Optional, Dict, Any, Iterable
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool
 
 from .models import Base, SpaceModel, MonitorModel, MonitorResultModel
 from .space_repository import SpaceRepository
 from .monitor_repository import MonitorRepository
 from .result_repository import ResultRepository
-from webmonitor.models import Space, BaseMonitor, MonitorResult
+from .result_writer import ResultWriter
+from webmonitor.models import Space, BaseMonitor, MonitorSummary, MonitorResult
+from webmonitor.utils.json_codec import json_dumps, json_loads
+
+# Applied to every new SQLite connection: WAL so readers don't block the writer, and no fsync per commit
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+def _json_serialize(value):
+    # JSON columns are text in SQLite, the codec produces bytes
+    return json_dumps(value).decode()
 
 class Database:
     # Database access layer using SQLAlchemy
@@ -16,168 +41,197 @@ class Database:
         if db_url is None:
             db_url = "sqlite:////var/lib/webmonitor/webmonitor.db"   
 
+        connect_args = {}
+        if db_url.startswith("sqlite"):
+            # Pooled connections move between worker threads, and writers wait for the lock instead of failing
+            connect_args = {"check_same_thread": False, "timeout": 30}
+
         self.engine = create_engine(
             db_url, 
+            connect_args=connect_args,
+            json_serializer=_json_serialize,
+            json_deserializer=json_loads,
             poolclass=QueuePool,
             pool_size=5,
             max_overflow=10,
             pool_timeout=30,
             pool_recycle=1800
         )
-        self.Session = scoped_session(sessionmaker(bind=self.engine))
+        if self.engine.dialect.name == "sqlite":
+            event.listen(self.engine, "connect", _apply_sqlite_pragmas)
+        # Repositories hand back domain objects, so nothing needs expiring after a commit
+        self.Session = sessionmaker(bind=self.engine, expire_on_commit=False)
+
+        # One reusable Session object per thread, closed (not discarded) after every call
+        self._local = threading.local()
+
+        # Monitor results are written behind the caller in batches
+        self.result_writer = ResultWriter(self.Session)
         
     def init_db(self):
         Base.metadata.create_all(self.engine)
-    
-    # Space operations
-    def save_space(self, space: Space) -> Space:
-        session = self.Session()
+
+        # create_all skips tables that already exist, so add indexes missing from older databases
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(self.engine, checkfirst=True)
+
+        # One-time rewrite of monitor passwords stored in the old double-base64 format
+        with self._rw_session() as session:
+            MonitorRepository.upgrade_legacy_passwords(session)
+
+        if self.engine.dialect.name == "sqlite":
+            # Refresh planner statistics where they are missing or stale
+            with self.engine.connect() as connection:
+                connection.execute(text("PRAGMA optimize"))
+
+    def close(self):
+        # Commit any results still queued for the writer
+        self.result_writer.close()
+
+    def _take_session(self):
+        # The thread's cached Session if it is free, a new one for nested use
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            return self.Session()
+        self._local.session = None
+        return session
+
+    def _return_session(self, session):
+        # close() releases the connection and clears the identity map, the object stays usable
+        session.close()
+        self._local.session = session
+
+    @contextmanager
+    def _ro_session(self):
+        # Session for reads, nothing to commit
+        session = self._take_session()
+        try:
+            yield session
+        finally:
+            self._return_session(session)
+
+    @contextmanager
+    def _rw_session(self):
+        # Session for writes, committed on success and rolled back on error
+        session = self._take_session()
         try:
-            space = SpaceRepository.save(session, space)
+            yield session
             session.commit()
-            return space
-        except Exception as e:
+        except Exception:
             session.rollback()
-            raise e
+            raise
         finally:
-            session.close()
+            self._return_session(session)
+    
+    # Space operations
+    def save_space(self, space: Space) -> Space:
+        with self._rw_session() as session:
+            return SpaceRepository.save(session, space)
     
     def get_space(self, space_id: str) -> Optional[Space]:
-        session = self.Session()
-        try:
+        with self._ro_session() as session:
             return SpaceRepository.get_by_id(session, space_id)
-        finally:
-            session.close()
+    
+    def get_spaces(self, space_ids: Iterable[str]) -> Dict[str, Space]:
+        with self._ro_session() as session:
+            return SpaceRepository.get_by_ids(session, space_ids)
     
     def get_space_by_name(self, name: str) -> Optional[Space]:
-        session = self.Session()
-        try:
+        with self._ro_session() as session:
             return SpaceRepository.get_by_name(session, name)
-        finally:
-            session.close()
     
     def list_spaces(self) -> List[Space]:
-        session = self.Session()
-        try:
+        with self._ro_session() as session:
             return SpaceRepository.list_all(session)
-        finally:
-            session.close()
     
     def delete_space(self, space_id: str) -> bool:
-        session = self.Session()
-        try:
-            result = SpaceRepository.delete(session, space_id)
-            session.commit()
-            return result
-        except Exception as e:
-            session.rollback()
-            raise e
-        finally:
-            session.close()
+        self.result_writer.flush()
+        with self._rw_session() as session:
+            return SpaceRepository.delete(session, space_id)
     
     # Monitor operations
     def save_monitor(self, monitor: BaseMonitor) -> BaseMonitor:
-        session = self.Session()
-        try:
-            monitor = MonitorRepository.save(session, monitor)
-            session.commit()
-            return monitor
-        except Exception as e:
-            session.rollback()
-            raise e
-        finally:
-            session.close()
+        # A queued check state must not land after (and overwrite) this save
+        self.result_writer.flush(monitor_id=monitor.id)
+        with self._rw_session() as session:
+            return MonitorRepository.save(session, monitor)
+
+    def save_monitors(self, monitors: List[BaseMonitor]) -> List[BaseMonitor]:
+        # Several monitors in one transaction
+        self.result_writer.flush()
+        with self._rw_session() as session:
+            return [MonitorRepository.save(session, monitor) for monitor in monitors]
+
+    def save_monitor_check_state(self, monitor: BaseMonitor) -> BaseMonitor:
+        # Status and check timestamps only, queued for the result writer like results
+        self.result_writer.submit_check_state(monitor)
+        return monitor
     
     def get_monitor(self, monitor_id: str) -> Optional[BaseMonitor]:
-        session = self.Session()
-        try:
+        self.result_writer.flush(monitor_id=monitor_id)
+        with self._ro_session() as session:
             return MonitorRepository.get_by_id(session, monitor_id)
-        finally:
-            session.close()
 
     def get_monitor_by_name(self, name: str, space_id: str = None, space_name: str = None) -> Optional[BaseMonitor]:
-        session = self.Session()
-        try:
+        self.result_writer.flush(space_id=space_id)
+        with self._ro_session() as session:
             return MonitorRepository.get_by_name(session, name, space_id, space_name)
-        finally:
-            session.close()
 
     def list_monitors(self) -> List[BaseMonitor]:
-        session = self.Session()
-        try:
+        self.result_writer.flush()
+        with self._ro_session() as session:
             return MonitorRepository.list_all(session)
-        finally:
-            session.close()
     
     def get_monitors_for_space(self, space_id: str) -> List[BaseMonitor]:
-        session = self.Session()
-        try:
+        self.result_writer.flush(space_id=space_id)
+        with self._ro_session() as session:
             return MonitorRepository.get_by_space_id(session, space_id)
-        finally:
-            session.close()
     
     def delete_monitor(self, monitor_id: str) -> bool:
-        session = self.Session()
-        try:
-            result = MonitorRepository.delete(session, monitor_id)
-            session.commit()
-            return result
-        except Exception as e:
-            session.rollback()
-            raise e
-        finally:
-            session.close()
+        self.result_writer.flush()
+        with self._rw_session() as session:
+            return MonitorRepository.delete(session, monitor_id)
 
     def get_unhealthy_monitors(self, unhealthy_threshold_hours: int) -> List[BaseMonitor]:
-        session = self.Session()
-        try:
+        self.result_writer.flush()
+        with self._ro_session() as session:
             return MonitorRepository.get_unhealthy_monitors(session, unhealthy_threshold_hours)
-        finally:
-            session.close()
+
+    def get_unhealthy_monitor_summaries(self, unhealthy_threshold_hours: int) -> List[MonitorSummary]:
+        self.result_writer.flush()
+        with self._ro_session() as session:
+            return MonitorRepository.get_unhealthy_monitor_summaries(session, unhealthy_threshold_hours)
     
     # Monitor result operations
     def save_result(self, result: MonitorResult) -> MonitorResult:
-        session = self.Session()
-        try:
-            result = ResultRepository.save(session, result)
-            session.commit()
-            return result
-        except Exception as e:
-            session.rollback()
-            raise e
-        finally:
-            session.close()
+        # Queued for the result writer, reads below flush it first so they see their own writes
+        self.result_writer.submit(result)
+        return result
+
+    def save_result_sync(self, result: MonitorResult) -> MonitorResult:
+        with self._rw_session() as session:
+            return ResultRepository.save(session, result)
     
     def get_results_for_monitor(self, monitor_id: str, limit: int = 10) -> List[MonitorResult]:
-        session = self.Session()
-        try:
+        self.result_writer.flush(monitor_id=monitor_id)
+        with self._ro_session() as session:
             return ResultRepository.get_by_monitor_id(session, monitor_id, limit)
-        finally:
-            session.close()
     
     def get_results_for_space(self, space_id: str, limit: int = 10) -> List[MonitorResult]:
-        session = self.Session()
-        try:
+        self.result_writer.flush(space_id=space_id)
+        with self._ro_session() as session:
             return ResultRepository.get_by_space_id(session, space_id, limit)
-        finally:
-            session.close()
 
     def cleanup_old_results(self, keep_healthy_days: int, keep_unhealthy_days: int, batch_size: int = 1000) -> Dict[str, Any]:
-        session = self.Session()
-        try:
+        self.result_writer.flush()
+        with self._rw_session() as session:
             return ResultRepository.cleanup_old_results(session, keep_healthy_days, keep_unhealthy_days, batch_size)
-        except Exception as e:
-            session.rollback()
-            raise e
-        finally:
-            session.close()
 
     def get_cleanup_preview(self, keep_healthy_days: int, keep_unhealthy_days: int) -> Dict[str, Any]:
-        session = self.Session()
-        try:
+        self.result_writer.flush()
+        with self._ro_session() as session:
             return ResultRepository.get_cleanup_preview(session, keep_healthy_days, keep_unhealthy_days)
-        finally:
-            session.close()
 
 
 
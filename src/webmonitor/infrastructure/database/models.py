@@ -1,10 +1,18 @@
-from sqlalchemy import Column, String, Integer, Boolean, Float, ForeignKey, Text, DateTime
+from sqlalchemy import Column, String, Integer, Boolean, Float, ForeignKey, Text, DateTime, Index, JSON
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
+from webmonitor.models import MonitorType, MonitorStatus
 
 # Create base class for SQLAlchemy models
 Base = declarative_base()
 
+# Enum members by their stored string value, one dict lookup per row instead of an Enum call
+MONITOR_TYPES = {member.value: member for member in MonitorType}
+MONITOR_STATUSES = {member.value: member for member in MonitorStatus}
+
+# JSON columns (de)serialized by the engine, Python None stays SQL NULL rather than the JSON text 'null'
+JsonColumnType = JSON(none_as_null=True)
+
 class SpaceModel(Base):
     __tablename__ = 'spaces'
     
@@ -13,13 +21,17 @@ class SpaceModel(Base):
     description = Column(Text, nullable=True)
     created_at = Column(DateTime, nullable=False)
     updated_at = Column(DateTime, nullable=True)
-    notification_emails = Column(Text, nullable=True)  # Store as JSON string
+    notification_emails = Column(JsonColumnType, nullable=True)
     
     # Relationship to monitors
-    monitors = relationship("MonitorModel", back_populates="space", cascade="all, delete-orphan")
+    monitors = relationship("MonitorModel", back_populates="space", cascade="all, delete-orphan", lazy="raise")
 
 class MonitorModel(Base):
     __tablename__ = 'monitors'
+    __table_args__ = (
+        # Monitors of a space
+        Index('ix_monitors_space', 'space_id'),
+    )
     
     id = Column(String(36), primary_key=True)
     name = Column(String(100), nullable=False)
@@ -52,11 +64,17 @@ class MonitorModel(Base):
     test_query = Column(Text, nullable=True)
     
     # Relationships
-    space = relationship("SpaceModel", back_populates="monitors")
-    results = relationship("MonitorResultModel", back_populates="monitor", cascade="all, delete-orphan")
+    space = relationship("SpaceModel", back_populates="monitors", lazy="raise")
+    results = relationship("MonitorResultModel", back_populates="monitor", cascade="all, delete-orphan", lazy="raise")
 
 class MonitorResultModel(Base):
     __tablename__ = 'monitor_results'
+    __table_args__ = (
+        # Latest results of a monitor or a space, and old results by status for cleanup
+        Index('ix_results_monitor_timestamp', 'monitor_id', 'timestamp'),
+        Index('ix_results_space_timestamp', 'space_id', 'timestamp'),
+        Index('ix_results_status_timestamp', 'status', 'timestamp'),
+    )
     
     id = Column(String(36), primary_key=True)
     monitor_id = Column(String(36), ForeignKey('monitors.id'), nullable=False)
@@ -65,9 +83,9 @@ class MonitorResultModel(Base):
     status = Column(String(20), nullable=False)
     monitor_type = Column(String(20), nullable=False)
     response_time_ms = Column(Float, nullable=True)
-    details = Column(Text, nullable=True)  # Store as JSON string
+    details = Column(JsonColumnType, nullable=True)
     failed_checks = Column(Integer, nullable=False)
-    check_list = Column(Text, nullable=True)  # Store as JSON string
+    check_list = Column(JsonColumnType, nullable=True)
     
     # Relationships
-    monitor = relationship("MonitorModel", back_populates="results")
\ No newline at end of file
+    monitor = relationship("MonitorModel", back_populates="results", lazy="raise")
\ No newline at end of file
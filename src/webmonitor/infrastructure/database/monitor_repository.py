@@ -1,11 +1,37 @@
-from typing import List, Optional
+from operator import attrgetter
+from typing import Iterable, List, Optional
 from datetime import datetime, timedelta
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-
-from webmonitor.models import BaseMonitor, UrlMonitor, DatabaseMonitor, MonitorType, MonitorStatus
-from .models import MonitorModel
+from sqlalchemy import and_, bindparam, delete, lambda_stmt, select, update
+
+from webmonitor.utils.encryption_service import LEGACY_TOKEN_PREFIX, upgrade_legacy_token
+from webmonitor.models import BaseMonitor, UrlMonitor, DatabaseMonitor, MonitorSummary, MonitorType, MonitorStatus
+from .models import MonitorModel, SpaceModel, MonitorResultModel, MONITOR_TYPES, MONITOR_STATUSES
+
+# Columns copied as-is onto every monitor, followed by those of each monitor type
+BASE_MONITOR_FIELDS = (
+    'id', 'name', 'space_id', 'check_interval_seconds',
+    'created_at', 'updated_at', 'last_checked_at', 'last_healthy_at'
+)
+URL_MONITOR_FIELDS = (
+    'url', 'expected_status_code', 'timeout_seconds',
+    'check_ssl', 'follow_redirects', 'check_content'
+)
+DATABASE_MONITOR_FIELDS = (
+    'db_type', 'host', 'port', 'database', 'username', 'encrypted_password',
+    'connection_timeout_seconds', 'query_timeout_seconds', 'test_query'
+)
+
+def _monitor_builder(monitor_class, type_fields):
+    fields = BASE_MONITOR_FIELDS + type_fields
+    return monitor_class, fields, attrgetter(*fields)
+
+# monitor_type column value -> (domain class, field names, getter returning those fields as a tuple)
+MONITOR_BUILDERS = {
+    MonitorType.URL.value: _monitor_builder(UrlMonitor, URL_MONITOR_FIELDS),
+    MonitorType.DATABASE.value: _monitor_builder(DatabaseMonitor, DATABASE_MONITOR_FIELDS),
+}
 
 class MonitorRepository:
     """Repository for Monitor operations"""
@@ -43,62 +69,26 @@ class MonitorRepository:
 
     @staticmethod
     def _to_domain_model(db_monitor: MonitorModel) -> Optional[BaseMonitor]:
-        if db_monitor.monitor_type == MonitorType.URL.value:
-            return UrlMonitor(
-                id=db_monitor.id,
-                name=db_monitor.name,
-                space_id=db_monitor.space_id,
-                monitor_type=MonitorType(db_monitor.monitor_type),
-                status=MonitorStatus(db_monitor.status),
-                check_interval_seconds=db_monitor.check_interval_seconds,
-                created_at=db_monitor.created_at,
-                updated_at=db_monitor.updated_at,
-                last_checked_at=db_monitor.last_checked_at,
-                last_healthy_at=db_monitor.last_healthy_at,
-                url=db_monitor.url,
-                expected_status_code=db_monitor.expected_status_code,
-                timeout_seconds=db_monitor.timeout_seconds,
-                check_ssl=db_monitor.check_ssl,
-                follow_redirects=db_monitor.follow_redirects,
-                check_content=db_monitor.check_content
-            )
-        elif db_monitor.monitor_type == MonitorType.DATABASE.value:
-            return DatabaseMonitor(
-                id=db_monitor.id,
-                name=db_monitor.name,
-                space_id=db_monitor.space_id,
-                monitor_type=MonitorType(db_monitor.monitor_type),
-                status=MonitorStatus(db_monitor.status),
-                check_interval_seconds=db_monitor.check_interval_seconds,
-                created_at=db_monitor.created_at,
-                updated_at=db_monitor.updated_at,
-                last_checked_at=db_monitor.last_checked_at,
-                last_healthy_at=db_monitor.last_healthy_at,
-                db_type=db_monitor.db_type,
-                host=db_monitor.host,
-                port=db_monitor.port,
-                database=db_monitor.database,
-                username=db_monitor.username,
-                encrypted_password=db_monitor.encrypted_password,
-                connection_timeout_seconds=db_monitor.connection_timeout_seconds,
-                query_timeout_seconds=db_monitor.query_timeout_seconds,
-                test_query=db_monitor.test_query
-            )
-        return None
+        builder = MONITOR_BUILDERS.get(db_monitor.monitor_type)
+        if builder is None:
+            return None
+        monitor_class, fields, get_fields = builder
+        return monitor_class(
+            monitor_type=MONITOR_TYPES[db_monitor.monitor_type],
+            status=MONITOR_STATUSES[db_monitor.status],
+            **dict(zip(fields, get_fields(db_monitor)))
+        )
 
     @staticmethod
     def _to_domain_models(db_monitors: List[MonitorModel]) -> List[BaseMonitor]:
-        monitors = []
-        for db_monitor in db_monitors:
-            domain_monitor = MonitorRepository._to_domain_model(db_monitor)
-            if domain_monitor:
-                monitors.append(domain_monitor)
-        return monitors
+        # Rows of an unknown monitor type map to None and are dropped
+        to_domain_model = MonitorRepository._to_domain_model
+        return [monitor for monitor in map(to_domain_model, db_monitors) if monitor]
 
     @staticmethod
     def save(session: Session, monitor: BaseMonitor) -> BaseMonitor:
         # Check if monitor already exists
-        db_monitor = session.query(MonitorModel).filter(MonitorModel.id == monitor.id).first()
+        db_monitor = session.get(MonitorModel, monitor.id)
 
         if db_monitor:
             # Update existing monitor
@@ -117,9 +107,56 @@ class MonitorRepository:
 
         return monitor
     
+    @staticmethod
+    def save_check_states(session: Session, states: Iterable) -> None:
+        # One Core UPDATE with a parameter list (executemany) for the columns a check changes,
+        # other edits to the monitor row are left alone
+        params = [
+            {
+                'b_id': state.monitor_id,
+                'b_status': state.status,
+                'b_last_checked_at': state.last_checked_at,
+                'b_last_healthy_at': state.last_healthy_at,
+                'b_updated_at': state.updated_at,
+            }
+            for state in states
+        ]
+        if not params:
+            return
+        table = MonitorModel.__table__
+        session.execute(
+            update(table).where(table.c.id == bindparam('b_id')).values(
+                status=bindparam('b_status'),
+                last_checked_at=bindparam('b_last_checked_at'),
+                last_healthy_at=bindparam('b_last_healthy_at'),
+                updated_at=bindparam('b_updated_at')
+            ),
+            params
+        )
+
+    @staticmethod
+    def upgrade_legacy_passwords(session: Session) -> int:
+        # Rewrite passwords stored with the old extra base64 layer as plain Fernet tokens
+        table = MonitorModel.__table__
+        rows = session.execute(
+            select(table.c.id, table.c.encrypted_password)
+            .where(table.c.encrypted_password.startswith(LEGACY_TOKEN_PREFIX))
+        ).all()
+        if not rows:
+            return 0
+        session.execute(
+            update(table).where(table.c.id == bindparam('b_id'))
+            .values(encrypted_password=bindparam('b_password')),
+            [{'b_id': row.id, 'b_password': upgrade_legacy_token(row.encrypted_password)} for row in rows]
+        )
+        return len(rows)
+
     @staticmethod
     def get_by_id(session: Session, monitor_id: str) -> Optional[BaseMonitor]:
-        db_monitor = session.query(MonitorModel).filter(MonitorModel.id == monitor_id).first()
+        # session.get warns on a None key, the old query simply found nothing
+        if monitor_id is None:
+            return None
+        db_monitor = session.get(MonitorModel, monitor_id)
         if not db_monitor:
             return None
 
@@ -127,13 +164,15 @@ class MonitorRepository:
 
     @staticmethod
     def get_by_name(session: Session, name: str, space_id: str = None, space_name: str = None) -> Optional[BaseMonitor]:
-        query = session.query(MonitorModel).filter(MonitorModel.name == name)
+        # lambda_stmt caches the built statement, each call only binds new parameters
+        stmt = lambda_stmt(lambda: select(MonitorModel).where(MonitorModel.name == name))
         if space_id:
-            query = query.filter(MonitorModel.space_id == space_id)
+            stmt += lambda s: s.where(MonitorModel.space_id == space_id)
         if space_name:
-            query = query.join(SpaceModel).filter(SpaceModel.name == space_name)
+            stmt += lambda s: s.join(SpaceModel).where(SpaceModel.name == space_name)
+        stmt += lambda s: s.limit(1)
 
-        db_monitor = query.first()
+        db_monitor = session.execute(stmt).scalars().first()
         if not db_monitor:
             return None
 
@@ -141,39 +180,75 @@ class MonitorRepository:
 
     @staticmethod
     def list_all(session: Session) -> List[BaseMonitor]:
-        db_monitors = session.query(MonitorModel).all()
+        db_monitors = session.execute(lambda_stmt(lambda: select(MonitorModel))).scalars().all()
         return MonitorRepository._to_domain_models(db_monitors)
     
     @staticmethod
     def get_by_space_id(session: Session, space_id: str) -> List[BaseMonitor]:
-        db_monitors = session.query(MonitorModel).filter(MonitorModel.space_id == space_id).all()
+        db_monitors = session.execute(lambda_stmt(
+            lambda: select(MonitorModel).where(MonitorModel.space_id == space_id)
+        )).scalars().all()
         return MonitorRepository._to_domain_models(db_monitors)
     
     @staticmethod
     def delete(session: Session, monitor_id: str) -> bool:
-        db_monitor = session.query(MonitorModel).filter(MonitorModel.id == monitor_id).first()
-        if not db_monitor:
-            return False
-
-        session.delete(db_monitor)
-        return True
+        # Plain DELETEs instead of loading the monitor and letting the ORM cascade load its results.
+        # Results go first, the foreign key to the monitor is checked on every statement.
+        session.execute(delete(MonitorResultModel).where(MonitorResultModel.monitor_id == monitor_id))
+        deleted = session.execute(
+            delete(MonitorModel).where(MonitorModel.id == monitor_id)
+        ).rowcount
+        return bool(deleted)
 
     @staticmethod
     def get_unhealthy_monitors(session: Session, unhealthy_threshold_hours: int) -> List[BaseMonitor]:
         threshold_time = datetime.now() - timedelta(hours=unhealthy_threshold_hours)
+        offline = MonitorStatus.OFFLINE.value
 
         # Find monitors that:
         # 1. Have been checked at least once (last_checked_at is not None)
         # 2. Either have never been healthy OR last_healthy_at is older than threshold
         # 3. Are not currently OFFLINE (meaning they're being monitored)
-        db_monitors = session.query(MonitorModel).filter(
+        db_monitors = session.execute(lambda_stmt(lambda: select(MonitorModel).where(
             and_(
                 MonitorModel.last_checked_at.isnot(None),  # Has been checked
-                MonitorModel.status != MonitorStatus.OFFLINE.value,  # Is being monitored
+                MonitorModel.status != offline,  # Is being monitored
                 # Either never been healthy OR last healthy time is old
                 (MonitorModel.last_healthy_at.is_(None)) |
                 (MonitorModel.last_healthy_at < threshold_time)
             )
-        ).all()
+        ))).scalars().all()
+
+        return MonitorRepository._to_domain_models(db_monitors)
+
+    @staticmethod
+    def get_unhealthy_monitor_summaries(session: Session, unhealthy_threshold_hours: int) -> List[MonitorSummary]:
+        # Same selection as get_unhealthy_monitors, but only the columns the health alert reports
+        threshold_time = datetime.now() - timedelta(hours=unhealthy_threshold_hours)
+        offline = MonitorStatus.OFFLINE.value
 
-        return MonitorRepository._to_domain_models(db_monitors)
\ No newline at end of file
+        rows = session.execute(lambda_stmt(lambda: select(
+            MonitorModel.id, MonitorModel.space_id, MonitorModel.name, MonitorModel.monitor_type,
+            MonitorModel.status, MonitorModel.last_checked_at, MonitorModel.last_healthy_at
+        ).where(
+            and_(
+                MonitorModel.last_checked_at.isnot(None),
+                MonitorModel.status != offline,
+                (MonitorModel.last_healthy_at.is_(None)) |
+                (MonitorModel.last_healthy_at < threshold_time)
+            )
+        )))
+
+        # Rows of an unknown monitor type are dropped, as _to_domain_models does
+        return [
+            MonitorSummary(
+                id=row.id,
+                space_id=row.space_id,
+                name=row.name,
+                monitor_type=MONITOR_TYPES[row.monitor_type],
+                status=MONITOR_STATUSES[row.status],
+                last_checked_at=row.last_checked_at,
+                last_healthy_at=row.last_healthy_at
+            )
+            for row in rows if row.monitor_type in MONITOR_BUILDERS
+        ]
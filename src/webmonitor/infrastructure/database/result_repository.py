@@ -1,10 +1,26 @@
-import json
-from typing import List, Dict, Any
+import logging
+import time
+from collections import Counter
+from typing import List, Dict, Any, Iterable, Tuple
 from datetime import datetime, timedelta
 
+from sqlalchemy import and_, delete, func, insert, lambda_stmt, or_, select, text
 from sqlalchemy.orm import Session
 from webmonitor.models import MonitorResult, MonitorStatus, MonitorType
-from .models import MonitorResultModel
+from .models import MonitorResultModel, MONITOR_TYPES, MONITOR_STATUSES
+
+# Result listings are fetched this many rows at a time and converted as they arrive,
+# instead of materializing every ORM instance first
+STREAM_BATCH_SIZE = 100
+
+# Cleanup logs its progress every this many batches
+CLEANUP_PROGRESS_INTERVAL = 10
+
+logger = logging.getLogger(__name__)
+
+# Listings select plain columns, the rows carry the same attribute names as the model
+# and skip ORM instance construction and identity-map bookkeeping
+RESULT_COLUMNS = tuple(MonitorResultModel.__table__.c)
 
 class ResultRepository:
     """Repository for MonitorResult operations"""
@@ -17,33 +33,30 @@ class ResultRepository:
         db_result.status = result.status.value
         db_result.monitor_type = result.monitor_type.value
         db_result.response_time_ms = result.response_time_ms
-        db_result.details = json.dumps(result.details) if result.details else None
+        db_result.details = result.details or None
         db_result.failed_checks = result.failed_checks
-        db_result.check_list = json.dumps(result.check_list) if result.check_list else None
+        db_result.check_list = result.check_list or None
 
     @staticmethod
-    def _to_domain_model(db_result: MonitorResultModel) -> MonitorResult:
-        details = json.loads(db_result.details) if db_result.details else None
-
+    def _to_domain_model(db_result) -> MonitorResult:
+        # Accepts a MonitorResultModel or a row of RESULT_COLUMNS
         return MonitorResult(
             id=db_result.id,
             monitor_id=db_result.monitor_id,
             space_id=db_result.space_id,
-            monitor_type=MonitorType(db_result.monitor_type),
+            monitor_type=MONITOR_TYPES[db_result.monitor_type],
             timestamp=db_result.timestamp,
-            status=MonitorStatus(db_result.status),
+            status=MONITOR_STATUSES[db_result.status],
             response_time_ms=db_result.response_time_ms,
-            details=details,
+            details=db_result.details,
             failed_checks=db_result.failed_checks,
-            check_list=json.loads(db_result.check_list) if db_result.check_list else None
+            check_list=db_result.check_list
         )
 
     @staticmethod
-    def _to_domain_models(db_results: List[MonitorResultModel]) -> List[MonitorResult]:
-        results = []
-        for db_result in db_results:
-            results.append(ResultRepository._to_domain_model(db_result))
-        return results
+    def _to_domain_models(db_results: Iterable) -> List[MonitorResult]:
+        to_domain_model = ResultRepository._to_domain_model
+        return [to_domain_model(db_result) for db_result in db_results]
 
     @staticmethod
     def save(session: Session, result: MonitorResult) -> MonitorResult:
@@ -53,25 +66,49 @@ class ResultRepository:
 
         session.add(db_result)
         return result
+
+    @staticmethod
+    def save_all(session: Session, results: List[MonitorResult]) -> None:
+        # One Core INSERT with a parameter list (executemany), no ORM objects or unit of work
+        if not results:
+            return
+        session.execute(insert(MonitorResultModel), [
+            {
+                'id': result.id,
+                'monitor_id': result.monitor_id,
+                'space_id': result.space_id,
+                'timestamp': result.timestamp,
+                'status': result.status.value,
+                'monitor_type': result.monitor_type.value,
+                'response_time_ms': result.response_time_ms,
+                'details': result.details or None,
+                'failed_checks': result.failed_checks,
+                'check_list': result.check_list or None,
+            }
+            for result in results
+        ])
     
     @staticmethod
     def get_by_monitor_id(session: Session, monitor_id: str, limit: int = 100) -> List[MonitorResult]:
-        db_results = session.query(MonitorResultModel)\
-            .filter(MonitorResultModel.monitor_id == monitor_id)\
-            .order_by(MonitorResultModel.timestamp.desc())\
-            .limit(limit)\
-            .all()
+        # lambda_stmt caches the built statement, each call only binds new parameters
+        db_results = session.execute(lambda_stmt(
+            lambda: select(*RESULT_COLUMNS)
+            .where(MonitorResultModel.monitor_id == monitor_id)
+            .order_by(MonitorResultModel.timestamp.desc())
+            .limit(limit)
+        ), execution_options={'yield_per': STREAM_BATCH_SIZE})
 
         return ResultRepository._to_domain_models(db_results)
     
     @staticmethod
     def get_by_space_id(session: Session, space_id: str, limit: int = 1000) -> List[MonitorResult]:
-
-        db_results = session.query(MonitorResultModel)\
-            .filter(MonitorResultModel.space_id == space_id)\
-            .order_by(MonitorResultModel.timestamp.desc())\
-            .limit(limit)\
-            .all()
+        # Streamed in STREAM_BATCH_SIZE chunks, only the domain objects are kept
+        db_results = session.execute(lambda_stmt(
+            lambda: select(*RESULT_COLUMNS)
+            .where(MonitorResultModel.space_id == space_id)
+            .order_by(MonitorResultModel.timestamp.desc())
+            .limit(limit)
+        ), execution_options={'yield_per': STREAM_BATCH_SIZE})
 
         return ResultRepository._to_domain_models(db_results)
 
@@ -81,9 +118,10 @@ class ResultRepository:
         Clean up old monitor results based on retention policies.
         Returns statistics about the cleanup operation.
         """
-        from sqlalchemy import and_
-
+        # Cutoffs stay in local time to match the stored timestamps, the duration uses a
+        # monotonic clock so a wall-clock adjustment mid-cleanup can't skew it
         now = datetime.now()
+        started = time.monotonic()
         healthy_cutoff = now - timedelta(days=keep_healthy_days)
         unhealthy_cutoff = now - timedelta(days=keep_unhealthy_days)
 
@@ -92,70 +130,160 @@ class ResultRepository:
             'unhealthy_deleted': 0,
             'total_deleted': 0,
             'batches_processed': 0,
+            'batch_size': batch_size,
             'start_time': now,
             'errors': []
         }
 
         try:
-            # Clean up old healthy results
-            healthy_deleted = ResultRepository._cleanup_results_by_status(
-                session, healthy_cutoff, MonitorStatus.HEALTHY, batch_size
-            )
-            cleanup_stats['healthy_deleted'] = healthy_deleted
-
-            # Clean up old unhealthy results (UNHEALTHY and UNKNOWN)
-            unhealthy_deleted = 0
-            for status in [MonitorStatus.UNHEALTHY, MonitorStatus.UNKNOWN]:
-                deleted = ResultRepository._cleanup_results_by_status(
-                    session, unhealthy_cutoff, status, batch_size
+            if session.get_bind().dialect.delete_returning:
+                # One pass over both retention rules, DELETE ... RETURNING status splits the counts
+                healthy_deleted, unhealthy_deleted, batches = ResultRepository._cleanup_results_combined(
+                    session, healthy_cutoff, unhealthy_cutoff, batch_size
                 )
-                unhealthy_deleted += deleted
+                cleanup_stats['healthy_deleted'] = healthy_deleted
+                cleanup_stats['batches_processed'] += batches
+            else:
+                # Clean up old healthy results
+                healthy_deleted, batches = ResultRepository._cleanup_results_by_status(
+                    session, healthy_cutoff, MonitorStatus.HEALTHY, batch_size
+                )
+                cleanup_stats['healthy_deleted'] = healthy_deleted
+                cleanup_stats['batches_processed'] += batches
+
+                # Clean up old unhealthy results (UNHEALTHY and UNKNOWN)
+                unhealthy_deleted = 0
+                for status in [MonitorStatus.UNHEALTHY, MonitorStatus.UNKNOWN]:
+                    deleted, batches = ResultRepository._cleanup_results_by_status(
+                        session, unhealthy_cutoff, status, batch_size
+                    )
+                    unhealthy_deleted += deleted
+                    cleanup_stats['batches_processed'] += batches
 
             cleanup_stats['unhealthy_deleted'] = unhealthy_deleted
             cleanup_stats['total_deleted'] = healthy_deleted + unhealthy_deleted
 
+            # Fold the deletions back into the main database file so the WAL doesn't stay large
+            if cleanup_stats['total_deleted'] and session.get_bind().dialect.name == 'sqlite':
+                session.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+
         except Exception as e:
             cleanup_stats['errors'].append(str(e))
             raise
 
         cleanup_stats['end_time'] = datetime.now()
-        cleanup_stats['duration_seconds'] = (cleanup_stats['end_time'] - cleanup_stats['start_time']).total_seconds()
+        cleanup_stats['duration_seconds'] = time.monotonic() - started
 
         return cleanup_stats
 
     @staticmethod
-    def _cleanup_results_by_status(session: Session, cutoff_date: datetime, status: MonitorStatus, batch_size: int) -> int:
-        """Clean up results for a specific status in batches."""
+    def _log_cleanup_progress(deleted: int, batches: int, started: float) -> None:
+        if batches % CLEANUP_PROGRESS_INTERVAL:
+            return
+        elapsed = time.monotonic() - started
+        rate = deleted / elapsed if elapsed > 0 else 0
+        logger.info(f"Cleanup progress: {deleted:,} results deleted in {batches} batches ({rate:.0f} records/second)")
+
+    @staticmethod
+    def _expired_conditions(healthy_cutoff: datetime, unhealthy_cutoff: datetime) -> Tuple[Any, Any]:
+        # (healthy past its cutoff, unhealthy or unknown past theirs), shared by cleanup and preview
+        return (
+            and_(
+                MonitorResultModel.status == MonitorStatus.HEALTHY.value,
+                MonitorResultModel.timestamp < healthy_cutoff
+            ),
+            and_(
+                MonitorResultModel.status.in_([MonitorStatus.UNHEALTHY.value, MonitorStatus.UNKNOWN.value]),
+                MonitorResultModel.timestamp < unhealthy_cutoff
+            )
+        )
+
+    @staticmethod
+    def _cleanup_results_combined(session: Session, healthy_cutoff: datetime, unhealthy_cutoff: datetime, batch_size: int) -> Tuple[int, int, int]:
+        """Clean up healthy and unhealthy results together in batches, returns (healthy, unhealthy, batches)."""
+        healthy_deleted = 0
+        unhealthy_deleted = 0
+        batches = 0
+        started = time.monotonic()
+
+        healthy = MonitorStatus.HEALTHY.value
+        # Oldest first, so a cleanup cut short leaves only the newest expired results behind
+        old_ids = select(MonitorResultModel.id)\
+            .where(or_(*ResultRepository._expired_conditions(healthy_cutoff, unhealthy_cutoff)))\
+            .order_by(MonitorResultModel.timestamp)\
+            .limit(batch_size)
+        deleted = delete(MonitorResultModel)\
+            .where(MonitorResultModel.id.in_(old_ids))\
+            .returning(MonitorResultModel.status)
+        if session.get_bind().dialect.name == 'postgresql':
+            # WITH deleted AS (DELETE ... RETURNING status) SELECT status, count(*) ... GROUP BY status,
+            # the server tallies each batch and sends back one row per status instead of one per result
+            deleted = deleted.cte('deleted')
+            statement = select(deleted.c.status, func.count()).group_by(deleted.c.status)
+        else:
+            statement = deleted.execution_options(synchronize_session=False)
+
+        while True:
+            if statement.is_select:
+                counts = dict(session.execute(statement).all())
+            else:
+                counts = Counter(session.execute(statement).scalars())
+            batch_count = sum(counts.values())
+
+            # Commit the batch to avoid long-running transactions
+            session.commit()
+            if not batch_count:
+                break
+
+            batches += 1
+            batch_healthy = counts.get(healthy, 0)
+            healthy_deleted += batch_healthy
+            unhealthy_deleted += batch_count - batch_healthy
+            ResultRepository._log_cleanup_progress(healthy_deleted + unhealthy_deleted, batches, started)
+
+            # If we got less than batch_size, we're done
+            if batch_count < batch_size:
+                break
+
+        return healthy_deleted, unhealthy_deleted, batches
+
+    @staticmethod
+    def _cleanup_results_by_status(session: Session, cutoff_date: datetime, status: MonitorStatus, batch_size: int) -> Tuple[int, int]:
+        """Clean up results for a specific status in batches, returns (deleted, batches)."""
         total_deleted = 0
+        batches = 0
+        started = time.monotonic()
+
+        # Delete by primary key in the database, without loading the rows into the session.
+        # Oldest first, so the (status, timestamp) index serves the filter and the order with no sort.
+        old_ids = select(MonitorResultModel.id)\
+            .where(and_(
+                MonitorResultModel.timestamp < cutoff_date,
+                MonitorResultModel.status == status.value
+            ))\
+            .order_by(MonitorResultModel.timestamp)\
+            .limit(batch_size)
+        statement = delete(MonitorResultModel)\
+            .where(MonitorResultModel.id.in_(old_ids))\
+            .execution_options(synchronize_session=False)
 
         while True:
-            # Find a batch of old results to delete
-            old_results = session.query(MonitorResultModel)\
-                .filter(and_(
-                    MonitorResultModel.timestamp < cutoff_date,
-                    MonitorResultModel.status == status.value
-                ))\
-                .limit(batch_size)\
-                .all()
-
-            if not old_results:
-                break  # No more results to delete
-
-            # Delete the batch
-            for result in old_results:
-                session.delete(result)
-
-            batch_count = len(old_results)
-            total_deleted += batch_count
+            batch_count = session.execute(statement).rowcount
 
             # Commit the batch to avoid long-running transactions
             session.commit()
+            if not batch_count:
+                break
+
+            batches += 1
+            total_deleted += batch_count
+            ResultRepository._log_cleanup_progress(total_deleted, batches, started)
 
             # If we got less than batch_size, we're done
             if batch_count < batch_size:
                 break
 
-        return total_deleted
+        return total_deleted, batches
 
     @staticmethod
     def get_cleanup_preview(session: Session, keep_healthy_days: int, keep_unhealthy_days: int) -> Dict[str, Any]:
@@ -163,30 +291,35 @@ class ResultRepository:
         Preview what would be deleted without actually deleting anything.
         Useful for safety checks and reporting.
         """
-        from sqlalchemy import and_, func
-
         now = datetime.now()
         healthy_cutoff = now - timedelta(days=keep_healthy_days)
         unhealthy_cutoff = now - timedelta(days=keep_unhealthy_days)
 
-        # Count healthy results that would be deleted
-        healthy_count = session.query(func.count(MonitorResultModel.id))\
-            .filter(and_(
-                MonitorResultModel.timestamp < healthy_cutoff,
-                MonitorResultModel.status == MonitorStatus.HEALTHY.value
-            ))\
-            .scalar()
-
-        # Count unhealthy results that would be deleted
-        unhealthy_count = session.query(func.count(MonitorResultModel.id))\
-            .filter(and_(
-                MonitorResultModel.timestamp < unhealthy_cutoff,
-                MonitorResultModel.status.in_([MonitorStatus.UNHEALTHY.value, MonitorStatus.UNKNOWN.value])
-            ))\
-            .scalar()
-
-        # Get total count for reference
-        total_count = session.query(func.count(MonitorResultModel.id)).scalar()
+        healthy_expired, unhealthy_expired = ResultRepository._expired_conditions(healthy_cutoff, unhealthy_cutoff)
+
+        # Cheap probe first: when nothing has aged past either cutoff, skip both counts
+        any_expired = session.query(MonitorResultModel.id)\
+            .filter(or_(healthy_expired, unhealthy_expired))\
+            .limit(1)\
+            .first() is not None
+
+        healthy_count = 0
+        unhealthy_count = 0
+        if any_expired:
+            # Count healthy results that would be deleted
+            healthy_count = session.query(func.count())\
+                .select_from(MonitorResultModel)\
+                .filter(healthy_expired)\
+                .scalar()
+
+            # Count unhealthy results that would be deleted
+            unhealthy_count = session.query(func.count())\
+                .select_from(MonitorResultModel)\
+                .filter(unhealthy_expired)\
+                .scalar()
+
+        # Get total count for reference (COUNT(*) so each count can be answered from an index alone)
+        total_count = session.query(func.count()).select_from(MonitorResultModel).scalar()
 
         return {
             'healthy_to_delete': healthy_count,
@@ -0,0 +1,138 @@
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from webmonitor.models import BaseMonitor, MonitorResult
+from .monitor_repository import MonitorRepository
+from .result_repository import ResultRepository
+
+# Queue marker asking the writer to commit what it has without waiting out max_latency
+_FLUSH = object()
+
+class MonitorCheckState(NamedTuple):
+    # Snapshot of the monitor columns a check updates, taken when queued since the monitor keeps changing
+    monitor_id: str
+    space_id: str
+    status: str
+    last_checked_at: Optional[datetime]
+    last_healthy_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+class ResultWriter:
+    """Write-behind queue for monitor results and check states, written in batches by a background thread"""
+
+    def __init__(self, session_factory, batch_size: int = 100, max_latency: float = 0.2):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self.logger = logging.getLogger(__name__)
+        self._queue = queue.Queue()
+        self._closed = False
+        # Queued but not yet committed results, per monitor and per space
+        self._pending_lock = threading.Lock()
+        self._pending_monitors = Counter()
+        self._pending_spaces = Counter()
+        self._thread = threading.Thread(target=self._run, name="ResultWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, result: MonitorResult) -> None:
+        with self._pending_lock:
+            self._pending_monitors[result.monitor_id] += 1
+            self._pending_spaces[result.space_id] += 1
+        self._queue.put(result)
+
+    def submit_check_state(self, monitor: BaseMonitor) -> None:
+        state = MonitorCheckState(
+            monitor.id, monitor.space_id, monitor.status.value,
+            monitor.last_checked_at, monitor.last_healthy_at, monitor.updated_at
+        )
+        with self._pending_lock:
+            self._pending_monitors[state.monitor_id] += 1
+            self._pending_spaces[state.space_id] += 1
+        self._queue.put(state)
+
+    def flush(self, monitor_id: Optional[str] = None, space_id: Optional[str] = None) -> None:
+        # Block until queued results have been committed (or failed).
+        # With a monitor or space id, return at once if none of the queued results belong to it.
+        with self._pending_lock:
+            if monitor_id is not None and not self._pending_monitors[monitor_id]:
+                return
+            if space_id is not None and not self._pending_spaces[space_id]:
+                return
+        if self._queue.unfinished_tasks == 0:
+            return
+        self._queue.put(_FLUSH)
+        self._queue.join()
+
+    def close(self) -> None:
+        # Write out whatever is still queued, then stop the thread
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            if item is _FLUSH:
+                self._queue.task_done()
+                continue
+
+            # Collect more results until the batch is full or the oldest one has waited long enough
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self.max_latency
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None or item is _FLUSH:
+                    stop = item is None
+                    self._queue.task_done()
+                    break
+                batch.append(item)
+
+            self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch):
+        results = []
+        # Only the latest state of each monitor in the batch needs writing
+        states = {}
+        for item in batch:
+            if isinstance(item, MonitorCheckState):
+                states[item.monitor_id] = item
+            else:
+                results.append(item)
+
+        session = self.session_factory()
+        try:
+            ResultRepository.save_all(session, results)
+            MonitorRepository.save_check_states(session, states.values())
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            self.logger.error(f"Failed to save {len(results)} monitor results and {len(states)} monitor states: {str(e)}")
+        finally:
+            session.close()
+            with self._pending_lock:
+                for item in batch:
+                    self._pending_monitors[item.monitor_id] -= 1
+                    self._pending_spaces[item.space_id] -= 1
+                self._pending_monitors += Counter()
+                self._pending_spaces += Counter()
@@ -1,11 +1,11 @@
-import json
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from datetime import datetime
 
+from sqlalchemy import delete, lambda_stmt, select
 from sqlalchemy.orm import Session
 
 from webmonitor.models import Space
-from .models import SpaceModel
+from .models import SpaceModel, MonitorModel, MonitorResultModel
 
 class SpaceRepository:
     """Repository for Space operations"""
@@ -15,32 +15,28 @@ class SpaceRepository:
         db_space.name = space.name
         db_space.description = space.description
         db_space.updated_at = space.updated_at
-        db_space.notification_emails = json.dumps(space.notification_emails) if space.notification_emails else None
+        db_space.notification_emails = space.notification_emails or None
 
     @staticmethod
     def _to_domain_model(db_space: SpaceModel) -> Space:
-        notification_emails = json.loads(db_space.notification_emails) if db_space.notification_emails else []
-
         return Space(
             id=db_space.id,
             name=db_space.name,
             description=db_space.description,
             created_at=db_space.created_at,
             updated_at=db_space.updated_at,
-            notification_emails=notification_emails
+            notification_emails=db_space.notification_emails or []
         )
 
     @staticmethod
     def _to_domain_models(db_spaces: List[SpaceModel]) -> List[Space]:
-        spaces = []
-        for db_space in db_spaces:
-            spaces.append(SpaceRepository._to_domain_model(db_space))
-        return spaces
+        to_domain_model = SpaceRepository._to_domain_model
+        return [to_domain_model(db_space) for db_space in db_spaces]
 
     @staticmethod
     def save(session: Session, space: Space) -> Space:
         # Check if space already exists
-        db_space = session.query(SpaceModel).filter(SpaceModel.id == space.id).first()
+        db_space = session.get(SpaceModel, space.id)
 
         if db_space:
             # Update existing space
@@ -58,15 +54,32 @@ class SpaceRepository:
     
     @staticmethod
     def get_by_id(session: Session, space_id: str) -> Optional[Space]:
-        db_space = session.query(SpaceModel).filter(SpaceModel.id == space_id).first()
+        # session.get warns on a None key, the old query simply found nothing
+        if space_id is None:
+            return None
+        db_space = session.get(SpaceModel, space_id)
         if not db_space:
             return None
 
         return SpaceRepository._to_domain_model(db_space)
     
+    @staticmethod
+    def get_by_ids(session: Session, space_ids: Iterable[str]) -> Dict[str, Space]:
+        # One IN query for several spaces, ids that don't exist are simply absent from the result
+        space_ids = list(space_ids)
+        if not space_ids:
+            return {}
+        db_spaces = session.execute(
+            select(SpaceModel).where(SpaceModel.id.in_(space_ids))
+        ).scalars()
+        return {db_space.id: SpaceRepository._to_domain_model(db_space) for db_space in db_spaces}
+    
     @staticmethod
     def get_by_name(session: Session, name: str) -> Optional[Space]:
-        db_space = session.query(SpaceModel).filter(SpaceModel.name == name).first()
+        # lambda_stmt caches the built statement, each call only binds new parameters
+        db_space = session.execute(lambda_stmt(
+            lambda: select(SpaceModel).where(SpaceModel.name == name).limit(1)
+        )).scalars().first()
         if not db_space:
             return None
 
@@ -74,14 +87,16 @@ class SpaceRepository:
     
     @staticmethod
     def list_all(session: Session) -> List[Space]:
-        db_spaces = session.query(SpaceModel).all()
+        db_spaces = session.execute(lambda_stmt(lambda: select(SpaceModel))).scalars().all()
         return SpaceRepository._to_domain_models(db_spaces)
     
     @staticmethod
     def delete(session: Session, space_id: str) -> bool:
-        db_space = session.query(SpaceModel).filter(SpaceModel.id == space_id).first()
-        if not db_space:
-            return False
-        
-        session.delete(db_space)
-        return True
\ No newline at end of file
+        # Plain DELETEs for the space and what the ORM cascade used to load and remove one by one.
+        # Children go first, results then monitors, as foreign keys are checked on every statement.
+        session.execute(delete(MonitorResultModel).where(MonitorResultModel.space_id == space_id))
+        session.execute(delete(MonitorModel).where(MonitorModel.space_id == space_id))
+        deleted = session.execute(
+            delete(SpaceModel).where(SpaceModel.id == space_id)
+        ).rowcount
+        return bool(deleted)
\ No newline at end of file
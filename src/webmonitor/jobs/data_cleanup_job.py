@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 from .base_job import BaseJob
 from webmonitor.infrastructure import Database
@@ -9,28 +9,49 @@ class DataCleanupJob(BaseJob):
         super().__init__("data_cleanup")
         self.database = database
         self.config_manager = get_config_manager()
+        # Validated cleanup settings and the data_cleanup config dict they were resolved from
+        self._settings: Optional[Tuple[bool, int, int, int]] = None
+        self._settings_source: Optional[Dict[str, Any]] = None
+    
+    def _get_settings(self) -> Tuple[bool, int, int, int]:
+        # (enabled, keep_healthy_days, keep_unhealthy_days, batch_size)
+        # The config manager hands back the same dict until the file changes,
+        # so the settings are only re-resolved (and warned about) after a config change
+        cleanup_config = self.config_manager.get_data_cleanup_config()
+        if self._settings is not None and cleanup_config is self._settings_source:
+            return self._settings
+
+        keep_healthy_days = cleanup_config.get('keep_healthy_results_days', 7)
+        keep_unhealthy_days = cleanup_config.get('keep_unhealthy_results_days', 30)
+        
+        # Safety check: Don't allow cleanup of very recent data
+        if keep_healthy_days < 1:
+            self.logger.warning("keep_healthy_results_days must be at least 1, using default of 7")
+            keep_healthy_days = 7
+        
+        if keep_unhealthy_days < 1:
+            self.logger.warning("keep_unhealthy_results_days must be at least 1, using default of 30")
+            keep_unhealthy_days = 30
+
+        # Rows deleted per transaction, tunable per database to trade lock time against round trips
+        batch_size = cleanup_config.get('batch_size', 1000)
+        if batch_size < 1:
+            self.logger.warning("batch_size must be at least 1, using default of 1000")
+            batch_size = 1000
+
+        self._settings = (cleanup_config.get('enabled', True), keep_healthy_days, keep_unhealthy_days, batch_size)
+        self._settings_source = cleanup_config
+        return self._settings
     
     def execute(self) -> bool:
         try:
             # Get data cleanup configuration
-            cleanup_config = self.config_manager.get_data_cleanup_config()
+            enabled, keep_healthy_days, keep_unhealthy_days, batch_size = self._get_settings()
             
-            if not cleanup_config.get('enabled', True):
+            if not enabled:
                 self.logger.info("Data cleanup is disabled")
                 return True
             
-            keep_healthy_days = cleanup_config.get('keep_healthy_results_days', 7)
-            keep_unhealthy_days = cleanup_config.get('keep_unhealthy_results_days', 30)
-            
-            # Safety check: Don't allow cleanup of very recent data
-            if keep_healthy_days < 1:
-                self.logger.warning("keep_healthy_results_days must be at least 1, using default of 7")
-                keep_healthy_days = 7
-            
-            if keep_unhealthy_days < 1:
-                self.logger.warning("keep_unhealthy_results_days must be at least 1, using default of 30")
-                keep_unhealthy_days = 30
-            
             # Get preview of what will be deleted
             preview = self.database.get_cleanup_preview(keep_healthy_days, keep_unhealthy_days)
             
@@ -58,7 +79,7 @@ class DataCleanupJob(BaseJob):
             cleanup_stats = self.database.cleanup_old_results(
                 keep_healthy_days=keep_healthy_days,
                 keep_unhealthy_days=keep_unhealthy_days,
-                batch_size=1000  # Process in batches to avoid long locks
+                batch_size=batch_size  # Process in batches to avoid long locks
             )
             
             # Log cleanup results
@@ -94,7 +115,7 @@ class DataCleanupJob(BaseJob):
         self.logger.info(f"")
         self.logger.info(f"Performance:")
         self.logger.info(f"  - Duration: {duration:.2f} seconds")
-        self.logger.info(f"  - Batches processed: {stats.get('batches_processed', 0)}")
+        self.logger.info(f"  - Batches processed: {stats.get('batches_processed', 0)} (batch size {stats.get('batch_size', 0):,})")
         if duration > 0 and stats.get('total_deleted', 0) > 0:
             rate = stats['total_deleted'] / duration
             self.logger.info(f"  - Deletion rate: {rate:.0f} records/second")
@@ -102,8 +123,6 @@ class DataCleanupJob(BaseJob):
     
     def get_cleanup_preview(self) -> Dict[str, Any]:
         """Get a preview of what would be cleaned up without actually doing it."""
-        cleanup_config = self.config_manager.get_data_cleanup_config()
-        keep_healthy_days = cleanup_config.get('keep_healthy_results_days', 7)
-        keep_unhealthy_days = cleanup_config.get('keep_unhealthy_results_days', 30)
+        _, keep_healthy_days, keep_unhealthy_days, _ = self._get_settings()
         
         return self.database.get_cleanup_preview(keep_healthy_days, keep_unhealthy_days)
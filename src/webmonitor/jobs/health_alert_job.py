@@ -1,10 +1,61 @@
+from collections import defaultdict
 from typing import List, Dict, Any
 from datetime import datetime
+from html import escape
 from .base_job import BaseJob
 from webmonitor.infrastructure import Database
-from webmonitor.models import BaseMonitor, Space
+from webmonitor.models import MonitorSummary, Space
 from webmonitor.config import get_config_manager
-from webmonitor.services.email_service import send_notification_email
+from webmonitor.services.email_queue import enqueue_email
+
+def _format_timestamp(value: datetime) -> str:
+    # Same text as strftime('%Y-%m-%d %H:%M:%S') for the naive timestamps stored here, several times faster
+    return value.isoformat(sep=' ', timespec='seconds')
+
+# Alert email pieces: a static head with the styles, then the header, monitor and footer
+# templates formatted per space and per monitor, all joined once.
+# Names are user input and are HTML-escaped before they go in.
+ALERT_EMAIL_HEAD = """
+        <html>
+        <head>
+            <style>
+                body { font-family: Arial, sans-serif; margin: 20px; }
+                .header { background-color: #f8d7da; color: #721c24; padding: 15px; border-radius: 5px; margin-bottom: 20px; }
+                .monitor { background-color: #f8f9fa; padding: 10px; margin: 10px 0; border-left: 4px solid #dc3545; }
+                .monitor-name { font-weight: bold; color: #dc3545; }
+                .monitor-details { margin-top: 5px; font-size: 0.9em; color: #6c757d; }
+                .footer { margin-top: 30px; padding-top: 20px; border-top: 1px solid #dee2e6; font-size: 0.8em; color: #6c757d; }
+            </style>
+        </head>"""
+
+ALERT_EMAIL_HEADER = """
+        <body>
+            <div class="header">
+                <h2>🚨 Health Alert for Space: {space_name}</h2>
+                <p>The following monitors have been unhealthy for more than {threshold_hours} hours:</p>
+            </div>
+        """
+
+ALERT_EMAIL_MONITOR = """
+            <div class="monitor">
+                <div class="monitor-name">{name}</div>
+                <div class="monitor-details">
+                    <strong>Type:</strong> {monitor_type}<br>
+                    <strong>Status:</strong> {status}<br>
+                    <strong>Last Healthy:</strong> {last_healthy}<br>
+                    <strong>Last Checked:</strong> {last_checked}
+                </div>
+            </div>
+            """
+
+ALERT_EMAIL_FOOTER = """
+            <div class="footer">
+                <p>This alert was generated at {generated_at} by Web Monitor.</p>
+                <p>Please check your monitoring dashboard for more details and take appropriate action.</p>
+            </div>
+        </body>
+        </html>
+        """
 
 class HealthAlertJob(BaseJob):
     def __init__(self, database: Database):
@@ -28,8 +79,8 @@ class HealthAlertJob(BaseJob):
             
             threshold_hours = health_config.get('unhealthy_threshold_hours', 24)
             
-            # Get monitors that have been unhealthy for too long
-            unhealthy_monitors = self.database.get_unhealthy_monitors(threshold_hours)
+            # Get monitors that have been unhealthy for too long, only the fields the alert shows
+            unhealthy_monitors = self.database.get_unhealthy_monitor_summaries(threshold_hours)
             
             if not unhealthy_monitors:
                 self.logger.info("No monitors found that have been unhealthy for extended periods")
@@ -38,10 +89,11 @@ class HealthAlertJob(BaseJob):
             # Group monitors by space for organized notifications
             monitors_by_space = self._group_monitors_by_space(unhealthy_monitors)
             
-            # Send alerts for each space
+            # Send alerts for each space, looking all the spaces up in one query
+            spaces = self.database.get_spaces(monitors_by_space)
             alerts_sent = 0
             for space_id, monitors in monitors_by_space.items():
-                space = self.database.get_space(space_id)
+                space = spaces.get(space_id)
                 if space and space.notification_emails:
                     success = self._send_health_alert(space, monitors, threshold_hours)
                     if success:
@@ -56,23 +108,21 @@ class HealthAlertJob(BaseJob):
             self.logger.error(f"Health alert job failed: {str(e)}", exc_info=True)
             return False
     
-    def _group_monitors_by_space(self, monitors: List[BaseMonitor]) -> Dict[str, List[BaseMonitor]]:
-        grouped = {}
+    def _group_monitors_by_space(self, monitors: List[MonitorSummary]) -> Dict[str, List[MonitorSummary]]:
+        grouped = defaultdict(list)
         for monitor in monitors:
-            if monitor.space_id not in grouped:
-                grouped[monitor.space_id] = []
             grouped[monitor.space_id].append(monitor)
-        return grouped
+        return dict(grouped)
     
-    def _send_health_alert(self, space: Space, monitors: List[BaseMonitor], threshold_hours: int) -> bool:
+    def _send_health_alert(self, space: Space, monitors: List[MonitorSummary], threshold_hours: int) -> bool:
         try:
             subject = f"🚨 Health Alert: {len(monitors)} monitor(s) unhealthy in {space.name}"
             
             # Create email body
             body = self._create_alert_email_body(space, monitors, threshold_hours)
             
-            # Send email
-            success = send_notification_email(
+            # Hand the email to the background sender so a slow SMTP server doesn't hold up the job
+            success = enqueue_email(
                 recipients=space.notification_emails,
                 subject=subject,
                 body=body,
@@ -80,7 +130,7 @@ class HealthAlertJob(BaseJob):
             )
             
             if success:
-                self.logger.info(f"Health alert sent for space '{space.name}' with {len(monitors)} unhealthy monitors")
+                self.logger.info(f"Health alert queued for space '{space.name}' with {len(monitors)} unhealthy monitors")
             
             return success
             
@@ -88,60 +138,32 @@ class HealthAlertJob(BaseJob):
             self.logger.error(f"Failed to send health alert for space {space.name}: {str(e)}")
             return False
     
-    def _create_alert_email_body(self, space: Space, monitors: List[BaseMonitor], threshold_hours: int) -> str:
+    def _create_alert_email_body(self, space: Space, monitors: List[MonitorSummary], threshold_hours: int) -> str:
         now = datetime.now()
         
-        body = f"""
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                .header {{ background-color: #f8d7da; color: #721c24; padding: 15px; border-radius: 5px; margin-bottom: 20px; }}
-                .monitor {{ background-color: #f8f9fa; padding: 10px; margin: 10px 0; border-left: 4px solid #dc3545; }}
-                .monitor-name {{ font-weight: bold; color: #dc3545; }}
-                .monitor-details {{ margin-top: 5px; font-size: 0.9em; color: #6c757d; }}
-                .footer {{ margin-top: 30px; padding-top: 20px; border-top: 1px solid #dee2e6; font-size: 0.8em; color: #6c757d; }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h2>🚨 Health Alert for Space: {space.name}</h2>
-                <p>The following monitors have been unhealthy for more than {threshold_hours} hours:</p>
-            </div>
-        """
+        parts = [ALERT_EMAIL_HEAD, ALERT_EMAIL_HEADER.format(space_name=escape(space.name), threshold_hours=threshold_hours)]
         
         for monitor in monitors:
             # Calculate how long it's been unhealthy
             if monitor.last_healthy_at:
-                unhealthy_duration = now - monitor.last_healthy_at
-                unhealthy_hours = int(unhealthy_duration.total_seconds() / 3600)
-                last_healthy_text = f"{unhealthy_hours} hours ago ({monitor.last_healthy_at.strftime('%Y-%m-%d %H:%M:%S')})"
+                unhealthy_hours = int((now - monitor.last_healthy_at).total_seconds() / 3600)
+                last_healthy_text = f"{unhealthy_hours} hours ago ({_format_timestamp(monitor.last_healthy_at)})"
             else:
                 last_healthy_text = "Never been healthy"
             
             last_checked_text = "Never checked"
             if monitor.last_checked_at:
-                last_checked_text = monitor.last_checked_at.strftime('%Y-%m-%d %H:%M:%S')
-            
-            body += f"""
-            <div class="monitor">
-                <div class="monitor-name">{monitor.name}</div>
-                <div class="monitor-details">
-                    <strong>Type:</strong> {monitor.monitor_type.value}<br>
-                    <strong>Status:</strong> {monitor.status.value}<br>
-                    <strong>Last Healthy:</strong> {last_healthy_text}<br>
-                    <strong>Last Checked:</strong> {last_checked_text}
-                </div>
-            </div>
-            """
+                last_checked_text = _format_timestamp(monitor.last_checked_at)
+            
+            parts.append(ALERT_EMAIL_MONITOR.format(
+                name=escape(monitor.name),
+                monitor_type=monitor.monitor_type.value,
+                status=monitor.status.value,
+                last_healthy=last_healthy_text,
+                last_checked=last_checked_text
+            ))
         
-        body += f"""
-            <div class="footer">
-                <p>This alert was generated at {now.strftime('%Y-%m-%d %H:%M:%S')} by Web Monitor.</p>
-                <p>Please check your monitoring dashboard for more details and take appropriate action.</p>
-            </div>
-        </body>
-        </html>
-        """
+        parts.append(ALERT_EMAIL_FOOTER.format(generated_at=_format_timestamp(now)))
         
-        return body
+        # One join instead of growing the body string once per monitor
+        return "".join(parts)
@@ -1,2 +1,2 @@
-from .monitor import BaseMonitor, UrlMonitor, DatabaseMonitor, MonitorResult, MonitorStatus, MonitorType
+from .monitor import BaseMonitor, UrlMonitor, DatabaseMonitor, MonitorSummary, MonitorResult, MonitorStatus, MonitorType
 from .space import Space
\ No newline at end of file
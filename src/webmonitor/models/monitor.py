@@ -7,6 +7,14 @@ from enum import Enum
 from webmonitor.utils import encrypt_password, decrypt_password
 import urllib.parse
 
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    # ISO string for an optional timestamp
+    return value.isoformat() if value else None
+
+def _from_iso(value: Optional[str]) -> Optional[datetime]:
+    # Timestamp for an optional ISO string, the reverse of _iso
+    return datetime.fromisoformat(value) if value else None
+
 class MonitorType(Enum):
     URL = 'url'
     DATABASE = 'database'
@@ -17,7 +25,7 @@ class MonitorStatus(Enum):
     UNKNOWN = 'unknown'
     OFFLINE = 'offline'
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class BaseMonitor:
     # Base class for all monitors
     name: str
@@ -56,9 +64,9 @@ class BaseMonitor:
             'status': self.status.value,
             'check_interval_seconds': self.check_interval_seconds,
             'created_at': self.created_at.isoformat(), 
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'last_checked_at': self.last_checked_at.isoformat() if self.last_checked_at else None,
-            'last_healthy_at': self.last_healthy_at.isoformat() if self.last_healthy_at else None
+            'updated_at': _iso(self.updated_at),
+            'last_checked_at': _iso(self.last_checked_at),
+            'last_healthy_at': _iso(self.last_healthy_at)
         }
     
     @classmethod
@@ -72,25 +80,23 @@ class BaseMonitor:
             status=MonitorStatus(data['status']),
             check_interval_seconds=data['check_interval_seconds'],
             created_at= datetime.fromisoformat(data['created_at']),
+            updated_at=_from_iso(data.get('updated_at')),
+            last_checked_at=_from_iso(data.get('last_checked_at')),
+            last_healthy_at=_from_iso(data.get('last_healthy_at')),
         )
-        if (data.get('updated_at')):
-            monitor.updated_at = datetime.fromisoformat(data['updated_at'])
-        if (data.get('last_checked_at')):
-            monitor.last_checked_at = datetime.fromisoformat(data['last_checked_at'])
-        if (data.get('last_healthy_at')):
-            monitor.last_healthy_at = datetime.fromisoformat(data['last_healthy_at'])
         return monitor
 
-    # Add these methods to make BaseMonitor hashable
+    # Monitors are equal and hash by id, so they can key the scheduler's job table.
+    # The monitor classes are declared with eq=False and all inherit these two.
     def __hash__(self):
         return hash(self.id)
     
     def __eq__(self, other):
-        if not isinstance(other, BaseMonitor):
+        if type(other) is not type(self):
             return False
         return self.id == other.id
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class UrlMonitor(BaseMonitor):
     # Represents a URL monitor
     url: str = field(default="")
@@ -101,12 +107,13 @@ class UrlMonitor(BaseMonitor):
     check_content: Optional[str] = None # Check if this string is in the response body
 
     def __post_init__(self):
-        super().__post_init__()
+        # Explicit super(): slots=True rebuilds the class, which breaks the zero-argument form
+        super(UrlMonitor, self).__post_init__()
         self.monitor_type = MonitorType.URL
 
     def to_dict(self)->dict:
         # Converts the URL monitor object to a dictionary
-        base_dict = super().to_dict()
+        base_dict = super(UrlMonitor, self).to_dict()
         base_dict.update({
             'url': self.url,
             'expected_status_code': self.expected_status_code,
@@ -128,31 +135,28 @@ class UrlMonitor(BaseMonitor):
             status=MonitorStatus(data['status']),
             check_interval_seconds=data['check_interval_seconds'],
             created_at= datetime.fromisoformat(data['created_at']),
+            updated_at=_from_iso(data.get('updated_at')),
+            last_checked_at=_from_iso(data.get('last_checked_at')),
+            last_healthy_at=_from_iso(data.get('last_healthy_at')),
             url=data['url'],
             expected_status_code=data['expected_status_code'],
             timeout_seconds=data['timeout_seconds'],
             check_ssl=data['check_ssl'],
             follow_redirects=data['follow_redirects'],
         )
-        if data.get('updated_at'):
-            monitor.updated_at = datetime.fromisoformat(data['updated_at'])
-        if data.get('last_checked_at'):
-            monitor.last_checked_at = datetime.fromisoformat(data['last_checked_at'])
-        if data.get('last_healthy_at'):
-            monitor.last_healthy_at = datetime.fromisoformat(data['last_healthy_at'])
         if data.get('check_content'):
             monitor.check_content = data['check_content']
         return monitor
 
-    def __hash__(self):
-        return hash(self.id)
-    
-    def __eq__(self, other):
-        if not isinstance(other, UrlMonitor):
-            return False
-        return self.id == other.id
+# SQLAlchemy URL per supported db_type, filled in with the (URL-encoded) credentials
+CONNECTION_URL_TEMPLATES = {
+    'postgresql': "postgresql://{username}:{password}@{host}:{port}/{database}",
+    'mysql': "mysql+pymysql://{username}:{password}@{host}:{port}/{database}",
+    # SQL Server goes through ODBC and needs the driver named in the query string
+    'sqlserver': "mssql+pyodbc://{username}:{password}@{host}:{port}/{database}?driver=ODBC+Driver+17+for+SQL+Server&TrustServerCertificate=yes",
+}
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class DatabaseMonitor(BaseMonitor):
     # Database monitoring configuration
     db_type: str = ""  # mysql, postgresql, sqlserver
@@ -166,7 +170,7 @@ class DatabaseMonitor(BaseMonitor):
     test_query: str = "SELECT 1"  # Simple query to test connection
     
     def __post_init__(self):
-        super().__post_init__()
+        super(DatabaseMonitor, self).__post_init__()
         self.monitor_type = MonitorType.DATABASE
 
     @property
@@ -196,20 +200,18 @@ class DatabaseMonitor(BaseMonitor):
         # URL encode the password to handle special characters like @
         encoded_password = urllib.parse.quote_plus(password)
         
-        if self.db_type.lower() == 'postgresql':
-            return f"postgresql://{self.username}:{encoded_password}@{self.host}:{self.port}/{self.database}"
-        elif self.db_type.lower() == 'mysql':
-            return f"mysql+pymysql://{self.username}:{encoded_password}@{self.host}:{self.port}/{self.database}"
-        elif self.db_type.lower() == 'sqlserver':
-            # Fix the connection string format for SQL Server with encoded password
-            return f"mssql+pyodbc://{self.username}:{encoded_password}@{self.host}:{self.port}/{self.database}?driver=ODBC+Driver+17+for+SQL+Server&TrustServerCertificate=yes"
-        else:
+        template = CONNECTION_URL_TEMPLATES.get(self.db_type.lower())
+        if template is None:
             raise ValueError(f"Unsupported database type: {self.db_type}")
+        return template.format(
+            username=self.username, password=encoded_password,
+            host=self.host, port=self.port, database=self.database
+        )
 
     
     def to_dict(self) -> dict:
         # Convert database monitor to dictionary for storage
-        data = super().to_dict()
+        data = super(DatabaseMonitor, self).to_dict()
         data.update({
             'db_type': self.db_type,
             'host': self.host,
@@ -234,6 +236,9 @@ class DatabaseMonitor(BaseMonitor):
             status=MonitorStatus(data['status']),
             check_interval_seconds=data['check_interval_seconds'],
             created_at= datetime.fromisoformat(data['created_at']),
+            updated_at=_from_iso(data.get('updated_at')),
+            last_checked_at=_from_iso(data.get('last_checked_at')),
+            last_healthy_at=_from_iso(data.get('last_healthy_at')),
             db_type=data['db_type'],
             host=data['host'],
             port=data['port'],
@@ -244,23 +249,20 @@ class DatabaseMonitor(BaseMonitor):
             query_timeout_seconds=data['query_timeout_seconds'],
             test_query=data['test_query'],
         )
-        if data.get('updated_at'):
-            monitor.updated_at = datetime.fromisoformat(data['updated_at'])
-        if data.get('last_checked_at'):
-            monitor.last_checked_at = datetime.fromisoformat(data['last_checked_at'])
-        if data.get('last_healthy_at'):
-            monitor.last_healthy_at = datetime.fromisoformat(data['last_healthy_at'])
         return monitor
 
-    def __hash__(self):
-        return hash(self.id)
-    
-    def __eq__(self, other):
-        if not isinstance(other, DatabaseMonitor):
-            return False
-        return self.id == other.id
+@dataclass(slots=True)
+class MonitorSummary:
+    # The parts of a monitor that status reports need, without type-specific settings or credentials
+    id: str
+    space_id: str
+    name: str
+    monitor_type: MonitorType
+    status: MonitorStatus
+    last_checked_at: Optional[datetime] = None
+    last_healthy_at: Optional[datetime] = None
 
-@dataclass
+@dataclass(slots=True)
 class MonitorResult:
     # Result of a monitor check
     monitor_id: str
@@ -4,7 +4,7 @@ from datetime import datetime
 import json
 import uuid
 
-@dataclass
+@dataclass(slots=True)
 class Space:
     # Represents a space in the database
     name: str
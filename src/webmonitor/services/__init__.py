@@ -1,2 +1,3 @@
 from .scheduler import MonitorScheduler
-from .email_service import EmailService, get_email_service, send_notification_email, send_monitor_result_email, should_send_notification, reload_email_service
\ No newline at end of file
+from .email_service import EmailService, get_email_service, send_notification_email, send_monitor_result_email, should_send_notification, reload_email_service
+from .email_queue import EmailQueue, get_email_queue, enqueue_email, stop_email_queue
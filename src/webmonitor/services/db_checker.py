@@ -1,9 +1,12 @@
 import time
 import logging
+import threading
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import QueuePool
 from webmonitor.models import DatabaseMonitor, MonitorResult, MonitorStatus
 from webmonitor.utils import errors
 
@@ -18,8 +21,70 @@ Workflow:
 7. Return the MonitorResult
 """
 
+# Per-session query timeout statements, in milliseconds
+TIMEOUT_SQL = {
+    'postgresql': "SET statement_timeout = {ms}",
+    'mysql': "SET max_execution_time = {ms}",
+    # For SQL Server, set lock timeout (in milliseconds)
+    'sqlserver': "SET LOCK_TIMEOUT {ms}",
+}
+
+# monitor id -> (settings the engine was built from, engine, timeout statement).
+# Each database monitor keeps a small pool so checks reuse a warm, authenticated connection.
+_engines: Dict[str, Tuple[tuple, Engine, Optional[str]]] = {}
+_engines_lock = threading.Lock()
+
+def _engine_settings(monitor: DatabaseMonitor) -> tuple:
+    # Compared against the cached engine's settings, an edited monitor gets a fresh engine
+    return (
+        monitor.db_type.lower(), monitor.host, monitor.port, monitor.database, monitor.username,
+        monitor.encrypted_password, monitor.connection_timeout_seconds, monitor.query_timeout_seconds
+    )
+
+def _get_engine(monitor: DatabaseMonitor) -> Tuple[Engine, Optional[str]]:
+    settings = _engine_settings(monitor)
+    with _engines_lock:
+        cached = _engines.get(monitor.id)
+        if cached is not None and cached[0] == settings:
+            return cached[1], cached[2]
+
+        engine = create_engine(
+            monitor.test_connection_string(),
+            poolclass=QueuePool,
+            pool_size=1,
+            max_overflow=1,
+            pool_recycle=600,
+            pool_pre_ping=True,
+            connect_args={"connect_timeout": monitor.connection_timeout_seconds}
+        )
+        timeout_sql = TIMEOUT_SQL.get(settings[0])
+        if timeout_sql:
+            timeout_sql = timeout_sql.format(ms=monitor.query_timeout_seconds * 1000)
+        _engines[monitor.id] = (settings, engine, timeout_sql)
+
+    if cached is not None:
+        cached[1].dispose()
+    return engine, timeout_sql
+
+def dispose_engine(monitor_id: Optional[str] = None) -> None:
+    # Close the pooled connections of one monitor, or of all monitors when no id is given
+    with _engines_lock:
+        if monitor_id is None:
+            discarded = list(_engines.values())
+            _engines.clear()
+        else:
+            entry = _engines.pop(monitor_id, None)
+            discarded = [entry] if entry is not None else []
+    for _, engine, _ in discarded:
+        engine.dispose()
+
+def _is_identity_probe(query: str) -> bool:
+    # True for a plain SELECT 1, ignoring case, whitespace and a trailing semicolon
+    return ' '.join(query.split()).rstrip(';').rstrip().upper() == 'SELECT 1'
+
 def check_db(monitor: DatabaseMonitor) -> MonitorResult:
-    start_time = time.time()
+    # Monotonic clock, a wall-clock adjustment mid-check can't skew the response time
+    start_ns = time.perf_counter_ns()
     details: Dict[str, Any] = {}
     status = MonitorStatus.HEALTHY
     failed_checks = 0
@@ -28,12 +93,8 @@ def check_db(monitor: DatabaseMonitor) -> MonitorResult:
     
     try:
         logger = logging.getLogger(__name__)
-        # Connect to database
-        engine = create_engine(
-            monitor.test_connection_string(), 
-            pool_pre_ping=True,
-            connect_args={"connect_timeout": monitor.connection_timeout_seconds}
-        )
+        # Connect to database, reusing the monitor's pooled engine
+        engine, timeout_sql = _get_engine(monitor)
 
         # Test connection
         with engine.connect() as connection:
@@ -42,16 +103,21 @@ def check_db(monitor: DatabaseMonitor) -> MonitorResult:
             }
             
             # Run test query if provided
-            if monitor.test_query and monitor.test_query.strip():
+            if monitor.test_query and _is_identity_probe(monitor.test_query):
+                # Checking the connection out already proved the server answers (pool pre-ping on a
+                # reused connection, the connect itself on a new one), so don't send SELECT 1 twice
+                details['query'] = {
+                    'executed': True,
+                    'message': f"Query '{monitor.test_query}' answered by the connection check"
+                }
+            elif monitor.test_query and monitor.test_query.strip():
                 try:
-                    # Set query timeout
-                    if monitor.db_type.lower() == 'postgresql':
-                        connection.execute(text(f"SET statement_timeout = {monitor.query_timeout_seconds * 1000}"))
-                    elif monitor.db_type.lower() == 'mysql':
-                        connection.execute(text(f"SET max_execution_time = {monitor.query_timeout_seconds * 1000}"))
-                    elif monitor.db_type.lower() == 'sqlserver':
-                        # For SQL Server, set lock timeout (in milliseconds)
-                        connection.execute(text(f"SET LOCK_TIMEOUT {monitor.query_timeout_seconds * 1000}"))
+                    # Set query timeout, once per pooled connection since the setting lasts for the session.
+                    # Committed so PostgreSQL keeps it when the check's transaction is rolled back.
+                    if timeout_sql and not connection.info.get('query_timeout_set'):
+                        connection.execute(text(timeout_sql))
+                        connection.commit()
+                        connection.info['query_timeout_set'] = True
                     
                     # Execute the test query
                     result = connection.execute(text(monitor.test_query))
@@ -70,6 +136,8 @@ def check_db(monitor: DatabaseMonitor) -> MonitorResult:
                     }
     except Exception as e:
         logger.error(f"Error checking database: {str(e)}", exc_info=True)
+        # Don't keep pooled connections to a server that just failed, the next check starts clean
+        dispose_engine(monitor.id)
         status = MonitorStatus.UNHEALTHY
         failed_checks += 2
         details['connection'] = {
@@ -81,8 +149,8 @@ def check_db(monitor: DatabaseMonitor) -> MonitorResult:
             'message': errors.QUERY_CONNECTION_ERROR
         }
     finally:
-        end_time = time.time()
-        response_time_ms = (end_time - start_time) * 1000
+        end_ns = time.perf_counter_ns()
+        response_time_ms = (end_ns - start_ns) / 1_000_000
         return MonitorResult(
             monitor_id=monitor.id,
             space_id=monitor.space_id,
@@ -0,0 +1,106 @@
+import logging
+import queue
+import threading
+import time
+from typing import List, Optional, Set, Tuple
+from .email_service import get_email_service, close_email_service
+
+"""
+Background delivery for notification emails.
+Callers enqueue a message and return at once, a single worker thread does the SMTP work
+and retries failed sends with a growing delay.
+"""
+
+# Attempts per message and the delay before the first retry, doubled after each failure
+MAX_ATTEMPTS = 3
+RETRY_DELAY_SECONDS = 5.0
+
+class EmailQueue:
+    def __init__(self, max_attempts: int = MAX_ATTEMPTS, retry_delay: float = RETRY_DELAY_SECONDS):
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.logger = logging.getLogger(__name__)
+        self._queue = queue.Queue()
+        # Messages queued or being sent, an identical message is dropped until the first one is done
+        self._pending: Set[Tuple] = set()
+        self._pending_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="EmailQueue", daemon=True)
+        self._thread.start()
+
+    def enqueue(self, recipients: List[str], subject: str, body: str, is_html: bool = False) -> bool:
+        if self._stop_event.is_set():
+            self.logger.warning("Email queue is stopped, dropping email")
+            return False
+
+        key = (tuple(recipients), subject, body, is_html)
+        with self._pending_lock:
+            if key in self._pending:
+                self.logger.info(f"Identical email already queued, skipping: {subject}")
+                return True
+            self._pending.add(key)
+        self._queue.put(key)
+        return True
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        # Send what is already queued (without waiting out retry delays), then stop the thread
+        if self._stop_event.is_set():
+            return
+        self._stop_event.set()
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            key = self._queue.get()
+            if key is None:
+                return
+            try:
+                self._deliver(key)
+            finally:
+                with self._pending_lock:
+                    self._pending.discard(key)
+
+    def _deliver(self, key: Tuple) -> None:
+        recipients, subject, body, is_html = key
+        email_service = get_email_service()
+        if not email_service.is_configured():
+            self.logger.warning(f"Email not configured, dropping email: {subject}")
+            return
+
+        delay = self.retry_delay
+        for attempt in range(1, self.max_attempts + 1):
+            if email_service.send_email(list(recipients), subject, body, is_html):
+                return
+            if attempt == self.max_attempts:
+                break
+            self.logger.warning(f"Retrying email in {delay:.0f}s (attempt {attempt + 1}/{self.max_attempts}): {subject}")
+            # Shutdown cuts the wait short, the message is not retried after stop()
+            if self._stop_event.wait(delay):
+                break
+            delay *= 2
+        self.logger.error(f"Giving up on email after {attempt} attempt(s): {subject}")
+
+# Global instance
+_email_queue = None
+_email_queue_lock = threading.Lock()
+
+def get_email_queue() -> EmailQueue:
+    # Get the global email queue, starting its worker on first use
+    global _email_queue
+    with _email_queue_lock:
+        if _email_queue is None:
+            _email_queue = EmailQueue()
+        return _email_queue
+
+def enqueue_email(recipients: List[str], subject: str, body: str, is_html: bool = False) -> bool:
+    # Queue a notification email for background delivery, returns whether it was accepted
+    return get_email_queue().enqueue(recipients, subject, body, is_html)
+
+def stop_email_queue(timeout: Optional[float] = None) -> None:
+    global _email_queue
+    with _email_queue_lock:
+        email_queue, _email_queue = _email_queue, None
+    if email_queue is not None:
+        email_queue.stop(timeout)
+    close_email_service()
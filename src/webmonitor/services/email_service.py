@@ -1,11 +1,35 @@
 import smtplib
 import logging
+import threading
+import time
+from functools import lru_cache
+from html import escape
 from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from pathlib import Path
 from typing import List, Optional
 from webmonitor.models import Space, MonitorResult, MonitorType, MonitorStatus
 
+# Logged-in SMTP connections kept open between sends. A connection is retired after
+# MAX_MESSAGES_PER_CONNECTION messages or once it has sat idle for MAX_IDLE_SECONDS,
+# before the server is likely to have dropped it.
+MAX_IDLE_CONNECTIONS = 5
+MAX_MESSAGES_PER_CONNECTION = 100
+MAX_IDLE_SECONDS = 60
+
+# Status-change email body, user-supplied text is HTML-escaped before formatting
+MONITOR_RESULT_EMAIL = """
+<h2>Monitor Update for {space_name}</h2>
+<p><strong>Monitor ID:</strong> {monitor_id}</p>
+<p><strong>Status:</strong> {status}</p>
+<p><strong>Type:</strong> {monitor_type}</p>
+<p><strong>Time:</strong> {timestamp}</p>
+<p><strong>Response Time:</strong> {response_time_ms:.2f} ms</p>
+<p><strong>Results:</strong> {failed_checks}/{total_checks} checks failed</p>
+
+<h3>Details:</h3>
+<pre>{details}</pre>
+"""
+
 class EmailService:
     # Service for sending email notifications
 
@@ -18,6 +42,9 @@ class EmailService:
         self.password = password
         self.from_name = from_name
         self.logger = logging.getLogger(__name__)
+        # Idle (connection, messages sent, last used) entries, newest last
+        self._idle: List[tuple] = []
+        self._pool_lock = threading.Lock()
 
     def load_from_config(self) -> bool:
         try:
@@ -31,6 +58,8 @@ class EmailService:
                 self.username = email_config.get('username')
                 self.password = email_config.get('password')
                 self.from_name = email_config.get('from_name', 'Web Monitor')
+                # Pooled connections are logged in with the old settings
+                self.close()
                 self.logger.info("Email service configured from config manager")
                 return True
             else:
@@ -46,22 +75,15 @@ class EmailService:
             return False
 
         try:
-            # Create message
-            msg = MIMEMultipart()
+            # Create message, a single text part needs no multipart wrapper
+            content_type = "html" if is_html else "plain"
+            msg = MIMEText(body, content_type)
             from_address = f"{self.from_name} <{self.username}>" if self.from_name else self.username
             msg['From'] = from_address
             msg['To'] = ", ".join(recipients)
             msg['Subject'] = subject
-            
-            # Attach body with appropriate content type
-            content_type = "html" if is_html else "plain"
-            msg.attach(MIMEText(body, content_type))
-            
-            # Connect to SMTP server and send
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.username, self.password)
-                server.send_message(msg)
+
+            self._send_message(msg)
 
             self.logger.info(f"Email sent successfully to {len(recipients)} recipients")
             return True
@@ -69,6 +91,73 @@ class EmailService:
             self.logger.error(f"Failed to send email: {e}")
             return False
 
+    def _send_message(self, msg) -> None:
+        server, sent, reused = self._acquire()
+        try:
+            server.send_message(msg)
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            self._discard(server)
+            if not reused:
+                raise
+            # The server dropped the pooled connection, try once more on a fresh one
+            server, sent = self._connect(), 0
+            try:
+                server.send_message(msg)
+            except Exception:
+                self._discard(server)
+                raise
+        except Exception:
+            self._discard(server)
+            raise
+        self._release(server, sent + 1)
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.smtp_host, self.smtp_port)
+        try:
+            server.starttls()
+            server.login(self.username, self.password)
+        except Exception:
+            self._discard(server)
+            raise
+        return server
+
+    def _acquire(self) -> tuple:
+        # Returns (connection, messages already sent on it, whether it came from the pool)
+        now = time.monotonic()
+        stale = []
+        entry = None
+        with self._pool_lock:
+            while self._idle:
+                server, sent, last_used = self._idle.pop()
+                if now - last_used < MAX_IDLE_SECONDS:
+                    entry = (server, sent, True)
+                    break
+                stale.append(server)
+        for server in stale:
+            self._discard(server)
+        return entry or (self._connect(), 0, False)
+
+    def _release(self, server: smtplib.SMTP, sent: int) -> None:
+        if sent < MAX_MESSAGES_PER_CONNECTION:
+            with self._pool_lock:
+                if len(self._idle) < MAX_IDLE_CONNECTIONS:
+                    self._idle.append((server, sent, time.monotonic()))
+                    return
+        self._discard(server)
+
+    def _discard(self, server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def close(self) -> None:
+        # Log out of all pooled connections
+        with self._pool_lock:
+            idle, self._idle = self._idle, []
+        for server, _, _ in idle:
+            self._discard(server)
+
     def test_connection(self) -> tuple[bool, str]:
         if not self.username or not self.password:
             return False, "Missing username or password"
@@ -103,26 +192,36 @@ def reload_email_service() -> bool:
         _email_service = EmailService()
     return _email_service.load_from_config()
 
+def close_email_service() -> None:
+    # Close pooled SMTP connections, if the service was ever used
+    if _email_service is not None:
+        _email_service.close()
+
 def send_notification_email(recipients: List[str], subject: str, body: str, is_html: bool = False) -> bool:
     # Helper function to send a notification email
     return get_email_service().send_email(recipients, subject, body, is_html)
 
 def send_monitor_result_email(space: Space, result: MonitorResult, recipients: List[str]) -> bool:
-    # Send an email with the monitor result
+    # Queue an email with the monitor result, delivered in the background so checks never wait on SMTP
+    from .email_queue import enqueue_email
     subject = f"Update on Space {space.name}: {result.monitor_type.value} is {result.status.value}"
-    body = f"""
-<h2>Monitor Update for {space.name}</h2>
-<p><strong>Monitor ID:</strong> {result.monitor_id}</p>
-<p><strong>Status:</strong> {result.status.value}</p>
-<p><strong>Type:</strong> {result.monitor_type.value}</p>
-<p><strong>Time:</strong> {result.timestamp.strftime('%Y-%m-%d %H:%M:%S')}</p>
-<p><strong>Response Time:</strong> {result.response_time_ms:.2f} ms</p>
-<p><strong>Results:</strong> {result.failed_checks}/{len(result.check_list)} checks failed</p>
-
-<h3>Details:</h3>
-<pre>{_format_details(result.details)}</pre>
-"""
-    return send_notification_email(recipients, subject, body, is_html=True)
+    body = MONITOR_RESULT_EMAIL.format(
+        space_name=escape(space.name),
+        monitor_id=result.monitor_id,
+        status=result.status.value,
+        monitor_type=result.monitor_type.value,
+        timestamp=result.timestamp.isoformat(sep=' ', timespec='seconds'),
+        response_time_ms=result.response_time_ms,
+        failed_checks=result.failed_checks,
+        total_checks=len(result.check_list),
+        details=escape(_format_details(result.details))
+    )
+    return enqueue_email(recipients, subject, body, is_html=True)
+
+@lru_cache(maxsize=64)
+def _readable_key(key: str) -> str:
+    # Detail keys come from a small fixed set, e.g. 'days_until_expiry' -> 'Days until expiry'
+    return key.replace('_', ' ').capitalize()
 
 def _format_details(details):
     if not details:
@@ -134,16 +233,14 @@ def _format_details(details):
         
         if isinstance(check_data, dict):
             for key, value in check_data.items():
-                # Format the key with spaces between words
-                readable_key = key.replace('_', ' ').capitalize()
-                formatted.append(f"  {readable_key}: {value}")
+                formatted.append(f"  {_readable_key(key)}: {value}")
     
     return "\n".join(formatted)
 
-def should_send_notification(result: MonitorResult, previous_result: Optional[MonitorResult]) -> bool:
+def should_send_notification(result: MonitorResult, previous_status: Optional[MonitorStatus]) -> bool:
     # Always notify on first check (when there's no previous result)
-    if previous_result is None:
+    if previous_status is None:
         return result.status == MonitorStatus.UNHEALTHY
         
     # Notify when status changes
-    return previous_result.status != result.status
+    return previous_status != result.status
@@ -1,11 +1,13 @@
 import threading
-import time
 import logging
 import schedule
-from typing import Dict, List, Optional, Set, Any
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, List, Optional, Set, Any
 from datetime import datetime
-from .db_checker import check_db
-from .url_checker import check_url
+from urllib.parse import urlparse
+from .db_checker import check_db, dispose_engine
+from .url_checker import check_url, close_session
 from .email_service import should_send_notification, send_monitor_result_email
 from webmonitor.infrastructure import Database
 from webmonitor.models import BaseMonitor, UrlMonitor, DatabaseMonitor, MonitorType, MonitorResult, MonitorStatus
@@ -15,24 +17,54 @@ Scheduler for managing monitor jobs.
 Handles scheduling, stopping, and listing monitors.
 """
 
+# Due monitor checks run on this many threads, so one slow target doesn't hold up the others
+MAX_CHECK_WORKERS = 16
+# Checks against the same host that may run at once, so many monitors of one site don't hammer it
+MAX_CHECKS_PER_HOST = 4
+
 class MonitorScheduler:
     database: Database
     running_monitors: Dict[BaseMonitor, schedule.Job]
+    monitors_by_id: Dict[str, BaseMonitor]
+    space_monitor_ids: Dict[str, Set[str]]
+    last_statuses: Dict[str, MonitorStatus]
+    running_snapshot: Optional[tuple]
     system_jobs: Dict[str, Any]
     system_job_schedules: Dict[str, schedule.Job]
     monitor_lock: threading.Lock
     logger: logging.Logger
     stop_event: threading.Event
     scheduler_thread: threading.Thread
+    check_executor: ThreadPoolExecutor
+    checks_in_flight: Set[str]
+    in_flight_lock: threading.Lock
+    host_checks_in_flight: Dict[str, int]
+    host_waiting: Dict[str, Deque[BaseMonitor]]
 
     def __init__(self, database: Database):
         self.database = database
         self.running_monitors: Dict[BaseMonitor, schedule.Job] = {}
+        # Indexes over running_monitors, kept in step by _add_running/_remove_running under monitor_lock
+        self.monitors_by_id: Dict[str, BaseMonitor] = {}
+        self.space_monitor_ids: Dict[str, Set[str]] = defaultdict(set)
+        # Status of each running monitor's latest result, read from the database on its first check only
+        self.last_statuses: Dict[str, MonitorStatus] = {}
+        # Immutable copy of the running monitors for lock-free listing, None after any change
+        self.running_snapshot: Optional[tuple] = None
         self.system_jobs: Dict[str, Any] = {}
         self.system_job_schedules: Dict[str, schedule.Job] = {}
         self.monitor_lock = threading.Lock()  # For thread-safe operations
         self.logger = logging.getLogger(__name__)
 
+        # Checks are network-bound, the scheduler thread only hands them to the pool
+        self.check_executor = ThreadPoolExecutor(max_workers=MAX_CHECK_WORKERS, thread_name_prefix="monitor-check")
+        self.checks_in_flight: Set[str] = set()
+        self.in_flight_lock = threading.Lock()
+        # Checks in flight per host, an entry is dropped when its last check finishes
+        self.host_checks_in_flight: Dict[str, int] = {}
+        # Checks due while their host was at MAX_CHECKS_PER_HOST, started in order as slots free up
+        self.host_waiting: Dict[str, Deque[BaseMonitor]] = {}
+
         # Initialize system jobs
         self._initialize_system_jobs()
 
@@ -46,8 +78,65 @@ class MonitorScheduler:
         # Run the scheduler in a loop until stop_event is set
         while not self.stop_event.is_set():
             schedule.run_pending()
-            time.sleep(1)
+            # Sleep until the next job is due, at most a second so newly scheduled monitors
+            # are picked up, and wake at once when stop() is called
+            idle_seconds = schedule.idle_seconds()
+            self.stop_event.wait(1 if idle_seconds is None else min(max(idle_seconds, 0), 1))
     
+    def _submit_monitor(self, monitor: BaseMonitor):
+        host = self._monitor_host(monitor)
+        # Skip this run if the previous check of the monitor is still going or waiting. When
+        # its host already has as many checks running as allowed, queue it for the host's next
+        # free slot rather than wait in a pool worker and starve checks of other hosts.
+        with self.in_flight_lock:
+            if monitor.id in self.checks_in_flight:
+                self.logger.warning(f"Previous check still running, skipping: {monitor.name} ({monitor.id})")
+                return
+            self.checks_in_flight.add(monitor.id)
+            host_checks = self.host_checks_in_flight.get(host, 0)
+            if host_checks >= MAX_CHECKS_PER_HOST:
+                self.host_waiting.setdefault(host, deque()).append(monitor)
+                self.logger.info(f"Too many checks running against {host}, queued: {monitor.name} ({monitor.id})")
+                return
+            self.host_checks_in_flight[host] = host_checks + 1
+        self._start_check(monitor, host)
+
+    def _start_check(self, monitor: BaseMonitor, host: str):
+        # The caller has already counted the check against its host
+        try:
+            future = self.check_executor.submit(self._run_monitor, monitor)
+        except RuntimeError:
+            # Executor already shut down, the scheduler is stopping
+            self._finish_monitor(monitor.id, host)
+            return
+        future.add_done_callback(lambda _: self._finish_monitor(monitor.id, host))
+
+    def _finish_monitor(self, monitor_id: str, host: str):
+        next_monitor = None
+        with self.in_flight_lock:
+            self.checks_in_flight.discard(monitor_id)
+            # Hand the freed slot to the host's longest waiting check, dropping any stopped since
+            waiting = self.host_waiting.get(host)
+            while waiting:
+                monitor = waiting.popleft()
+                if monitor.id in self.monitors_by_id:
+                    next_monitor = monitor
+                    break
+                self.checks_in_flight.discard(monitor.id)
+            if not waiting:
+                self.host_waiting.pop(host, None)
+            if next_monitor is None:
+                host_checks = self.host_checks_in_flight.pop(host, 0) - 1
+                if host_checks > 0:
+                    self.host_checks_in_flight[host] = host_checks
+        if next_monitor is not None:
+            self._start_check(next_monitor, host)
+
+    def _monitor_host(self, monitor: BaseMonitor) -> str:
+        if isinstance(monitor, UrlMonitor):
+            return urlparse(monitor.url).hostname or monitor.url
+        return monitor.host
+
     def _run_monitor(self, monitor: BaseMonitor):
         try:
             self.logger.info(f"Running monitor check: {monitor.name} ({monitor.id})")
@@ -61,31 +150,39 @@ class MonitorScheduler:
                 self.logger.error(f"Unknown monitor type: {type(monitor)}")
                 return
             
-            # Update monitor status and timestamps
-            monitor.status = result.status
-            monitor.update_last_checked_at()
-            if result.status == MonitorStatus.HEALTHY:
-                monitor.update_last_healthy_at()
-
-            # Get the most recent previous result for comparison
-            previous_results = self.database.get_results_for_monitor(monitor.id, limit=1)
-            previous_result = previous_results[0] if previous_results else None
-            
-            # Save result and updated monitor
+            # Status of the most recent previous result for comparison
+            previous_status = self.last_statuses.get(monitor.id)
+            if previous_status is None:
+                previous_results = self.database.get_results_for_monitor(monitor.id, limit=1)
+                previous_status = previous_results[0].status if previous_results else None
+
+            # Queue the result and the monitor's new state, written together in the next batch
             self.database.save_result(result)
-            self.database.save_monitor(monitor)
+            with self.monitor_lock:
+                # Stopped while the check ran, keep the OFFLINE state the stop wrote
+                if monitor.id not in self.monitors_by_id:
+                    self.logger.info(f"Monitor stopped during check, state not updated: {monitor.name} ({monitor.id})")
+                    return
+
+                # Update monitor status and timestamps
+                monitor.status = result.status
+                monitor.update_last_checked_at()
+                if result.status == MonitorStatus.HEALTHY:
+                    monitor.update_last_healthy_at()
+                self.last_statuses[monitor.id] = result.status
+                self.database.save_monitor_check_state(monitor)
             
             self.logger.info(f"Monitor check completed: {monitor.name} ({monitor.id}) - Status: {result.status.value}")
 
             # Send notifications if there's a status change
-            if should_send_notification(result, previous_result):
+            if should_send_notification(result, previous_status):
                 # Get space to access notification settings
                 space = self.database.get_space(monitor.space_id)
                 
                 if space and space.notification_emails:
                     recipients = space.notification_emails
-                    send_monitor_result_email(space, result, recipients)
-                    self.logger.info(f"Status change notification sent for monitor: {monitor.name}")
+                    if send_monitor_result_email(space, result, recipients):
+                        self.logger.info(f"Status change notification queued for monitor: {monitor.name}")
         
         except Exception as e:
             self.logger.error(f"Error running monitor {monitor.name} ({monitor.id}): {str(e)}")
@@ -123,54 +220,74 @@ class MonitorScheduler:
 
             self.logger.info(f"Data cleanup job scheduled to run every {interval_hours} hours")
 
+    def _add_running(self, monitor: BaseMonitor, job: schedule.Job):
+        self.running_monitors[monitor] = job
+        self.monitors_by_id[monitor.id] = monitor
+        self.space_monitor_ids[monitor.space_id].add(monitor.id)
+        self.running_snapshot = None
+
+    def _remove_running(self, monitor_id: str) -> Optional[tuple]:
+        # Returns (monitor, job) if the monitor was running
+        monitor = self.monitors_by_id.pop(monitor_id, None)
+        if monitor is None:
+            return None
+        self.last_statuses.pop(monitor_id, None)
+        self.running_snapshot = None
+        space_ids = self.space_monitor_ids.get(monitor.space_id)
+        if space_ids is not None:
+            space_ids.discard(monitor_id)
+            if not space_ids:
+                del self.space_monitor_ids[monitor.space_id]
+        return monitor, self.running_monitors.pop(monitor)
+
+    def _register_monitor(self, monitor: BaseMonitor) -> bool:
+        # Create the monitor's job and mark it UNKNOWN, the caller holds monitor_lock and saves it
+        if monitor.id in self.monitors_by_id:
+            self.logger.warning(f"Monitor {monitor.name} ({monitor.id}) is already scheduled")
+            return False
+
+        # Create a job that runs at the specified interval
+        interval_seconds = monitor.check_interval_seconds
+
+        # Schedule the job
+        job = schedule.every(interval_seconds).seconds.do(self._submit_monitor, monitor)
+
+        # Store the job with the full monitor object as key
+        self._add_running(monitor, job)
+
+        # Update monitor status
+        monitor.status = MonitorStatus.UNKNOWN
+        monitor.update_timestamp()
+
+        self.logger.info(f"Scheduled monitor: {monitor.name} ({monitor.id}) - Interval: {interval_seconds}s")
+        return True
+
     def schedule_monitor(self, monitor: BaseMonitor) -> bool:
         with self.monitor_lock:
-            # Check if monitor is already scheduled
-            if any(m.id == monitor.id for m in self.running_monitors.keys()):
-                self.logger.warning(f"Monitor {monitor.name} ({monitor.id}) is already scheduled")
+            if not self._register_monitor(monitor):
                 return False
-            
-            # Create a job that runs at the specified interval
-            interval_seconds = monitor.check_interval_seconds
-            
-            # Schedule the job
-            job = schedule.every(interval_seconds).seconds.do(self._run_monitor, monitor)
-            
-            # Store the job with the full monitor object as key
-            self.running_monitors[monitor] = job
 
-            # Update monitor status
-            monitor.status = MonitorStatus.UNKNOWN
-            monitor.update_timestamp()
-            
             # Save updated monitor
             self.database.save_monitor(monitor)
-            
-            self.logger.info(f"Scheduled monitor: {monitor.name} ({monitor.id}) - Interval: {interval_seconds}s")
-            
-            # Run the monitor immediately for the first time
-            self._run_monitor(monitor)
-            
-            return True
+
+        # Run the monitor immediately for the first time, on the check pool rather than under the lock
+        self._submit_monitor(monitor)
+
+        return True
         
     def stop_monitor(self, monitor_id: str) -> bool:
         with self.monitor_lock:
-            # Find the monitor with the given ID
-            monitor_to_stop = None
-            for monitor in self.running_monitors.keys():
-                if monitor.id == monitor_id:
-                    monitor_to_stop = monitor
-                    break
-                
-            if not monitor_to_stop:
+            running = self._remove_running(monitor_id)
+            if not running:
                 self.logger.warning(f"Monitor {monitor_id} is not scheduled")
                 return False
             
             # Get the job
-            job = self.running_monitors.pop(monitor_to_stop)
+            _, job = running
             
             # Cancel the job using schedule's cancel_job method
             schedule.cancel_job(job)
+            dispose_engine(monitor_id)
             
             # Update monitor status
             monitor = self.database.get_monitor(monitor_id)
@@ -185,17 +302,11 @@ class MonitorScheduler:
     
     def reschedule_monitor(self, monitor: BaseMonitor) -> bool:
         with self.monitor_lock:
-            # Find the monitor with the given ID
-            monitor_to_reschedule = None
-            for m in self.running_monitors.keys():
-                if m.id == monitor.id:
-                    monitor_to_reschedule = m
-                    break
-                
-            if monitor_to_reschedule:
+            running = self._remove_running(monitor.id)
+            if running:
                 # Cancel the job
-                job = self.running_monitors.pop(monitor_to_reschedule)
-                job.cancel()
+                _, job = running
+                schedule.cancel_job(job)
                 
                 # Update monitor status
                 monitor.status = MonitorStatus.UNKNOWN
@@ -205,8 +316,8 @@ class MonitorScheduler:
                 
                 # Schedule the job
                 interval_seconds = monitor.check_interval_seconds
-                job = schedule.every(interval_seconds).seconds.do(self._run_monitor, monitor)
-                self.running_monitors[monitor] = job
+                job = schedule.every(interval_seconds).seconds.do(self._submit_monitor, monitor)
+                self._add_running(monitor, job)
 
                 self.logger.info(f"Rescheduled monitor: {monitor.name} ({monitor.id}) - Interval: {interval_seconds}s")
 
@@ -217,51 +328,57 @@ class MonitorScheduler:
 
     
     def list_running_monitors(self, space_id: Optional[str] = None, monitor_type: Optional[MonitorType] = None) -> List[BaseMonitor]:
+        if space_id is None:
+            # Return all monitors if no space_id is provided, the lock is only taken to rebuild the snapshot
+            snapshot = self.running_snapshot
+            if snapshot is None:
+                with self.monitor_lock:
+                    snapshot = self.running_snapshot
+                    if snapshot is None:
+                        snapshot = self.running_snapshot = tuple(self.running_monitors)
+            return list(snapshot)
+
         with self.monitor_lock:
-            if space_id is None:
-                # Return all monitors if no space_id is provided
-                return list(self.running_monitors.keys())
-            
             # Filter by space_id and optionally by monitor_type
             monitors = []
-            for monitor in self.running_monitors.keys():
-                if monitor.space_id == space_id:
-                    if monitor_type is None or monitor.monitor_type == monitor_type:
-                        monitors.append(monitor)
+            for monitor_id in self.space_monitor_ids.get(space_id, ()):
+                monitor = self.monitors_by_id[monitor_id]
+                if monitor_type is None or monitor.monitor_type == monitor_type:
+                    monitors.append(monitor)
             return monitors
 
     def is_monitor_running(self, monitor_id: str) -> bool:
         # Check if a monitor is running
         with self.monitor_lock:
-            return any(m.id == monitor_id for m in self.running_monitors.keys())
+            return monitor_id in self.monitors_by_id
 
     def start_all_monitors_in_space(self, space_id: str):
         monitors_to_start = self.database.get_monitors_for_space(space_id)
         self.logger.info(f"Found {len(monitors_to_start)} monitors in space: {space_id}")
         
-        # Then check which ones need to be started
+        # Register the ones not already running and save them all in one transaction
         with self.monitor_lock:
-            # Filter out already running monitors
-            monitors_to_schedule = []
-            for monitor in monitors_to_start:
-                if not any(m.id == monitor.id for m in self.running_monitors.keys()):
-                    monitors_to_schedule.append(monitor)
-        
-        # Schedule each monitor individually outside the lock
+            monitors_to_schedule = [
+                monitor for monitor in monitors_to_start
+                if monitor.id not in self.monitors_by_id and self._register_monitor(monitor)
+            ]
+            self.database.save_monitors(monitors_to_schedule)
+
+        # First checks run on the check pool, outside the lock
         for monitor in monitors_to_schedule:
-            self.schedule_monitor(monitor)
+            self._submit_monitor(monitor)
         
         self.logger.info(f"Started {len(monitors_to_schedule)} monitors in space: {space_id}")
 
     def stop_all_monitors_in_space(self, space_id: str):
         with self.monitor_lock:
-            for monitor, job in list(self.running_monitors.items()):
-                if monitor.space_id == space_id:
-                    schedule.cancel_job(job)
-                    self.running_monitors.pop(monitor)
-                    monitor.status = MonitorStatus.OFFLINE
-                    monitor.update_timestamp()
-                    self.database.save_monitor(monitor)
+            for monitor_id in list(self.space_monitor_ids.get(space_id, ())):
+                monitor, job = self._remove_running(monitor_id)
+                schedule.cancel_job(job)
+                dispose_engine(monitor_id)
+                monitor.status = MonitorStatus.OFFLINE
+                monitor.update_timestamp()
+                self.database.save_monitor(monitor)
             self.logger.info(f"Stopped all monitors in space: {space_id}")
 
     def stop_all_monitors(self):
@@ -272,6 +389,11 @@ class MonitorScheduler:
                 monitor.update_timestamp()
                 self.database.save_monitor(monitor)
             self.running_monitors.clear()
+            self.monitors_by_id.clear()
+            self.last_statuses.clear()
+            self.running_snapshot = None
+            self.space_monitor_ids.clear()
+            dispose_engine()
             self.logger.info("Stopped all monitors")
 
     def get_system_job_status(self) -> List[Dict[str, Any]]:
@@ -294,3 +416,6 @@ class MonitorScheduler:
     def stop(self):
         self.stop_event.set()
         self.scheduler_thread.join()
+        self.check_executor.shutdown(wait=True, cancel_futures=True)
+        dispose_engine()
+        close_session()
@@ -2,9 +2,13 @@ import requests
 import time
 import ssl
 import socket
+import threading
+from functools import lru_cache
+from http.cookiejar import DefaultCookiePolicy
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from webmonitor.models import UrlMonitor, MonitorResult, MonitorStatus
 from webmonitor.utils import errors
 from webmonitor.infrastructure import Database
@@ -23,8 +27,47 @@ Workflow:
 7. Return the MonitorResult
 """
 
+# Certificate details are looked up again after this long, a certificate rarely changes between checks.
+# A certificate close to expiry is rechecked after half its remaining lifetime, so a renewal is seen in time.
+SSL_CACHE_TTL_SECONDS = 3600
+SSL_CACHE_MAX_ENTRIES = 1024
+
+# One keep-alive session shared by all checks, so repeated checks of a host skip the TCP/TLS handshake
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+# domain -> (monotonic time the entry goes stale, expiry date, issuer)
+_ssl_cache: Dict[str, Tuple[float, datetime, Dict[str, str]]] = {}
+_ssl_cache_lock = threading.Lock()
+
+_MONTHS = {name: number for number, name in enumerate(
+    ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'), start=1)}
+
+def _get_session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            # Cookies a site sets must not leak into the next check, the per-request jar
+            # still carries them across redirects like a plain requests.get
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            _session = session
+        return _session
+
+def close_session():
+    # Close pooled HTTP connections, the next check opens a new session
+    global _session
+    with _session_lock:
+        session, _session = _session, None
+    if session is not None:
+        session.close()
+
 def check_url(monitor: UrlMonitor) -> MonitorResult:
-    start_time = time.time()
+    # Monotonic clock, a wall-clock adjustment mid-check can't skew the response time
+    start_ns = time.perf_counter_ns()
     details: Dict[str, Any] = {}
     status = MonitorStatus.HEALTHY
     failed_checks = 0
@@ -37,7 +80,7 @@ def check_url(monitor: UrlMonitor) -> MonitorResult:
 
     try:
         # Send request
-        response = requests.get(
+        response = _get_session().get(
             monitor.url,
             timeout=monitor.timeout_seconds,
             verify=monitor.check_ssl,
@@ -78,7 +121,7 @@ def check_url(monitor: UrlMonitor) -> MonitorResult:
             }
         # Check SSL (Check SSL expiry)
         if monitor.check_ssl:
-            ssl_details = get_ssl_expiry(monitor.url)
+            ssl_details = get_ssl_expiry(monitor.url, monitor.timeout_seconds)
             if not ssl_details['has_ssl']:
                 status = MonitorStatus.UNHEALTHY
                 failed_checks += 1
@@ -114,8 +157,8 @@ def check_url(monitor: UrlMonitor) -> MonitorResult:
             'message': errors.BASE_ERROR
         }
     finally:
-        end_time = time.time()
-        response_time_ms = (end_time - start_time) * 1000
+        end_ns = time.perf_counter_ns()
+        response_time_ms = (end_ns - start_ns) / 1_000_000
         return MonitorResult(
             monitor_id=monitor.id,
             space_id=monitor.space_id,
@@ -128,46 +171,75 @@ def check_url(monitor: UrlMonitor) -> MonitorResult:
             check_list=check_list
         )
         
-def get_ssl_expiry(url: str) -> dict:
+def get_ssl_expiry(url: str, timeout: float = 10) -> dict:
     try:
-        # Extract domain from URL
-        domain = urlparse(url).netloc
-        if ':' in domain:  # Remove port if present
-            domain = domain.split(':')[0]
-        
-        # Create SSL context
-        context = ssl.create_default_context()
+        # Extract domain from URL, without credentials or port
+        domain = urlparse(url).hostname
         
-        # Connect to the server
-        with socket.create_connection((domain, 443), timeout=10) as sock:
-            with context.wrap_socket(sock, server_hostname=domain) as ssock:
-                # Get certificate
-                cert = ssock.getpeercert()
-                
-                # Extract expiry date
-                expiry_date = datetime.strptime(cert['notAfter'], '%b %d %H:%M:%S %Y %Z')
-                
-                # Calculate days until expiry
-                days_until_expiry = (expiry_date - datetime.now()).days
-                
-                # Process issuer information safely
-                issuer_info = {}
-                if 'issuer' in cert:
-                    # The issuer is a sequence of RDNs (Relative Distinguished Names)
-                    # Each RDN is a sequence of name-value pairs
-                    for rdn in cert['issuer']:
-                        for name, value in rdn:
-                            issuer_info[name] = value
-                
-                return {
-                    'has_ssl': True,
-                    'expiry_date': expiry_date.isoformat(),
-                    'days_until_expiry': days_until_expiry,
-                    'issuer': issuer_info
-                }
+        with _ssl_cache_lock:
+            cached = _ssl_cache.get(domain)
+        if cached is not None and time.monotonic() < cached[0]:
+            _, expiry_date, issuer_info = cached
+        else:
+            expiry_date, issuer_info = _fetch_certificate(domain, timeout)
+            _cache_certificate(domain, expiry_date, issuer_info)
+
+        # Calculate days until expiry
+        days_until_expiry = (expiry_date - datetime.now()).days
+
+        return {
+            'has_ssl': True,
+            'expiry_date': expiry_date.isoformat(),
+            'days_until_expiry': days_until_expiry,
+            'issuer': dict(issuer_info)
+        }
     except Exception as e:
         return {
             'has_ssl': False,
             'error': str(e)
         }
 
+def _cache_certificate(domain: str, expiry_date: datetime, issuer_info: Dict[str, str]):
+    seconds_left = (expiry_date - datetime.now()).total_seconds()
+    ttl = min(SSL_CACHE_TTL_SECONDS, seconds_left / 2)
+    if ttl <= 0:
+        return
+    now = time.monotonic()
+    with _ssl_cache_lock:
+        if domain not in _ssl_cache and len(_ssl_cache) >= SSL_CACHE_MAX_ENTRIES:
+            # Drop stale entries, or the one going stale first if none are
+            stale = [key for key, entry in _ssl_cache.items() if entry[0] <= now]
+            for key in stale or [min(_ssl_cache, key=lambda key: _ssl_cache[key][0])]:
+                del _ssl_cache[key]
+        _ssl_cache[domain] = (now + ttl, expiry_date, issuer_info)
+
+@lru_cache(maxsize=1)
+def _ssl_context() -> ssl.SSLContext:
+    # Built on first use and shared, creating one loads and parses the system CA bundle
+    return ssl.create_default_context()
+
+def _fetch_certificate(domain: str, timeout: float) -> Tuple[datetime, Dict[str, str]]:
+    context = _ssl_context()
+
+    # Connect to the server, the timeout also bounds the TLS handshake so a dead host
+    # holds a check worker no longer than the monitor's own request would
+    with socket.create_connection((domain, 443), timeout=timeout) as sock:
+        with context.wrap_socket(sock, server_hostname=domain) as ssock:
+            # Get certificate
+            cert = ssock.getpeercert()
+
+    # Extract expiry date
+    expiry_date = _parse_not_after(cert['notAfter'])
+
+    # The issuer is a sequence of RDNs (Relative Distinguished Names),
+    # each a sequence of name-value pairs
+    issuer_info = {name: value for rdn in cert.get('issuer', ()) for name, value in rdn}
+
+    return expiry_date, issuer_info
+
+def _parse_not_after(value: str) -> datetime:
+    # ssl always formats notAfter as 'Jun  1 12:00:00 2025 GMT', split by hand
+    # instead of strptime, which re-parses its format string and is locale dependent
+    month, day, clock, year, _ = value.split()
+    hour, minute, second = clock.split(':')
+    return datetime(int(year), _MONTHS[month], int(day), int(hour), int(minute), int(second))
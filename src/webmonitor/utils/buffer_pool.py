@@ -0,0 +1,38 @@
+import threading
+from queue import SimpleQueue, Empty
+
+# Reusable fixed-size bytearrays for socket reads.
+# Each thread keeps a couple of buffers of its own and falls back to a shared pool,
+# buffers beyond the pool's cap (or of the wrong size) are left to the garbage collector.
+
+class BufferPool:
+    def __init__(self, buffer_size: int = 65536, max_buffers: int = 64, local_buffers: int = 2):
+        self.buffer_size = buffer_size
+        self.max_buffers = max_buffers
+        self.local_buffers = local_buffers
+        self._shared = SimpleQueue()
+        self._local = threading.local()
+
+    def _local_cache(self) -> list:
+        cache = getattr(self._local, 'buffers', None)
+        if cache is None:
+            cache = self._local.buffers = []
+        return cache
+
+    def acquire(self) -> bytearray:
+        cache = self._local_cache()
+        if cache:
+            return cache.pop()
+        try:
+            return self._shared.get_nowait()
+        except Empty:
+            return bytearray(self.buffer_size)
+
+    def release(self, buf: bytearray):
+        if len(buf) != self.buffer_size:
+            return
+        cache = self._local_cache()
+        if len(cache) < self.local_buffers:
+            cache.append(buf)
+        elif self._shared.qsize() < self.max_buffers:
+            self._shared.put(buf)
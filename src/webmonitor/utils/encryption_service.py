@@ -1,6 +1,20 @@
 import base64
-from typing import Optional
-from cryptography.fernet import Fernet
+import re
+import threading
+from functools import lru_cache
+from typing import List, Optional
+from cryptography.fernet import Fernet, InvalidToken
+
+# Stored values are Fernet tokens, already URL-safe base64 text. The smallest token (empty
+# plaintext) is 100 characters and every token starts with version byte 0x80 plus a
+# timestamp, which encodes as "gAAAAA". Values written by older versions are the standard
+# base64 of a token (at least 136 characters, starting "Z0FBQUFB") and are still read.
+_TOKEN_RE = re.compile(r'[A-Za-z0-9_-]+={0,2}')
+_LEGACY_RE = re.compile(r'[A-Za-z0-9+/]+={0,2}')
+MIN_TOKEN_LENGTH = 100
+MIN_LEGACY_LENGTH = 136
+FERNET_TOKEN_PREFIX = 'gAAAAA'
+LEGACY_TOKEN_PREFIX = 'Z0FBQUFB'
 
 class EncryptionService:
     # Service for encrypting and decrypting sensitive data like passwords
@@ -31,63 +45,80 @@ class EncryptionService:
         if not data:
             return ""
         
-        try:
-            # Convert data to bytes
-            data_bytes = data.encode('utf-8')
-            
-            # Encrypt the data
-            encrypted_bytes = self._fernet.encrypt(data_bytes)
-            
-            # Return base64 encoded string for storage
-            return base64.b64encode(encrypted_bytes).decode('utf-8')
-        
-        except Exception as e:
-            raise Exception(f"Failed to encrypt data: {e}")
+        # Encrypting bytes with a loaded key cannot fail, the token is base64 text already and is stored as is
+        return self._fernet.encrypt(data.encode('utf-8')).decode('ascii')
     
     def decrypt_data(self, encrypted_data: str) -> str:
         if not encrypted_data:
             return ""
         
         try:
-            # Decode from base64
-            encrypted_bytes = base64.b64decode(encrypted_data.encode('utf-8'))
-            
             # Decrypt the data
-            data_bytes = self._fernet.decrypt(encrypted_bytes)
+            data_bytes = self._fernet.decrypt(upgrade_legacy_token(encrypted_data))
             
             # Return decrypted data as string
             return data_bytes.decode('utf-8')
         
-        except Exception as e:
+        except InvalidToken:
+            # Its message is empty, say what went wrong
+            raise Exception("Failed to decrypt data: invalid token or wrong key")
+        except ValueError as e:
+            # Malformed base64 (binascii.Error) or non-UTF-8 plaintext
             raise Exception(f"Failed to decrypt data: {e}")
     
+    def encrypt_many(self, items: List[str]) -> List[str]:
+        # encrypt_data over a list, for bulk jobs such as re-encrypting every stored password
+        encrypt = self._fernet.encrypt
+        return [encrypt(item.encode('utf-8')).decode('ascii') if item else "" for item in items]
+
+    def decrypt_many(self, items: List[str]) -> List[str]:
+        # decrypt_data over a list, raising on the first value that fails
+        return [self.decrypt_data(item) for item in items]
+
     def is_encrypted(self, value: str) -> bool:
-        if not value:
-            return False
-        
-        try:
-            # Try to base64 decode it
-            decoded = base64.b64decode(value.encode('utf-8'))
-            # If it's base64 and has the right length, it's likely encrypted
-            return len(decoded) > 0
-        except:
+        # Structural checks only, so the usual negative answer needs no decode or exception
+        if not value or len(value) % 4:
             return False
+        if value.startswith(FERNET_TOKEN_PREFIX):
+            return len(value) >= MIN_TOKEN_LENGTH and _TOKEN_RE.fullmatch(value) is not None
+        if value.startswith(LEGACY_TOKEN_PREFIX):
+            return len(value) >= MIN_LEGACY_LENGTH and _LEGACY_RE.fullmatch(value) is not None
+        return False
     
     def rotate_key(self):
         # This is a placeholder for key rotation functionality
         raise NotImplementedError("Key rotation not implemented yet")
 
+def upgrade_legacy_token(encrypted_data: str) -> str:
+    # Strip the extra base64 layer older versions wrapped around the token, no key needed
+    if encrypted_data.startswith(LEGACY_TOKEN_PREFIX):
+        return base64.b64decode(encrypted_data).decode('ascii')
+    return encrypted_data
+
+# Decrypted passwords kept per ciphertext, a stored password is decrypted on every database check
+DECRYPT_CACHE_SIZE = 512
+
 # Global instance
 _encryption_service = None
+_encryption_service_lock = threading.Lock()
 
 def get_encryption_service() -> EncryptionService:
+    # Check workers can ask for it at the same time on startup, only one of them loads the key
     global _encryption_service
     if _encryption_service is None:
-        _encryption_service = EncryptionService()
+        with _encryption_service_lock:
+            if _encryption_service is None:
+                _encryption_service = EncryptionService()
     return _encryption_service
 
 def encrypt_password(password: str) -> str:
     return get_encryption_service().encrypt_data(password)
 
 def decrypt_password(encrypted_password: str) -> str:
+    return _decrypt_cached(encrypted_password)
+
+@lru_cache(maxsize=DECRYPT_CACHE_SIZE)
+def _decrypt_cached(encrypted_password: str) -> str:
+    # Fernet ciphertexts are unique per encryption and the key never changes at runtime,
+    # failures raise and so are never cached
     return get_encryption_service().decrypt_data(encrypted_password)
\ No newline at end of file
@@ -0,0 +1,43 @@
+import json
+
+# Fastest available JSON codec: orjson, then ujson, then the standard library.
+# json_dumps always returns UTF-8 bytes and json_loads accepts str, bytes, bytearray or memoryview.
+# json_dumps_pretty is the same with a 2-space indent, for files people read.
+
+try:
+    import orjson
+
+    def json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    def json_dumps_pretty(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2)
+
+    json_loads = orjson.loads
+
+except ImportError:
+    try:
+        import ujson
+
+        def json_dumps(obj) -> bytes:
+            return ujson.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+        def json_dumps_pretty(obj) -> bytes:
+            return ujson.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+        def json_loads(data):
+            if isinstance(data, (bytearray, memoryview)):
+                data = bytes(data)
+            return ujson.loads(data)
+
+    except ImportError:
+        def json_dumps(obj) -> bytes:
+            return json.dumps(obj).encode('utf-8')
+
+        def json_dumps_pretty(obj) -> bytes:
+            return json.dumps(obj, indent=2).encode('utf-8')
+
+        def json_loads(data):
+            if isinstance(data, memoryview):
+                data = bytes(data)
+            return json.loads(data)
@@ -0,0 +1,78 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from collections import Counter
+from datetime import datetime
+from unittest import mock
+
+import schedule
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from webmonitor.config import manager as config_manager
+from webmonitor.infrastructure import Database
+from webmonitor.models import MonitorResult, MonitorStatus, MonitorType, Space, UrlMonitor
+from webmonitor.services import scheduler as scheduler_module
+
+
+class HostLimitTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch.object(
+            config_manager, '_config_manager',
+            config_manager.ConfigManager(os.path.join(self.tmp.name, 'config.json'))
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(schedule.clear)
+
+        self.database = Database(f"sqlite:///{os.path.join(self.tmp.name, 'test.db')}")
+        self.database.init_db()
+        self.addCleanup(self.database.close)
+        self.scheduler = scheduler_module.MonitorScheduler(self.database)
+        self.addCleanup(self.scheduler.stop)
+
+    def test_checks_over_host_limit_wait_instead_of_being_dropped(self):
+        runs = Counter()
+        running = [0, 0]  # current, peak
+        lock = threading.Lock()
+
+        def fake_check_url(monitor):
+            with lock:
+                runs[monitor.name] += 1
+                running[0] += 1
+                running[1] = max(running[1], running[0])
+            time.sleep(0.5)
+            with lock:
+                running[0] -= 1
+            return MonitorResult(
+                monitor_id=monitor.id, space_id=monitor.space_id, timestamp=datetime.now(),
+                status=MonitorStatus.HEALTHY, monitor_type=monitor.monitor_type
+            )
+
+        space = self.database.save_space(Space(name='Host limit'))
+        for i in range(scheduler_module.MAX_CHECKS_PER_HOST + 2):
+            self.database.save_monitor(UrlMonitor(
+                monitor_type=MonitorType.URL, name=f'm{i}', space_id=space.id,
+                url='http://example.test/', check_interval_seconds=1
+            ))
+
+        with mock.patch.object(scheduler_module, 'check_url', fake_check_url):
+            self.scheduler.start_all_monitors_in_space(space.id)
+            time.sleep(4)
+            self.scheduler.stop_all_monitors_in_space(space.id)
+            self.scheduler.check_executor.shutdown(wait=True)
+
+        self.assertLessEqual(running[1], scheduler_module.MAX_CHECKS_PER_HOST)
+        self.assertEqual(len(runs), scheduler_module.MAX_CHECKS_PER_HOST + 2)
+        self.assertTrue(all(count >= 2 for count in runs.values()), runs)
+        self.assertEqual(self.scheduler.host_checks_in_flight, {})
+        self.assertEqual(self.scheduler.host_waiting, {})
+
+
+if __name__ == '__main__':
+    unittest.main()